@@ -0,0 +1,102 @@
+"""多玩家档案的合并统计：各玩家与全体的胜率、合并硬币公平性检验与环境占比
+
+档案目录结构（每个玩家为一个完整的数据目录，按赛季分片）：
+    <档案>/players/<玩家>/xlsx|json|stats/...
+    <档案>/aggregate/total.json        合并结果
+
+各分片的摘要（SeasonSummary）缓存在 players/<玩家>/stats/sN_partial.json，
+新增玩家或赛季后重新运行只计算新的分片，再合并全部摘要；
+同一玩家的连续游程跨赛季拼接（最长连胜/连负按整个档案计算）。
+--sketch M 时环境占比改由容量 M 的 Space-Saving 草图得到（只跟踪重频卡组，显示误差界）。
+
+用法（在 src 目录下）：
+    python archiveStats.py --archive ~/yugioh-archive --seasons 38-41 -j 8
+"""
+import argparse
+import json
+import time
+
+from utils import stageProfiler
+from utils.dataLayout import ArchiveLayout, parse_seasons
+from utils.shardAggregate import (aggregate_archive, environment_share, pooled_fairness,
+                                  sketch_share)
+from utils.textTable import grid_table
+
+
+def rate(numerator, denominator):
+    return numerator / denominator * 100 if denominator else 0
+
+
+def player_rows(players):
+    rows = []
+    for name, summary in players.items():
+        counters = summary.counters
+        coin = summary.streaks()['coin']
+        rows.append((name, counters['total_matches'],
+                     rate(counters['wins'], counters['total_matches']),
+                     rate(counters['first_moves'], counters['total_matches']),
+                     len(summary.my_decks), len(coin['win']), len(coin['lose'])))
+    return rows
+
+
+def result_json(result):
+    """合并结果（SeasonSummary 转为字典）"""
+    data = {
+        'total': result['total'].to_dict(),
+        'players': {name: summary.to_dict() for name, summary in result['players'].items()},
+        'seasons': {num: summary.to_dict() for num, summary in result['seasons'].items()},
+        'shards': result['shards'],
+    }
+    if 'sketch' in result:
+        data['sketch'] = result['sketch'].to_dict()
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="多玩家档案的合并统计")
+    parser.add_argument('--archive', required=True, help="档案目录（含 players/<玩家>/）")
+    parser.add_argument('--players', help="只统计这些玩家，逗号分隔")
+    parser.add_argument('--seasons', type=parse_seasons, help="赛季范围，如 38-41")
+    parser.add_argument('--top', type=int, default=20, help="环境占比显示前N个卡组（默认20）")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="分片计算的并行进程数（默认CPU核数）")
+    parser.add_argument('--force', action='store_true', help="忽略缓存，重新计算全部分片")
+    parser.add_argument('--sketch', type=int, metavar='M',
+                        help="环境占比改用容量M的Space-Saving草图（只跟踪重频卡组）")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    archive = ArchiveLayout(args.archive)
+    players = args.players.split(',') if args.players else None
+    start = time.perf_counter()
+    result = aggregate_archive(archive, players, args.seasons, args.workers, args.force,
+                               args.sketch)
+    elapsed = time.perf_counter() - start
+    if not result['shards']:
+        raise SystemExit(f"{archive.players_dir} 下没有对局记录")
+
+    archive.aggregate_dir.mkdir(parents=True, exist_ok=True)
+    with open(archive.aggregate('total'), 'w', encoding='utf-8') as f:
+        json.dump(result_json(result), f, ensure_ascii=False)
+
+    print(grid_table(player_rows(result['players']),
+                     headers=['玩家', '对局数', '胜率(%)', '先手率(%)', '卡组数',
+                              '最长硬币连胜', '最长硬币连负'],
+                     floatfmt=".2f"))
+    print("\n合并硬币公平性检验")
+    print(grid_table(pooled_fairness(result['players']),
+                     headers=['玩家', '对局数', '硬币胜场', '硬币胜率(%)', '卡方p', '二项p'],
+                     floatfmt=".4f"))
+    if args.sketch:
+        sketch = result['sketch']
+        print(f"\n环境占比 TOP{args.top}（草图容量{sketch.capacity}，误差不超过{sketch.error_bound:.1f}场）")
+        print(grid_table(sketch_share(sketch, args.top),
+                         headers=['对手卡组', '场数上界', '误差', '占比(%)'], floatfmt=".2f"))
+    else:
+        print(f"\n环境占比 TOP{args.top}（共{len(result['total'].op_decks)}个卡组）")
+        print(grid_table(environment_share(result['total'].op_decks, args.top),
+                         headers=['对手卡组', '场数', '占比(%)'], floatfmt=".2f"))
+    print(f"\n{len(result['players'])}个玩家 {result['shards']}个分片"
+          f"（重新计算{result['computed']}个），耗时 {elapsed:.2f}s")
+    stageProfiler.report()
@@ -0,0 +1,52 @@
+"""置信区间耗时：所有赛季的全赛季 / 中期 / 卡组概率区间（每赛季一次自助抽样）
+
+统计结果从 stats/sN_stats.json 读取，只计区间计算本身的耗时。
+
+用法（在 src 目录下）：
+    python -m benchmarks.benchConfidence --data-dir ~/yugioh-data/data
+"""
+import argparse
+import copy
+import json
+import time
+
+from calcStats import rate_intervals
+from utils.confidence import BOOTSTRAP_RESAMPLES
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout
+
+
+def load_all_stats(layout):
+    stats = []
+    for season_num in layout.seasons():
+        path = layout.stats(season_num)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                stats.append(json.load(f))
+    return stats
+
+
+def bench(all_stats, repeat):
+    """返回最快一次的耗时（秒）"""
+    best = None
+    for _ in range(repeat):
+        # 区间写回中期与卡组条目，每轮使用副本
+        seasons = copy.deepcopy(all_stats)
+        start = time.perf_counter()
+        for stats in seasons:
+            rate_intervals(stats, stats['middle_stats'], stats['my_decks'])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="置信区间计算耗时")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    all_stats = load_all_stats(DataLayout(args.data_dir))
+    if not all_stats:
+        raise SystemExit(f"{args.data_dir} 下没有统计结果，请先运行 calcStats.py")
+    seconds = bench(all_stats, args.repeat)
+    print(f"{len(all_stats)}个赛季 × {BOOTSTRAP_RESAMPLES}次重抽样: {seconds:.3f}s")
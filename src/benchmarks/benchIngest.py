@@ -0,0 +1,57 @@
+"""xlsx 读取吞吐对比：pandas.read_excel / openpyxl 只读流式 / calamine
+
+用法（在 src 目录下）：
+    python -m benchmarks.benchIngest --rows 1000000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.syntheticSeason import SyntheticSeason
+from xlsxToJson import READERS, MatchDataReader
+
+
+def write_synthetic_sheet(path, rows, seed=0):
+    """生成与对战记录表相同列结构的合成表格"""
+    SyntheticSeason(rows, seed=seed).write_xlsx(path)
+
+
+def bench(path, reader):
+    start = time.perf_counter()
+    records = MatchDataReader(path, reader=reader).process().records
+    elapsed = time.perf_counter() - start
+    return {
+        'reader': reader,
+        'rows': len(records),
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(len(records) / elapsed),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="xlsx 读取后端吞吐对比")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--readers', default=','.join(READERS))
+    parser.add_argument('--output', help="结果保存为 json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sheet = Path(tmp) / "synthetic.xlsx"
+        write_synthetic_sheet(sheet, args.rows)
+
+        results = []
+        for reader in args.readers.split(','):
+            try:
+                result = bench(sheet, reader)
+            except ImportError as e:
+                print(f"{reader}: {e}")
+                continue
+            results.append(result)
+            print(f"{reader:10s} {result['rows']:>9d}行 {result['seconds']:>8.2f}s "
+                  f"{result['rows_per_second']:>10d}行/秒")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
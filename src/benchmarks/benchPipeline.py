@@ -0,0 +1,209 @@
+"""全流程基准：在合成赛季上测量各阶段耗时与内存峰值
+
+阶段：MatchDataReader.process / analyze_match_data / 各图表可视化 /
+generate_season_markdown / accumulate_season_stats。
+耗时取 --repeat 次中的最快一次；内存峰值（tracemalloc）在单独一轮中测量，不影响计时。
+结果连同机器与参数保存为 json（默认 benchmarks/results/pipeline-<git版本>.json，
+与机器相关，不纳入版本库），--compare 指定同一台机器上旧版本的结果文件时
+打印各阶段耗时比值，用于发现性能回退。
+
+用法（在 src 目录下）：
+    python -m benchmarks.benchPipeline --sizes 1e3,1e4,1e5,1e6
+    python -m benchmarks.benchPipeline --sizes 1e3,1e4 --compare benchmarks/results/pipeline-abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.syntheticSeason import SyntheticSeason
+from utils.dataLayout import DataLayout
+
+DEFAULT_SIZES = '1e3,1e4,1e5,1e6'
+RESULTS_DIR = Path(__file__).parent / 'results'
+SEASON = 1
+
+
+def git_version():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def measure(func, repeat, memory):
+    """返回 (最快耗时秒, tracemalloc 峰值字节或 None)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def season_stages(layout, rows, args):
+    """按执行顺序返回 [(阶段名, 函数)]；前一阶段的输出是后一阶段的输入"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    from calcStats import analyze_match_data, save_stats
+    from drawStats import CHART_RENDERERS, render_chart
+    from generateMD import generate_season_markdown
+    from generateTotalStats import accumulate_season_stats
+    from utils.fairness import fairness_batch
+    from utils.renderPool import init_render_worker
+    from xlsxToJson import MatchDataReader
+
+    # 预热：scipy 导入与字体缓存不计入第一个规模的耗时
+    fairness_batch([1], [2], [1])
+    init_render_worker()
+    state = {}
+
+    def analyze():
+        state['stats'] = analyze_match_data(layout.json(SEASON))
+
+    def write_stats():
+        # 跨赛季累计需要多个赛季的统计文件，复制同一份结果
+        layout.stats_dir.mkdir(parents=True, exist_ok=True)
+        for season_num in range(SEASON, SEASON + args.seasons):
+            save_stats(layout.stats(season_num), state['stats'])
+        # 与 drawStats 一致，图表从统计文件读取的结果渲染
+        with open(layout.stats(SEASON), 'r', encoding='utf-8') as f:
+            state['stats'] = json.load(f)
+
+    def chart(name):
+        def draw():
+            output = layout.charts(SEASON) / name
+            output.parent.mkdir(parents=True, exist_ok=True)
+            render_chart(state['stats'], SEASON, name, str(output), template=args.template)
+            plt.close('all')
+        return draw
+
+    def markdown():
+        layout.md_dir.mkdir(parents=True, exist_ok=True)
+        generate_season_markdown(layout.chart_dir, layout.md_dir, force=True)
+
+    def accumulate():
+        accumulate_season_stats(layout.root)
+        plt.close('all')
+
+    stages = []
+    if rows <= args.xlsx_max_rows:
+        stages.append(('process', lambda: MatchDataReader(
+            layout.xlsx(SEASON), reader=args.reader).process()))
+    stages.append(('analyze_match_data', analyze))
+    stages.append(('save_stats', write_stats))
+    stages.extend((f"chart:{name}", chart(name)) for name in CHART_RENDERERS)
+    stages.append(('generate_season_markdown', markdown))
+    stages.append(('accumulate_season_stats', accumulate))
+    return stages
+
+
+def bench_size(rows, args):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        layout = DataLayout(tmp)
+        SyntheticSeason(
+            rows, decks=args.decks, coin_bias=args.coin_bias,
+            streakiness=args.streakiness, seed=args.seed,
+        ).write_season(layout, SEASON, xlsx=rows <= args.xlsx_max_rows)
+
+        for stage, func in season_stages(layout, rows, args):
+            if stage == 'save_stats':
+                func()
+                continue
+            seconds, peak = measure(func, args.repeat, not args.no_memory)
+            result = {
+                'rows': rows,
+                'stage': stage,
+                'seconds': round(seconds, 4),
+                'rows_per_second': round(rows / seconds) if seconds > 0 else None,
+                'peak_mb': None if peak is None else round(peak / 2 ** 20, 2),
+            }
+            results.append(result)
+            memory = '' if peak is None else f" {result['peak_mb']:>9.1f}MB"
+            print(f"{rows:>9d}行 {stage:28s} {seconds:>9.3f}s{memory}")
+    return results
+
+
+def compare(results, baseline_file):
+    """与旧结果逐阶段对比耗时，返回 [(行数, 阶段, 旧耗时, 新耗时, 比值)]"""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = {(r['rows'], r['stage']): r['seconds'] for r in json.load(f)['results']}
+    rows = []
+    for result in results:
+        old = baseline.get((result['rows'], result['stage']))
+        if old:
+            rows.append((result['rows'], result['stage'], old, result['seconds'],
+                         round(result['seconds'] / old, 2)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="全流程基准（合成赛季）")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"对局数，逗号分隔（默认 {DEFAULT_SIZES}，最大可到 1e7）")
+    parser.add_argument('--decks', type=int, default=16)
+    parser.add_argument('--coin-bias', type=float, default=0.5)
+    parser.add_argument('--streakiness', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--seasons', type=int, default=10,
+                        help="accumulate_season_stats 累计的赛季数")
+    parser.add_argument('--reader', default='pandas', help="xlsx 读取后端")
+    parser.add_argument('--xlsx-max-rows', type=float, default=1e6,
+                        help="超过该行数时跳过 xlsx 生成与 process 阶段")
+    parser.add_argument('--template', action='store_true', help="图表使用模板渲染")
+    parser.add_argument('--repeat', type=int, default=1, help="重复次数，取最快一次")
+    parser.add_argument('--no-memory', action='store_true', help="不测量内存峰值")
+    parser.add_argument('--output', help="结果文件（默认 benchmarks/results/pipeline-<git版本>.json）")
+    parser.add_argument('--compare', help="与该结果文件对比")
+    args = parser.parse_args()
+
+    sizes = [int(float(size)) for size in args.sizes.split(',')]
+    results = []
+    for rows in sizes:
+        results.extend(bench_size(rows, args))
+
+    version = git_version()
+    report = {
+        'version': version,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('output', 'compare')},
+        'results': results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"pipeline-{version}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存: {output}")
+
+    if args.compare:
+        for rows, stage, old, new, ratio in compare(results, args.compare):
+            flag = '  变慢' if ratio > 1.2 else ''
+            print(f"{rows:>9d}行 {stage:28s} {old:>8.3f}s → {new:>8.3f}s  ×{ratio}{flag}")
@@ -0,0 +1,75 @@
+"""命令行启动耗时：用 python -X importtime 运行各子命令，统计总耗时与最重的导入
+
+用法（在 src 目录下）：
+    python -m benchmarks.benchStartup --data-dir ~/yugioh-data/data --repeat 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from utils.dataLayout import DEFAULT_DATA_DIR
+
+# 只打印文字的子命令，目标启动耗时 < 100ms
+COMMANDS = ['stats 18', 'seasons', 'total']
+TARGET_MS = 100
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 输出：返回 {模块: 累计微秒}（只取顶层导入）"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # 顶层导入没有缩进，子模块的耗时已计入其累计时间
+        if name.startswith(' ') and not name.startswith('  '):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def bench(command, data_dir, repeat):
+    argv = [sys.executable, '-X', 'importtime', 'mdat.py', *command.split(),
+            '--data-dir', data_dir]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(argv, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"{command}: {proc.stderr.strip().splitlines()[-1]}")
+        if best is None or elapsed < best[0]:
+            best = (elapsed, parse_importtime(proc.stderr))
+
+    elapsed, imports = best
+    heaviest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'command': command,
+        'wall_ms': round(elapsed * 1000, 1),
+        'import_ms': round(sum(imports.values()) / 1000, 1),
+        'heaviest_imports': [[name, round(us / 1000, 1)] for name, us in heaviest],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="命令行启动耗时（-X importtime）")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--commands', default=','.join(COMMANDS),
+                        help="要测量的 mdat.py 子命令，逗号分隔")
+    parser.add_argument('--repeat', type=int, default=5, help="重复次数，取最快一次")
+    parser.add_argument('--output', help="结果保存为 json")
+    args = parser.parse_args()
+
+    results = []
+    for command in args.commands.split(','):
+        result = bench(command, args.data_dir, args.repeat)
+        results.append(result)
+        flag = '' if result['wall_ms'] < TARGET_MS else f'  超过 {TARGET_MS}ms'
+        heaviest = ', '.join(f"{name} {ms}ms" for name, ms in result['heaviest_imports'][:3])
+        print(f"{command:12s} 总耗时 {result['wall_ms']:>7.1f}ms "
+              f"导入 {result['import_ms']:>6.1f}ms  ({heaviest}){flag}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
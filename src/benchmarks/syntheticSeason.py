@@ -0,0 +1,162 @@
+"""合成赛季数据生成器：输出与 MatchDataReader 相同结构的 xlsx / json
+
+可配置对局数、卡组数、硬币偏差与连续性（streakiness）：
+硬币与胜负序列为马尔可夫链，每场以 streakiness 的概率重复上一场结果，
+否则重新抽样（硬币正面概率 coin_bias），平稳分布的正面率仍为 coin_bias。
+
+用法（在 src 目录下）：
+    python -m benchmarks.syntheticSeason --rows 100000 --data-dir /tmp/synthetic --season 1
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from utils.dataLayout import DataLayout
+
+DECKS = ['斩机', '天杯龙', '蛇眼', '白龙', '珠泪', '俱舍', '炎王', '闪灵',
+         '神碑', '相剑', '勇者', '拓扑', '罪宝', '圣刻蛇', '尤贝尔', '皮尔莉']
+# 与硬币/先后手无关的备注（1522 为数字备注，覆盖清洗逻辑）
+EXTRA_NOTES = ['钻石5', '大师1', 1522]
+
+COLUMNS = ['己方牌组', '对手牌组', '先后手', '胜负', '备注']
+
+
+def deck_names(count):
+    """前 len(DECKS) 个为真实卡组名，其余按编号生成"""
+    return DECKS[:count] + [f"卡组{i:03d}" for i in range(len(DECKS), count)]
+
+
+def markov_flags(rng, size, p, streakiness):
+    """以 streakiness 概率重复上一值、否则按概率 p（标量或逐场数组）重新抽样的布尔序列"""
+    fresh = rng.random(size) < p
+    repeat = rng.random(size) < streakiness
+    repeat[:1] = False
+    # 每个位置取最近一次重新抽样的值
+    source = np.where(repeat, 0, np.arange(size))
+    np.maximum.accumulate(source, out=source)
+    return fresh[source]
+
+
+class SyntheticSeason:
+    """合成一个赛季的对局记录
+
+    matches: 对局数；decks: 卡组数（出场率按 Zipf 分布）；
+    my_decks: 己方使用的卡组数；coin_bias: 赢硬币概率；
+    streakiness: 硬币与胜负的连续性（0 为独立抽样）；
+    yield_rate: 赢硬币后让先 / 输硬币后被让先的概率。
+    """
+
+    def __init__(self, matches, decks=16, my_decks=4, coin_bias=0.5, streakiness=0.0,
+                 first_win_rate=0.6, second_win_rate=0.45, yield_rate=0.05,
+                 note_rate=0.05, seed=0):
+        self.matches = int(matches)
+        self.decks = deck_names(decks)
+        self.my_decks = self.decks[:min(my_decks, decks)]
+        self.coin_bias = coin_bias
+        self.streakiness = streakiness
+        self.first_win_rate = first_win_rate
+        self.second_win_rate = second_win_rate
+        self.yield_rate = yield_rate
+        self.note_rate = note_rate
+        self.seed = seed
+
+    def columns(self):
+        """生成列数据：{列名: numpy 数组}（列名与对战记录表相同）"""
+        rng = np.random.default_rng(self.seed)
+        n = self.matches
+
+        weights = 1.0 / np.arange(1, len(self.decks) + 1)
+        op_deck = rng.choice(len(self.decks), size=n, p=weights / weights.sum())
+        my_deck = rng.integers(len(self.my_decks), size=n)
+
+        coin = markov_flags(rng, n, self.coin_bias, self.streakiness)
+        # 赢硬币一般选先手，少数让先；输硬币少数被让先
+        yielded = rng.random(n) < self.yield_rate
+        first = coin ^ yielded
+
+        win_rate = np.where(first, self.first_win_rate, self.second_win_rate)
+        win = markov_flags(rng, n, win_rate, self.streakiness)
+
+        notes = np.full(n, '', dtype=object)
+        notes[yielded & coin] = '让先'
+        notes[yielded & ~coin] = '被让先'
+        extra = ~yielded & (rng.random(n) < self.note_rate)
+        notes[extra] = rng.choice(np.array(EXTRA_NOTES, dtype=object), size=int(extra.sum()))
+
+        return {
+            '己方牌组': np.array(self.my_decks, dtype=object)[my_deck],
+            '对手牌组': np.array(self.decks, dtype=object)[op_deck],
+            '先后手': np.where(first, '先', '后').astype(object),
+            '胜负': np.where(win, '胜', '负').astype(object),
+            '备注': notes,
+        }
+
+    def records(self):
+        """生成与 MatchDataReader.records 相同结构的记录"""
+        columns = self.columns()
+        first = columns['先后手'] == '先'
+        notes = columns['备注']
+        coin = np.where(notes == '让先', True,
+                        np.where(notes == '被让先', False, first))
+        return [
+            {
+                'my_deck': my_deck,
+                'op_deck': op_deck,
+                'first_move': 'first' if is_first else 'second',
+                'match_res': 'win' if res == '胜' else 'lose',
+                'coin_res': 'win' if coin_win else 'lose',
+                'notes': str(note),
+            }
+            for my_deck, op_deck, is_first, res, coin_win, note in zip(
+                columns['己方牌组'], columns['对手牌组'], first.tolist(),
+                columns['胜负'], coin.tolist(), notes)
+        ]
+
+    def write_xlsx(self, path):
+        """写为对战记录表（openpyxl 只写模式）"""
+        from openpyxl import Workbook
+
+        columns = self.columns()
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(COLUMNS)
+        for row in zip(*(columns[column] for column in COLUMNS)):
+            sheet.append([value if value != '' else None for value in row])
+        workbook.save(path)
+        return path
+
+    def write_json(self, path):
+        """写为 sN.json（与 MatchDataReader.save_json 格式一致）"""
+        with Path(path).open('w', encoding='utf-8') as f:
+            json.dump(self.records(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def write_season(self, layout, season_num, xlsx=True):
+        """按数据目录结构写入 xlsx/sN.xlsx 与 json/sN.json"""
+        layout.json_dir.mkdir(parents=True, exist_ok=True)
+        self.write_json(layout.json(season_num))
+        if xlsx:
+            layout.xlsx_dir.mkdir(parents=True, exist_ok=True)
+            self.write_xlsx(layout.xlsx(season_num))
+        return layout
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成合成赛季数据")
+    parser.add_argument('--data-dir', required=True)
+    parser.add_argument('--season', type=int, default=1)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--decks', type=int, default=16)
+    parser.add_argument('--my-decks', type=int, default=4)
+    parser.add_argument('--coin-bias', type=float, default=0.5)
+    parser.add_argument('--streakiness', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-xlsx', action='store_true', help="只写 json")
+    args = parser.parse_args()
+
+    SyntheticSeason(
+        args.rows, decks=args.decks, my_decks=args.my_decks,
+        coin_bias=args.coin_bias, streakiness=args.streakiness, seed=args.seed,
+    ).write_season(DataLayout(args.data_dir), args.season, xlsx=not args.no_xlsx)
@@ -1,9 +1,17 @@
+import argparse
 import json
 import os
 import numpy as np
+import pandas as pd
 from collections import defaultdict
 from pathlib import Path
-from scipy.stats import chisquare, binomtest
+from utils.confidence import bootstrap_interval
+from utils.fairness import fairness_batch
+from utils.deckHistogram import compact_histogram, top_k
+from utils.matchupMatrix import MatchupMatrix
+from utils.streakEngine import STREAK_SERIES, RunLengthCounter, run_lengths, streak_stats
+from utils import stageProfiler
+from utils.stageProfiler import add_rows, span
 
 class CustomEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -18,9 +26,9 @@ def rate_calc(numerator, denominator):
 
 # 卡方拟合度检验
 def chisquare_calc(coin_wins, total_matches):
-    observed_coin = [coin_wins, total_matches - coin_wins]  # [正面次数, 反面次数]
-    expected_coin = [total_matches * 0.5, total_matches * 0.5]  # 期望值
-    chi2, p_value = chisquare(observed_coin, f_exp=expected_coin)
+    tests = fairness_batch([coin_wins], [total_matches])
+    chi2 = tests['chi2_statistic'][0]
+    p_value = tests['chi2_p'][0]
 
     coin_fairness_test = {
         'chi2_statistic': chi2,
@@ -32,10 +40,351 @@ def chisquare_calc(coin_wins, total_matches):
 
 # 二项检验
 def binomtest_calc(coin_wins, total_matches):
-    result = binomtest(coin_wins, total_matches, p=0.5)
-    return result.pvalue
+    return fairness_batch([coin_wins], [total_matches])['binom_p'][0]
+
+def fairness_columns(coin_wins, totals, runs):
+    """批量计算硬币公平性列（卡方/二项/游程检验 p 值，游程检验无定义时为 None）"""
+    tests = fairness_batch(coin_wins, totals, runs)
+    return [
+        {
+            'coin_chi2_p': round(chi2_p, 4),
+            'coin_binom_p': round(binom_p, 4),
+            'coin_runs_p': None if np.isnan(runs_p) else round(runs_p, 4),
+        }
+        for chi2_p, binom_p, runs_p in zip(tests['chi2_p'].tolist(),
+                                           tests['binom_p'].tolist(),
+                                           tests['runs_p'].tolist())
+    ]
+
+# 计数器字段（顺序与输出一致）
+COUNTER_KEYS = (
+    'total_matches',
+    'wins',
+    'coin_wins',
+    'first_moves',
+    'first_move_wins',
+    'second_move_wins',
+    'win_coin_wins',
+    'lose_coin_wins',
+)
+
+def rate_stats(counters):
+    """由计数器计算各项概率（保留两位小数）"""
+    total = counters['total_matches']
+    first_moves = counters['first_moves']
+    coin_wins = counters['coin_wins']
+    return {
+        'win_rate': round(rate_calc(counters['wins'], total), 2),
+        'coin_win_rate': round(rate_calc(coin_wins, total), 2),
+        'first_move_rate': round(rate_calc(first_moves, total), 2),
+        'first_move_win_rate': round(
+            rate_calc(counters['first_move_wins'], first_moves), 2),
+        'second_move_win_rate': round(
+            rate_calc(counters['second_move_wins'], total - first_moves), 2),
+        'win_coin_win_rate': round(
+            rate_calc(counters['win_coin_wins'], coin_wins), 2),
+        'lose_coin_win_rate': round(
+            rate_calc(counters['lose_coin_wins'], total - coin_wins), 2),
+    }
+
+def rate_fractions(counters):
+    """各项概率的 (分子, 分母)，与 rate_stats 一一对应"""
+    total = counters['total_matches']
+    first_moves = counters['first_moves']
+    coin_wins = counters['coin_wins']
+    return {
+        'win_rate': (counters['wins'], total),
+        'coin_win_rate': (coin_wins, total),
+        'first_move_rate': (first_moves, total),
+        'first_move_win_rate': (counters['first_move_wins'], first_moves),
+        'second_move_win_rate': (counters['second_move_wins'], total - first_moves),
+        'win_coin_win_rate': (counters['win_coin_wins'], coin_wins),
+        'lose_coin_win_rate': (counters['lose_coin_wins'], total - coin_wins),
+    }
+
+def rate_intervals(counters, middle_stats, my_deck_results):
+    """全赛季 / 中期 / 卡组各项概率的 95% 置信区间，整个赛季一次向量化自助抽样
+
+    中期与卡组条目就地加入 概率_ci 字段，返回全赛季的 {概率_ci: [下限, 上限]}
+    """
+    targets = [({}, rate_fractions(counters))]
+    targets += [(entry, rate_fractions(entry)) for entry in middle_stats]
+    targets += [
+        (entry, {'win_rate': (entry['wins'], entry['total']),
+                 'coin_win_rate': (entry['coin_wins'], entry['total'])})
+        for entry in my_deck_results.values()
+    ]
+    pairs = np.array([pair for _, fractions in targets for pair in fractions.values()],
+                     dtype=np.int64)
+    low, high = bootstrap_interval(pairs[:, 0], pairs[:, 1])
+    bounds = zip(np.round(low, 2).tolist(), np.round(high, 2).tolist())
+    for entry, fractions in targets:
+        for key in fractions:
+            entry[f"{key}_ci"] = list(next(bounds))
+    return targets[0][0]
+
+def interval_entry(counters, fairness):
+    """每20场统计条目（fairness 为 fairness_columns 的对应项）"""
+    rates = rate_stats(counters)
+    entry = {
+        'total_matches': counters['total_matches'],
+        'coin_win_rate': rates['coin_win_rate'],
+        'win_rate': rates['win_rate'],
+        'first_move_rate': rates['first_move_rate'],
+        'first_move_win_rate': rates['first_move_win_rate'],
+        'second_move_win_rate': rates['second_move_win_rate'],
+        'win_coin_win_rate': rates['win_coin_win_rate'],
+        'lose_coin_win_rate': rates['lose_coin_win_rate']
+    }
+    entry.update(fairness)
+    return entry
+
+def middle_entry(counters):
+    """赛季中期统计条目"""
+    entry = {key: counters[key] for key in COUNTER_KEYS}
+    entry.update(rate_stats(counters))
+    entry['coin_fairness_test'] = chisquare_calc(
+        counters['coin_wins'], counters['total_matches'])
+    entry['binom_test'] = binomtest_calc(
+        counters['coin_wins'], counters['total_matches'])
+    return entry
+
+def deck_entry(total, wins, coin_wins, fairness):
+    """我的卡组统计条目"""
+    entry = {
+        'total': total,
+        'wins': wins,
+        'win_rate': round(rate_calc(wins, total), 2),
+        'coin_wins': coin_wins,
+        'coin_win_rate': round(rate_calc(coin_wins, total), 2)
+    }
+    entry.update(fairness)
+    return entry
+
+def build_results(counters, deck_counts, my_deck_results, streak_list,
+                  middle_stats, interval_stats, matchups, streaks):
+    """组装 sN_stats.json 结果（deck_counts 为完整的 {对手卡组: 场数}，按首次出现顺序）"""
+    total_matches = counters['total_matches']
+    coin_wins = counters['coin_wins']
+    op_decks = compact_histogram(deck_counts)
+
+    results = {
+        'coin_wins': coin_wins,
+        'wins': counters['wins'],
+        'first_moves': counters['first_moves'],
+        'total_matches': total_matches,
+        'first_move_wins': counters['first_move_wins'],
+        'second_move_wins': counters['second_move_wins'],
+        'win_coin_wins': counters['win_coin_wins'],
+        'lose_coin_wins': counters['lose_coin_wins'],
+    }
+    results.update(rate_stats(counters))
+    results.update(rate_intervals(counters, middle_stats, my_deck_results))
+    results.update({
+        'coin_fairness_test': chisquare_calc(coin_wins, total_matches),
+        'binom_test': binomtest_calc(coin_wins, total_matches),
+        'top_10_decks': top_k(op_decks, 10),
+        'op_decks': op_decks,
+        'my_decks': my_deck_results,
+        'matchups': matchups,
+        'coin_streaks': {
+            'win_occurrences': len(streak_list['win']),
+            'lose_occurrences': len(streak_list['lose']),
+            'max_win_streak': max(streak_list['win'], default=0),
+            'max_lose_streak': max(streak_list['lose'], default=0),
+            'streak_list': streak_list
+        },
+        'streaks': streaks,
+        'middle_stats': middle_stats,
+        'interval_stats': interval_stats
+    })
+    return results
+
+def matches_to_columns(matches):
+    """把对局记录列表编码为列式数组"""
+    df = pd.DataFrame.from_records(
+        matches,
+        columns=['my_deck', 'op_deck', 'first_move', 'match_res', 'coin_res']
+    )
+    my_codes, my_names = pd.factorize(df['my_deck'], use_na_sentinel=False)
+    op_codes, op_names = pd.factorize(df['op_deck'], use_na_sentinel=False)
+    return {
+        'coin': (df['coin_res'] == 'win').to_numpy(),
+        'win': (df['match_res'] == 'win').to_numpy(),
+        'first': (df['first_move'] == 'first').to_numpy(),
+        'my_deck': my_codes,
+        'my_deck_names': list(my_names),
+        'op_deck': op_codes,
+        'op_deck_names': list(op_names),
+    }
+
+def _ordered_counts(codes, names, *flags):
+    """按卡组首次出现顺序返回 {卡组: (总数, 各标志计数...)}"""
+    codes = np.asarray(codes)
+    size = len(names)
+    uniq, first_idx = np.unique(codes, return_index=True)
+    order = uniq[np.argsort(first_idx, kind='stable')].tolist()
+
+    columns = [np.bincount(codes, minlength=size).tolist()]
+    for flag in flags:
+        columns.append(np.bincount(codes[flag], minlength=size).tolist())
+
+    return {names[c]: tuple(col[c] for col in columns) for c in order}
+
+def coin_streak_list(coin, min_length=3):
+    """硬币连续序列（长度>=min_length），按出现顺序分胜/负"""
+    types, lengths = run_lengths(coin)
+    keep = lengths >= min_length
+    return {
+        'win': lengths[keep & types].tolist(),
+        'lose': lengths[keep & ~types].tolist()
+    }
+
+def run_starts(coin, groups=None):
+    """硬币游程起点标志；给出 groups 时按组（如卡组）内的先后顺序计算"""
+    coin = np.asarray(coin, dtype=bool)
+    starts = np.ones(len(coin), dtype=bool)
+    if groups is None:
+        starts[1:] = coin[1:] != coin[:-1]
+        return starts
+
+    order = np.argsort(np.asarray(groups), kind='stable')
+    sorted_groups = np.asarray(groups)[order]
+    sorted_coin = coin[order]
+    sorted_starts = np.ones(len(coin), dtype=bool)
+    sorted_starts[1:] = ((sorted_groups[1:] != sorted_groups[:-1])
+                         | (sorted_coin[1:] != sorted_coin[:-1]))
+    starts[order] = sorted_starts
+    return starts
+
+def analyze_columns(columns):
+    """列式统计引擎：累计和求区间/中期统计，bincount 求卡组统计"""
+    coin = np.asarray(columns['coin'], dtype=bool)
+    win = np.asarray(columns['win'], dtype=bool)
+    first = np.asarray(columns['first'], dtype=bool)
+    total_matches = len(coin)
+    if total_matches == 0:
+        raise ValueError("对局数据为空")
+    add_rows(total_matches)
+
+    flags = {
+        'wins': win,
+        'coin_wins': coin,
+        'first_moves': first,
+        'first_move_wins': first & win,
+        'second_move_wins': ~first & win,
+        'win_coin_wins': coin & win,
+        'lose_coin_wins': ~coin & win,
+        'coin_runs': run_starts(coin),
+    }
+
+    # 需要快照的位置：每20场、赛季中期、全赛季
+    middle = total_matches // 2
+    checkpoints = set(range(20, total_matches + 1, 20))
+    checkpoints.add(total_matches)
+    if middle > 0:
+        checkpoints.add(middle)
+    checkpoints = np.array(sorted(checkpoints))
+    starts = np.concatenate(([0], checkpoints[:-1]))
+
+    cumulative = {
+        key: np.cumsum(np.add.reduceat(flag, starts, dtype=np.int64)).tolist()
+        for key, flag in flags.items()
+    }
+    snapshots = {}
+    for i, count in enumerate(checkpoints.tolist()):
+        counters = {'total_matches': count}
+        for key in flags:
+            counters[key] = cumulative[key][i]
+        snapshots[count] = counters
+
+    interval_counters = [
+        snapshots[count] for count in range(20, total_matches + 1, 20)
+    ]
+    interval_fairness = fairness_columns(
+        [c['coin_wins'] for c in interval_counters],
+        [c['total_matches'] for c in interval_counters],
+        [c['coin_runs'] for c in interval_counters]
+    )
+    interval_stats = [
+        interval_entry(counters, fairness)
+        for counters, fairness in zip(interval_counters, interval_fairness)
+    ]
+    middle_stats = [middle_entry(snapshots[middle])] if middle > 0 else []
+
+    # 卡组统计
+    my_deck_counts = _ordered_counts(
+        columns['my_deck'], columns['my_deck_names'], win, coin,
+        run_starts(coin, columns['my_deck'])
+    )
+    deck_fairness = fairness_columns(
+        [values[2] for values in my_deck_counts.values()],
+        [values[0] for values in my_deck_counts.values()],
+        [values[3] for values in my_deck_counts.values()]
+    )
+    my_deck_results = {
+        deck: deck_entry(total, wins, coin_wins, fairness)
+        for (deck, (total, wins, coin_wins, _)), fairness in zip(
+            my_deck_counts.items(), deck_fairness)
+    }
+    deck_counts = {
+        deck: total
+        for deck, (total,) in _ordered_counts(
+            columns['op_deck'], columns['op_deck_names']
+        ).items()
+    }
+    matchups = MatchupMatrix.from_columns(
+        columns['my_deck'], columns['my_deck_names'],
+        columns['op_deck'], columns['op_deck_names'], first, coin, win
+    )
+
+    return build_results(
+        snapshots[total_matches],
+        deck_counts,
+        my_deck_results,
+        coin_streak_list(coin),
+        middle_stats,
+        interval_stats,
+        matchups.to_stats(),
+        streak_stats({'coin': coin, 'win': win, 'first': first})
+    )
+
+def analyze_matches(matches):
+    return analyze_columns(matches_to_columns(matches))
 
 def analyze_match_data(json_file):
+    # Load the JSON data
+    with span('load_json'), open(json_file, 'r', encoding='utf-8') as f:
+        matches = json.load(f)
+
+    return analyze_matches(matches)
+
+def analyze_match_store(store_file):
+    """从 .mds 列式存储（mmap）直接统计"""
+    from utils.matchStore import MatchStore
+
+    return analyze_columns(MatchStore.open(store_file).columns())
+
+def analyze_match_stream(matches, total_matches):
+    """单遍流式统计：matches 为任意可迭代对象，需已知总场数以确定中期位置"""
+    from utils.statsAccumulator import StatsAccumulator
+
+    accumulator = StatsAccumulator(expected_total=total_matches)
+    for match in matches:
+        accumulator.add(match)
+    add_rows(total_matches)
+    return accumulator.to_stats()
+
+def analyze_match_file_streaming(match_file, total_matches=None):
+    """流式统计 json 数组 / NDJSON 文件；未给出总场数时先扫描一遍计数"""
+    from utils.matchStream import count_matches, iter_match_file
+
+    if total_matches is None:
+        total_matches = count_matches(match_file)
+    return analyze_match_stream(iter_match_file(match_file), total_matches)
+
+# 逐场循环的参考实现（用于校验列式引擎结果一致）
+def analyze_match_data_reference(json_file):
     # Load the JSON data
     with open(json_file, 'r', encoding='utf-8') as f:
         matches = json.load(f)
@@ -53,23 +402,35 @@ def analyze_match_data(json_file):
     # 连续硬币统计
     current_coin_streak = 0  # 当前连续次数
     last_coin_result = None  # 上一次硬币结果
-    streak_type = matches[0]['match_res']  # 当前连续类型 ('win'或'lose')
+    streak_type = matches[0]['coin_res']  # 当前连续类型 ('win'或'lose')
 
     # 连续3次及以上统计
     streak_occurrences = {'win': 0, 'lose': 0}  # 发生次数
     max_streaks = {'win': 0, 'lose': 0}         # 最大连续次数
     streak_list = {'win':[], 'lose':[]}
 
-    # Count deck matchups
-    deck_matchups = defaultdict(lambda: {'wins': 0, 'total': 0})
+    # 硬币/胜负/先后手的完整游程长度分布
+    run_counters = {
+        name: RunLengthCounter(labels)
+        for name, (_, *labels) in STREAK_SERIES.items()
+    }
+
+    # Count deck matchups（己方 × 对手 × 先后手 × 硬币）
+    deck_matchups = MatchupMatrix()
     deck_counts = defaultdict(int)
 
     my_deck_stats = defaultdict(lambda: {
         'total': 0,
         'wins': 0,
         'coin_wins': 0,
+        'coin_runs': 0,
+        'last_coin': None,
     })
 
+    # 硬币游程数（游程检验用）：全赛季与各卡组内
+    coin_runs = 0
+    interval_counters = []
+
     # 每隔20场对各种概率统计一次
     interval_stats = []
     current_count = 0
@@ -86,6 +447,11 @@ def analyze_match_data(json_file):
         current_count += 1
 
         my_deck_stats[my_deck]['total'] += 1
+        if current_coin != last_coin_result:
+            coin_runs += 1
+        if current_coin != my_deck_stats[my_deck]['last_coin']:
+            my_deck_stats[my_deck]['coin_runs'] += 1
+        my_deck_stats[my_deck]['last_coin'] = current_coin
 
         # 胜率 & 卡组胜率
         if win_or_lose == 'win':
@@ -116,6 +482,9 @@ def analyze_match_data(json_file):
             streak_type = current_coin
         last_coin_result = current_coin
 
+        for name, (field, *_) in STREAK_SERIES.items():
+            run_counters[name].add(match[field])
+
         # 先手胜率
         if match['first_move'] == 'first':
             first_moves += 1
@@ -125,11 +494,11 @@ def analyze_match_data(json_file):
             if win_or_lose == 'win':
                 second_move_wins += 1
 
-        # Track deck matchups (optional)
-        # 对 对手卡组胜率
-        deck_matchups[match['op_deck']]['total'] += 1
-        if win_or_lose == 'win':
-            deck_matchups[match['op_deck']]['wins'] += 1
+        # Track deck matchups
+        deck_matchups.add(my_deck, match['op_deck'],
+                          match['first_move'] == 'first',
+                          current_coin == 'win',
+                          win_or_lose == 'win')
 
         deck_counts[match['op_deck']] += 1
 
@@ -154,6 +523,7 @@ def analyze_match_data(json_file):
                 'win_coin_win_rate': round(win_coin_win_rate, 2),
                 'lose_coin_win_rate': round(lose_coin_win_rate, 2)
             })
+            interval_counters.append((coin_wins, current_count, coin_runs))
 
         # 赛季中期统计
         if current_count == total_matches // 2:
@@ -215,8 +585,18 @@ def analyze_match_data(json_file):
     coin_fairness_test = chisquare_calc(coin_wins, total_matches)
     binom_test =  binomtest_calc(coin_wins, current_count)
 
+    # 硬币公平性列（卡方/二项/游程检验）
+    for entry, fairness in zip(interval_stats, fairness_columns(*zip(*interval_counters))
+                               if interval_counters else []):
+        entry.update(fairness)
+
+    deck_fairness = fairness_columns(
+        [stats['coin_wins'] for stats in my_deck_stats.values()],
+        [stats['total'] for stats in my_deck_stats.values()],
+        [stats['coin_runs'] for stats in my_deck_stats.values()]
+    )
     my_deck_results = {}
-    for deck, stats in my_deck_stats.items():
+    for (deck, stats), fairness in zip(my_deck_stats.items(), deck_fairness):
         total = stats['total']
         my_deck_results[deck] = {
             'total': total,
@@ -225,6 +605,16 @@ def analyze_match_data(json_file):
             'coin_wins': stats['coin_wins'],
             'coin_win_rate': round(rate_calc(stats['coin_wins'], total), 2)
         }
+        my_deck_results[deck].update(fairness)
+
+    # 置信区间（与列式引擎相同：中期与卡组条目就地加入）
+    intervals = rate_intervals(
+        {'total_matches': total_matches, 'wins': wins, 'coin_wins': coin_wins,
+         'first_moves': first_moves, 'first_move_wins': first_move_wins,
+         'second_move_wins': second_move_wins, 'win_coin_wins': win_coin_wins,
+         'lose_coin_wins': lose_coin_wins},
+        middle_stats, my_deck_results
+    )
 
     results = {
         'coin_wins': coin_wins,
@@ -243,10 +633,13 @@ def analyze_match_data(json_file):
         'second_move_win_rate': round(second_move_win_rate, 2),
         'win_coin_win_rate': round(win_coin_win_rate, 2),
         'lose_coin_win_rate': round(lose_coin_win_rate, 2),
+        **intervals,
         'coin_fairness_test' : coin_fairness_test,
         'binom_test' : binom_test,
         'top_10_decks': dict(top_10_decks),
+        'op_decks': compact_histogram(deck_counts),
         'my_decks': my_deck_results,
+        'matchups': deck_matchups.to_stats(),
         'coin_streaks': {
             'win_occurrences': streak_occurrences['win'],
             'lose_occurrences': streak_occurrences['lose'],
@@ -254,31 +647,75 @@ def analyze_match_data(json_file):
             'max_lose_streak': max_streaks['lose'],
             'streak_list' : streak_list
         },
+        'streaks': {
+            name: counter.distribution() for name, counter in run_counters.items()
+        },
         'middle_stats' : middle_stats,
         'interval_stats': interval_stats
     }
 
     return results
 
-# 数据处理
-num = 36
-
 def save_stats(output_path, stats_file):
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(stats_file, f, ensure_ascii=False, indent=2, cls=CustomEncoder)
 
+def state_path_for(stats_file):
+    """累加器状态文件（与 sN_stats.json 同目录的 sN_state.json）"""
+    stats_file = Path(stats_file)
+    return stats_file.with_name(stats_file.name.replace('_stats', '_state'))
+
+def update_stats_incremental(json_file, stats_file):
+    """增量更新：只把新增对局折叠进已保存的累加器状态"""
+    from utils.statsAccumulator import StatsAccumulator
 
-json_dir = os.path.expanduser("~/yugioh-data/data/json")
-json_file = os.path.join(json_dir, f"s{num}.json")
-stats_dir = os.path.expanduser("~/yugioh-data/data/stats")
-os.makedirs(json_dir, exist_ok=True)
+    state_file = state_path_for(stats_file)
+    accumulator = StatsAccumulator.load(state_file)
+    raw = Path(json_file).read_bytes()
+    matches = json.loads(raw)
 
-for i in range(18, 42):
-    json_file = os.path.join(json_dir, f"s{i}.json")
-    stats_file = os.path.join(stats_dir, f"s{i}_stats.json")
-    if not os.path.exists(json_file):
-        print(f"{json_file}.json 不存在，跳过该文件。")
-        continue
-    stats = analyze_match_data(json_file)
+    added = accumulator.extend(matches, raw)
+    add_rows(added)
+    stats = accumulator.to_stats()
     save_stats(stats_file, stats)
-    print(f"s{i}处理完毕")
+    accumulator.save(state_file, encoder=CustomEncoder)
+    return added
+
+# 数据处理
+if __name__ == "__main__":
+    from utils.buildCache import BuildCache
+    from utils.dataLayout import DataLayout
+
+    parser = argparse.ArgumentParser(description="赛季统计计算")
+    parser.add_argument('--incremental', action='store_true',
+                        help="只处理新增对局（使用 sN_state.json 累加器状态）")
+    parser.add_argument('--streaming', action='store_true',
+                        help="流式读取对局记录（内存占用与对局数无关）")
+    parser.add_argument('--force', action='store_true', help="忽略构建缓存，全部重新计算")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    layout = DataLayout()
+    cache = BuildCache(layout.root, force=args.force)
+    os.makedirs(layout.stats_dir, exist_ok=True)
+
+    for i in range(18, 42):
+        json_file = layout.json(i)
+        stats_file = layout.stats(i)
+        if not os.path.exists(json_file):
+            print(f"{json_file}.json 不存在，跳过该文件。")
+            continue
+        if args.incremental:
+            build = lambda: update_stats_incremental(json_file, stats_file)
+        elif args.streaming:
+            build = lambda: save_stats(stats_file, analyze_match_file_streaming(json_file))
+        else:
+            build = lambda: save_stats(stats_file, analyze_match_data(json_file))
+        with span('analyze', season=i):
+            built = cache.run('analyze', i, [json_file], [stats_file], build)
+        if not built:
+            print(f"s{i}输入未变化，跳过")
+            continue
+        print(f"s{i}处理完毕")
+    stageProfiler.report()
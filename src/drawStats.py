@@ -1,24 +1,36 @@
+import argparse
 import os
 import json
+import time
 from pathlib import Path
-from utils.deckDistributionVisualizer import DeckDistributionVisualizer
-from utils.deckStatsVisualizer import DeckStatsVisualizer
-from utils.seasonStatsVisualizer import SeasonStatsVisualizer
-from utils.streakVisualizer import StreakVisualizer
+from tabulate import tabulate
+from utils.buildCache import BuildCache, code_digest, stats_fingerprint
+from utils.dataLayout import DataLayout
+from utils import stageProfiler
+from utils.stageProfiler import span
+from utils.deckDistributionVisualizer import (
+    DeckDistributionTemplate,
+    DeckDistributionVisualizer,
+    deck_distribution,
+)
+from utils.deckStatsVisualizer import DeckStatsTemplate, DeckStatsVisualizer
+from utils.matchupHeatmapVisualizer import MatchupHeatmapVisualizer
+from utils.seasonStatsVisualizer import SeasonStatsTemplate, SeasonStatsVisualizer
+from utils.streakVisualizer import StreakTemplate, StreakVisualizer, coin_distribution
 from utils.dynamicStats import *
 
-def show_streak(season_num, win_data, lose_data):
+def show_streak(season_num, distribution, total_matches):
     visualizer = StreakVisualizer(
-        win_streaks=win_data,
-        lose_streaks=lose_data,
+        distribution=distribution,
+        total_matches=total_matches,
         season_num=season_num
     )
     visualizer.show()
 
-def save_streak(season_num, win_data, lose_data, filename):
+def save_streak(season_num, distribution, total_matches, filename):
     visualizer = StreakVisualizer(
-        win_streaks=win_data,
-        lose_streaks=lose_data,
+        distribution=distribution,
+        total_matches=total_matches,
         season_num=season_num
     )
     visualizer.save(filename)
@@ -54,52 +66,166 @@ def save_season_stats(stats, season_num, filename):
     visualizer = SeasonStatsVisualizer(stats, season_num)
     visualizer.save(filename)
 
+def show_matchups(matchups, season_num, split='first'):
+    visualizer = MatchupHeatmapVisualizer(matchups, season_num, split=split)
+    visualizer.show()
+
+def save_matchups(matchups, season_num, filename, split='first'):
+    visualizer = MatchupHeatmapVisualizer(matchups, season_num, split=split)
+    visualizer.save(filename)
+
+# 每个赛季生成的图表文件
+CHART_FILES = (
+    "streak.png",
+    "deck_stats.png",
+    "top10_decks.png",
+    "season_stats.png",
+    "dynamic_stats.png",
+    "matchups.png",
+)
+
+# 图表文件 → 绘制函数 (stats, season_num, filename)
+CHART_RENDERERS = {
+    "streak.png": lambda stats, season_num, filename: save_streak(
+        season_num,
+        coin_distribution(stats),
+        stats['total_matches'],
+        filename
+    ),
+    "deck_stats.png": lambda stats, season_num, filename: save_deck_stats(
+        stats['my_decks'], season_num, filename),
+    "top10_decks.png": lambda stats, season_num, filename: save_top10_deck(
+        deck_distribution(stats), season_num, filename),
+    "season_stats.png": lambda stats, season_num, filename: save_season_stats(
+        stats, season_num, filename),
+    "dynamic_stats.png": lambda stats, season_num, filename: save_plot_analysis(
+        stats, filename),
+    "matchups.png": lambda stats, season_num, filename: save_matchups(
+        stats.get('matchups'), season_num, filename),
+}
+
+# 模板模式：每种图表在进程内只创建一次 figure，之后按赛季更新数据
+CHART_TEMPLATES = {
+    "streak.png": StreakTemplate,
+    "deck_stats.png": DeckStatsTemplate,
+    "top10_decks.png": DeckDistributionTemplate,
+    "season_stats.png": SeasonStatsTemplate,
+    "dynamic_stats.png": DynamicStatsTemplate,
+}
+_templates = {}
+
+# 每张图表读取的统计字段，只有这些字段变化时才需要重绘
+CHART_DEPENDENCIES = {
+    "streak.png": StreakVisualizer.STATS_KEYS,
+    "deck_stats.png": DeckStatsVisualizer.STATS_KEYS,
+    "top10_decks.png": DeckDistributionVisualizer.STATS_KEYS,
+    "season_stats.png": SeasonStatsVisualizer.STATS_KEYS,
+    "dynamic_stats.png": BasePlotter.STATS_KEYS,
+    "matchups.png": MatchupHeatmapVisualizer.STATS_KEYS,
+}
+
+def chart_fingerprint(stats, season_num, chart):
+    """图表指纹：依赖字段 + 赛季编号 + 绘图代码版本"""
+    return stats_fingerprint(
+        stats,
+        CHART_DEPENDENCIES[chart],
+        extra=[chart, season_num, code_digest('render')]
+    )
+
+def fingerprint_path(filename):
+    """指纹文件与图表同目录，如 streak.png.fp"""
+    return Path(f"{filename}.fp")
+
+def chart_is_current(stats, season_num, chart, filename):
+    fp_file = fingerprint_path(filename)
+    if not (Path(filename).exists() and fp_file.exists()):
+        return False
+    return fp_file.read_text(encoding='utf-8').strip() == chart_fingerprint(
+        stats, season_num, chart)
+
+def stale_charts(stats, season_num, season_chart_dir, force=False):
+    """依赖字段发生变化（或尚未生成）的图表"""
+    return [
+        chart for chart in CHART_FILES
+        if force or not chart_is_current(
+            stats, season_num, chart, Path(season_chart_dir) / chart)
+    ]
+
+def draw_chart(stats, season_num, chart, filename, template=False):
+    """绘制单张图表（格式由文件扩展名决定）；template=True 时复用本进程内的图表模板（没有模板的图表照常绘制）"""
+    with span('chart', season=season_num, chart=chart):
+        if not template or chart not in CHART_TEMPLATES:
+            CHART_RENDERERS[chart](stats, season_num, filename)
+        else:
+            if chart not in _templates:
+                _templates[chart] = CHART_TEMPLATES[chart]()
+            _templates[chart].render(stats, season_num, filename)
+
+def render_chart(stats, season_num, chart, filename, template=False):
+    """生成并保存单张图表及其指纹"""
+    draw_chart(stats, season_num, chart, filename, template=template)
+    fingerprint_path(filename).write_text(
+        chart_fingerprint(stats, season_num, chart), encoding='utf-8')
+
+def save_season_charts(stats, season_num, season_chart_dir, template=False,
+                       force=False):
+    """生成并保存赛季图表（只重绘依赖字段变化的图表），返回重绘的图表"""
+    season_chart_dir = Path(season_chart_dir)
+    season_chart_dir.mkdir(parents=True, exist_ok=True)
+
+    charts = stale_charts(stats, season_num, season_chart_dir, force)
+    for chart in charts:
+        render_chart(stats, season_num, chart, str(season_chart_dir / chart),
+                     template=template)
+    return charts
+
 if __name__ == "__main__":
-    stats_dir = Path("~/yugioh-data/data/stats").expanduser()
-    chart_base = Path("~/yugioh-data/data/chart").expanduser()
-    for json_file in stats_dir.glob("s*_stats.json"):
+    from utils.renderPool import render_charts, timing_summary
+
+    parser = argparse.ArgumentParser(description="生成赛季图表")
+    parser.add_argument('--force', action='store_true', help="忽略构建缓存，全部重新生成")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="并行渲染进程数（默认CPU核数）")
+    parser.add_argument('--timing', action='store_true', help="输出每类图表的渲染耗时")
+    parser.add_argument('--template', action='store_true',
+                        help="复用图表模板，只更新数据后保存（批量渲染更快）")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    layout = DataLayout()
+    cache = BuildCache(layout.root, force=args.force)
+    pending = []
+    jobs = []
+    for json_file in sorted(layout.stats_dir.glob("s*_stats.json")):
         # 从文件名解析赛季编号（如s39）
         season_name = json_file.stem.split('_')[0]  # 获取s39
         season_num = int(season_name[1:])  # 提取纯数字39
+        season_chart_dir = layout.charts(season_num)
 
-        # 创建赛季图表目录
-        season_chart_dir = chart_base / season_name
-        season_chart_dir.mkdir(parents=True, exist_ok=True)
-
-        # 读取数据
+        outputs = [season_chart_dir / name for name in CHART_FILES]
+        if cache.is_fresh('render', season_num, [json_file], outputs):
+            print(f"赛季{season_num}输入未变化，跳过")
+            continue
         with open(json_file, 'r', encoding='utf-8') as f:
             stats = json.load(f)
+        charts = stale_charts(stats, season_num, season_chart_dir, args.force)
+        pending.append((season_num, json_file, outputs, len(charts)))
+        jobs.extend((json_file, season_num, name, season_chart_dir / name)
+                    for name in charts)
+
+    start = time.perf_counter()
+    timings = render_charts(jobs, workers=args.workers, template=args.template)
+    elapsed = time.perf_counter() - start
 
-        # 准备数据
-        win_data = stats['coin_streaks']['streak_list']['win']
-        lose_data = stats['coin_streaks']['streak_list']['lose']
-        deck_stats = stats['my_decks']
-        top_10_decks = stats['top_10_decks']
-
-        # 生成并保存所有图表
-        save_streak(
-            season_num,
-            win_data,
-            lose_data,
-            str(season_chart_dir / "streak.png")
-        )
-        save_deck_stats(
-            deck_stats,
-            season_num,
-            str(season_chart_dir / "deck_stats.png")
-        )
-        save_top10_deck(
-            top_10_decks,
-            season_num,
-            str(season_chart_dir / "top10_decks.png")
-        )
-        save_season_stats(
-            stats,
-            season_num,
-            str(season_chart_dir / "season_stats.png")
-        )
-        save_plot_analysis(
-            stats,
-            str(season_chart_dir / "dynamic_stats.png")
-        )
-        print(f"赛季{season_num}图表处理完毕")
+    for season_num, json_file, outputs, redrawn in pending:
+        cache.record('render', season_num, [json_file], outputs)
+        print(f"赛季{season_num}图表处理完毕（重绘{redrawn}/{len(CHART_FILES)}张）")
+    if args.timing and timings:
+        print(tabulate(
+            timing_summary(timings),
+            headers=['图表', '张数', '总耗时(s)', '平均(s)'],
+            floatfmt=".3f"
+        ))
+    print(f"共{len(timings)}张图表，耗时 {elapsed:.2f}s")
+    stageProfiler.report()
@@ -1,13 +1,49 @@
 from pathlib import Path
+import argparse
 import re
+from utils.buildCache import BuildCache
+from utils import stageProfiler
+from utils.stageProfiler import span
 
-def generate_season_markdown(chart_dir, md_dir):
-    # 展开用户目录并转换为Path对象
-    chart_dir = Path(chart_dir).expanduser()
+# 赛季报告中的图表
+IMAGE_FILES = [
+    "top10_decks.png",
+    "season_stats.png",
+    "deck_stats.png",
+    "dynamic_stats.png",
+    "streak.png",
+    "matchups.png",
+]
+
+def write_season_markdown(season_num, md_dir):
+    """生成单个赛季的Markdown报告"""
     md_dir = Path(md_dir).expanduser()
+    md_filename = md_dir / f"s{season_num}.md"
 
     relative_chart_path = Path("../chart")
 
+    # 生成Markdown内容
+    md_content = f"# 赛季 {season_num} 数据分析报告\n\n"
+
+
+    for img in IMAGE_FILES:
+        img_relative_path = relative_chart_path / f"s{season_num}" / img
+        md_content += (
+            f"## {img.split('.')[0].replace('_', ' ').title()}\n"
+            f"![{img}]({img_relative_path.as_posix()})\n\n"
+        )
+
+    # 写入文件
+    with open(md_filename, "w", encoding="utf-8") as f:
+        f.write(md_content)
+    return md_filename
+
+def generate_season_markdown(chart_dir, md_dir, force=False):
+    # 展开用户目录并转换为Path对象
+    chart_dir = Path(chart_dir).expanduser()
+    md_dir = Path(md_dir).expanduser()
+    cache = BuildCache(md_dir.parent, force=force)
+
     # 遍历所有赛季目录（s开头的文件夹）
     for season_dir in chart_dir.glob("s[0-9]*"):
         if not season_dir.is_dir():
@@ -16,33 +52,21 @@ def generate_season_markdown(chart_dir, md_dir):
         # 提取赛季编号（例如s39中的39）
         season_num = re.search(r"s(\d+)$", season_dir.name).group(1)
         md_filename = md_dir / f"s{season_num}.md"
-
-        # 定义需要的图片文件列表
-        image_files = [
-            "top10_decks.png",
-            "season_stats.png",
-            "deck_stats.png",
-            "dynamic_stats.png",
-            "streak.png",
-        ]
-
-        # 生成Markdown内容
-        md_content = f"# 赛季 {season_num} 数据分析报告\n\n"
-
-
-        for img in image_files:
-            img_relative_path = relative_chart_path / f"s{season_num}" / img
-            md_content += (
-                f"## {img.split('.')[0].replace('_', ' ').title()}\n"
-                f"![{img}]({img_relative_path.as_posix()})\n\n"
-            )
-
-        # 写入文件
-        with open(md_filename, "w", encoding="utf-8") as f:
-            f.write(md_content)
+        build = lambda: write_season_markdown(season_num, md_dir)
+        with span('markdown', season=int(season_num)):
+            built = cache.run('markdown', season_num, [], [md_filename], build)
+        if not built:
+            continue
         print(f"Generated: {md_filename}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成赛季Markdown报告")
+    parser.add_argument('--force', action='store_true', help="忽略构建缓存，全部重新生成")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
     chart_dir="~/yugioh-data/data/chart"
     md_dir = "~/yugioh-data/data/MD"
-    generate_season_markdown(chart_dir, md_dir)
+    generate_season_markdown(chart_dir, md_dir, force=args.force)
+    stageProfiler.report()
@@ -1,17 +1,18 @@
+import argparse
 import json
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pathlib import Path
-from utils.dynamicStats import *
-from matplotlib import rcParams
-import pandas as pd
-from tabulate import tabulate
-from matplotlib.ticker import MultipleLocator
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout
+from utils.textTable import grid_table
+from utils import stageProfiler
+from utils.stageProfiler import add_rows, span
 
-rcParams['font.family'] = 'sans-serif'
-rcParams['axes.unicode_minus'] = False
-rcParams['font.sans-serif'] = ['LXGW WenKai']
+
+def setup_matplotlib():
+    """绘图前再导入 matplotlib 并设置字体（只打印表格时不加载绘图库）"""
+    from matplotlib import rcParams
+    rcParams['font.family'] = 'sans-serif'
+    rcParams['axes.unicode_minus'] = False
+    rcParams['font.sans-serif'] = ['LXGW WenKai']
 
 
 def rate_calc(numerator, denominator):
@@ -20,6 +21,10 @@ def rate_calc(numerator, denominator):
     return (numerator / denominator) * 100
 
 def individual_show_plot_analysis(total_stats):
+    setup_matplotlib()
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import MultipleLocator
+
     stats = total_stats['interval_stats']
     seasons = [s['season_num'] for s in stats]
     min_season = min(seasons)
@@ -158,6 +163,9 @@ def individual_show_plot_analysis(total_stats):
     plt.close()
 
 def generate_season_stats_table(interval_stats):
+    import pandas as pd
+    from tabulate import tabulate
+
     # 创建DataFrame
     df = pd.DataFrame(interval_stats)
 
@@ -221,10 +229,15 @@ def generate_individual_season_stats_table(interval_stats):
         table_data.append(row)
 
     # 生成表格（使用网格样式）
-    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    print(grid_table(table_data, headers=headers))
 
 
 def strek_chart(streak_coin_win, streak_coin_lose):
+    setup_matplotlib()
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
     # 合并数据并转为 DataFrame
     df_win = pd.DataFrame({"连续次数": streak_coin_win, "类型": "连续正"})
     df_lose = pd.DataFrame({"连续次数": streak_coin_lose, "类型": "连续负"})
@@ -259,8 +272,12 @@ def strek_chart(streak_coin_win, streak_coin_lose):
     plt.show()
 
 # 赛季独立胜率变化
-def individual_season_stats():
-    stats_dir = Path("~/yugioh-data/data/stats").expanduser()
+def individual_season_stats(data_dir=DEFAULT_DATA_DIR):
+    with span('total'):
+        _individual_season_stats(data_dir)
+
+def _individual_season_stats(data_dir):
+    stats_dir = DataLayout(data_dir).stats_dir
     sorted_files = sorted(
         stats_dir.glob("s*_stats.json"),
         key=lambda x: int(x.stem.split("_")[0][1:])  # 提取s后的数字
@@ -277,6 +294,7 @@ def individual_season_stats():
             stats = json.load(f)
 
             total_matches = stats['total_matches']
+            add_rows(total_matches)
             win_rate = stats['win_rate']
             coin_win_rate = stats['coin_win_rate']
             first_move_rate = stats['first_move_rate']
@@ -304,90 +322,78 @@ def individual_season_stats():
     )
 
 
-def accumulate_season_stats():
-    stats_dir = Path("~/yugioh-data/data/stats").expanduser()
-    sorted_files = sorted(
-        stats_dir.glob("s*_stats.json"),
-        key=lambda x: int(x.stem.split("_")[0][1:])  # 提取s后的数字
-    )
+def accumulate_season_stats(data_dir=DEFAULT_DATA_DIR):
+    with span('total'):
+        _accumulate_season_stats(data_dir)
+
+def accumulate_entry(season_num, counters):
+    """截至该赛季的累计计数器与各项概率"""
+    total_matches = counters['total_matches']
+    first_moves = counters['first_moves']
+    coin_wins = counters['coin_wins']
+
+    win_rate = rate_calc(counters['wins'], total_matches)                     # 胜率
+    coin_win_rate = rate_calc(coin_wins, total_matches)                       # 硬币胜率
+    first_move_rate = rate_calc(first_moves, total_matches)                   # 先手率
+    first_move_win_rate = rate_calc(counters['first_move_wins'], first_moves) # 先手胜率
+    second_move_win_rate = rate_calc(counters['second_move_wins'],            # 后手胜率
+                                     (total_matches - first_moves))
+    win_coin_win_rate = rate_calc(counters['win_coin_wins'], coin_wins)       # 赢硬币胜率
+    lose_coin_win_rate = rate_calc(counters['lose_coin_wins'],                # 输硬币胜率
+                                   (total_matches - coin_wins))
+    return {
+        'season_num': season_num,
+        'total_matches': total_matches,
+        'coin_wins': coin_wins,
+        'wins': counters['wins'],
+        'first_moves': first_moves,
+        'first_move_wins': counters['first_move_wins'],
+        'second_move_wins': counters['second_move_wins'],
+        'win_coin_wins': counters['win_coin_wins'],
+        'lose_coin_wins': counters['lose_coin_wins'],
+        'win_rate': round(win_rate, 2),
+        'coin_win_rate': round(coin_win_rate, 2),
+        'first_move_rate': round(first_move_rate, 2),
+        'first_move_win_rate': round(first_move_win_rate, 2),
+        'second_move_win_rate': round(second_move_win_rate, 2),
+        'win_coin_win_rate': round(win_coin_win_rate, 2),
+        'lose_coin_win_rate': round(lose_coin_win_rate, 2),
+    }
 
-    wins = 0
-    coin_wins = 0
-    total_matches = 0
-    first_moves = 0
-    first_move_wins = 0
-    second_move_wins = 0
-    win_coin_wins = 0
-    lose_coin_wins = 0
+def season_summaries(data_dir):
+    """各赛季的可合并摘要 [(赛季, SeasonSummary)]
 
-    streak_coin_win = []
-    streak_coin_lose = []
+    读取缓存的 stats/sN_partial.json，对局记录未变时不读原始对局；缺失或过期的赛季才重新生成
+    """
+    from utils.shardAggregate import load_summary
 
-    interval_stats = []
+    layout = DataLayout(data_dir)
+    summaries = []
+    for season_num in layout.seasons():
+        if not layout.json(season_num).exists():
+            continue
+        summary = load_summary(layout.root, season_num)
+        add_rows(summary.total_matches)
+        summaries.append((season_num, summary))
+    return summaries
 
-    for json_file in sorted_files:
-        # 从文件名解析赛季编号（如s39）
-        season_name = json_file.stem.split('_')[0]  # 获取s39
-        season_num = int(season_name[1:])  # 提取纯数字39
+def _accumulate_season_stats(data_dir):
+    from utils.seasonSummary import SeasonSummary
 
-        # 读取数据
-        with open(json_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
+    # 逐赛季合并摘要，累计计数器
+    interval_stats = []
+    accumulated = SeasonSummary.empty()
+    for season_num, summary in season_summaries(data_dir):
+        accumulated = accumulated.merge(summary)
+        interval_stats.append(accumulate_entry(season_num, accumulated.counters))
 
-            wins += stats['wins']
-            coin_wins += stats['coin_wins']
-            total_matches += stats['total_matches']
-            first_moves += stats['first_moves']
-            first_move_wins += stats['first_move_wins']
-            second_move_wins += stats['second_move_wins']
-            win_coin_wins += stats['win_coin_wins']
-            lose_coin_wins += stats['lose_coin_wins']
-
-            streak_coin_win.extend(
-                stats['coin_streaks']['streak_list']['win']
-            )
-            streak_coin_lose.extend(
-                stats['coin_streaks']['streak_list']['lose']
-            )
-
-            win_rate = rate_calc(wins, total_matches)                    # 胜率
-            coin_win_rate = rate_calc(coin_wins, total_matches)          # 硬币胜率
-            first_move_rate = rate_calc(first_moves, total_matches)      # 先手率
-            first_move_win_rate = rate_calc(first_move_wins, first_moves)# 先手胜率
-            second_move_win_rate = rate_calc(second_move_wins,           # 后手胜率
-                                             (total_matches - first_moves))
-            win_coin_win_rate = rate_calc(win_coin_wins, coin_wins)      # 赢硬币胜率
-
-            lose_coin_win_rate = rate_calc(lose_coin_wins,               # 输硬币胜率
-                                           (total_matches - coin_wins))
-
-            accumulate_stats = {
-                'season_num':season_num,
-                'total_matches': total_matches,
-                'coin_wins': coin_wins,
-                'wins': wins,
-                'first_moves':first_moves,
-                'total_matches': total_matches,
-                'first_moves':first_moves,
-                'first_move_wins':first_move_wins,
-                'second_move_wins': second_move_wins,
-                'win_coin_wins': win_coin_wins,
-                'lose_coin_wins': lose_coin_wins,
-                'win_rate': round(win_rate, 2),
-                'coin_win_rate': round(coin_win_rate, 2),
-                'first_move_rate': round(first_move_rate, 2),
-                'first_move_win_rate': round(first_move_win_rate, 2),
-                'second_move_win_rate': round(second_move_win_rate, 2),
-                'win_coin_win_rate': round(win_coin_win_rate, 2),
-                'lose_coin_win_rate': round(lose_coin_win_rate, 2),
-            }
-            # print(accumulate_stats)
-            interval_stats.append(accumulate_stats)
     total_stats = {'interval_stats':interval_stats}
 
     # 生成所有赛季累积的各种胜率
-    show_plot_analysis(total_stats)
-    #strek_chart(streak_coin_win, streak_coin_lose)
+    with span('plot'):
+        setup_matplotlib()
+        from utils.dynamicStats import show_plot_analysis
+        show_plot_analysis(total_stats)
 
         # 赛季表格
         # stats_table = generate_season_stats_table(
@@ -397,5 +403,16 @@ def accumulate_season_stats():
 
 
 if __name__ == "__main__":
-    #accumulate_season_stats()
-    individual_season_stats()
+    parser = argparse.ArgumentParser(description="跨赛季统计")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--accumulate', action='store_true',
+                        help="绘制累计胜率趋势（默认打印各赛季独立胜率表）")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    if args.accumulate:
+        accumulate_season_stats(args.data_dir)
+    else:
+        individual_season_stats(args.data_dir)
+    stageProfiler.report()
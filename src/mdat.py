@@ -0,0 +1,102 @@
+"""统一命令行入口
+
+文字类子命令（stats / seasons / total）只导入标准库与 utils 中的轻量模块，
+绘图与统计相关的脚本按子命令转发，只有用到时才加载 matplotlib / pandas / scipy。
+
+用法（在 src 目录下）：
+    python mdat.py stats 40          # 打印赛季统计
+    python mdat.py seasons           # 列出已有赛季
+    python mdat.py total             # 各赛季独立胜率表
+    python mdat.py draw -j 8         # 其余子命令转发给对应脚本
+"""
+import argparse
+import sys
+
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout
+
+# 转发给原有脚本的子命令：子命令 -> 模块
+SCRIPT_COMMANDS = {
+    'convert': 'xlsxToJson',
+    'analyze': 'calcStats',
+    'draw': 'drawStats',
+    'md': 'generateMD',
+    'pipeline': 'pipeline',
+    'query': 'query',
+    'trend': 'trendStats',
+    'watch': 'watchStats',
+    'serve': 'serveStats',
+    'archive': 'archiveStats',
+    'index': 'utils.matchIndex',
+}
+
+
+def run_script(command, argv):
+    """以 __main__ 方式运行脚本模块，参数原样传入
+
+    alter_sys=True 让脚本成为 sys.modules['__main__']，进程池可正常序列化脚本中的函数。
+    """
+    import runpy
+
+    sys.argv[1:] = argv
+    runpy.run_module(SCRIPT_COMMANDS[command], run_name='__main__', alter_sys=True)
+
+
+def cmd_stats(args):
+    from printStatsJson import load_stats, print_stats
+
+    stats = load_stats(args.season, args.data_dir)
+    if stats is None:
+        return 1
+    print_stats(stats, args.season)
+    return 0
+
+
+def cmd_seasons(args):
+    layout = DataLayout(args.data_dir)
+    for season_num in layout.seasons():
+        stats = "已统计" if layout.stats(season_num).exists() else "未统计"
+        print(f"s{season_num}\t{stats}")
+    return 0
+
+
+def cmd_total(args):
+    from generateTotalStats import individual_season_stats
+
+    individual_season_stats(args.data_dir)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="mdat.py", description="游戏王大师决斗数据分析工具",
+        epilog=f"脚本子命令：{', '.join(SCRIPT_COMMANDS)}（参数见 mdat.py <子命令> -h）"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats = subparsers.add_parser('stats', help="打印赛季统计")
+    stats.add_argument('season', type=int, nargs='?', default=18, help="赛季编号（默认18）")
+    stats.set_defaults(func=cmd_stats)
+
+    seasons = subparsers.add_parser('seasons', help="列出数据目录中的赛季")
+    seasons.set_defaults(func=cmd_seasons)
+
+    total = subparsers.add_parser('total', help="各赛季独立胜率表")
+    total.set_defaults(func=cmd_total)
+
+    for sub in (stats, seasons, total):
+        sub.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # 脚本子命令在 argparse 之前转发，保留各脚本自己的参数解析与帮助信息
+    if argv and argv[0] in SCRIPT_COMMANDS:
+        run_script(argv[0], argv[1:])
+        return 0
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import stageProfiler
+from utils.buildCache import BuildCache
+from utils.dataLayout import DEFAULT_DATA_DIR, ArchiveLayout, DataLayout, parse_seasons
+
+# 赛季内各阶段及其依赖：转换 → 统计 → 图表 → 报告
+STAGES = {
+    'convert': (),
+    'analyze': ('convert',),
+    'render': ('analyze',),
+    'markdown': ('render',),
+}
+
+
+def stage_order(selected):
+    """按依赖关系（拓扑序）排列选中的阶段"""
+    ordered = []
+
+    def visit(stage):
+        if stage in ordered:
+            return
+        for dep in STAGES[stage]:
+            visit(dep)
+        ordered.append(stage)
+
+    for stage in STAGES:
+        visit(stage)
+    return [stage for stage in ordered if stage in selected]
+
+
+def run_convert(layout, season_num, cache, options):
+    from xlsxToJson import MatchDataReader
+
+    xlsx_file = layout.xlsx(season_num)
+    json_file = layout.json(season_num)
+    if not xlsx_file.exists():
+        return f"{xlsx_file} 不存在，跳过"
+    layout.json_dir.mkdir(parents=True, exist_ok=True)
+    outputs = [json_file]
+    if options.get('store'):
+        layout.store_dir.mkdir(parents=True, exist_ok=True)
+        outputs.append(layout.store(season_num))
+
+    def build():
+        reader = MatchDataReader(xlsx_file, reader=options.get('reader', 'pandas'))
+        reader.process().save_json(json_file)
+        if options.get('store'):
+            reader.save_store(layout.store(season_num))
+
+    return cache.run('convert', season_num, [xlsx_file], outputs, build)
+
+
+def run_analyze(layout, season_num, cache, options):
+    from calcStats import analyze_match_data, analyze_match_store, save_stats
+
+    # 有 .mds 存储时直接从存储统计，否则读取 json
+    source = layout.store(season_num)
+    analyze = analyze_match_store
+    if not (options.get('store') and source.exists()):
+        source = layout.json(season_num)
+        analyze = analyze_match_data
+    stats_file = layout.stats(season_num)
+    if not source.exists():
+        return f"{source} 不存在，跳过"
+    layout.stats_dir.mkdir(parents=True, exist_ok=True)
+    build = lambda: save_stats(stats_file, analyze(source))
+    return cache.run('analyze', season_num, [source], [stats_file], build)
+
+
+def run_render(layout, season_num, cache, options):
+    from drawStats import CHART_FILES, save_season_charts
+
+    stats_file = layout.stats(season_num)
+    chart_dir = layout.charts(season_num)
+    if not stats_file.exists():
+        return f"{stats_file} 不存在，跳过"
+
+    def build():
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        save_season_charts(stats, season_num, chart_dir,
+                           template=options.get('template', False),
+                           force=cache.force)
+
+    outputs = [chart_dir / name for name in CHART_FILES]
+    return cache.run('render', season_num, [stats_file], outputs, build)
+
+
+def run_markdown(layout, season_num, cache, options):
+    from generateMD import write_season_markdown
+
+    if not layout.charts(season_num).is_dir():
+        return f"{layout.charts(season_num)} 不存在，跳过"
+    layout.md_dir.mkdir(parents=True, exist_ok=True)
+    build = lambda: write_season_markdown(season_num, layout.md_dir)
+    return cache.run('markdown', season_num, [], [layout.md(season_num)], build)
+
+
+STAGE_RUNNERS = {
+    'convert': run_convert,
+    'analyze': run_analyze,
+    'render': run_render,
+    'markdown': run_markdown,
+}
+
+
+def run_season(root, season_num, stages, force=False, options=None):
+    """在单个进程内按顺序执行一个赛季的全部阶段
+
+    每个阶段返回 True（已生成）/ False（输入未变，使用缓存）/ 跳过原因。
+    """
+    layout = DataLayout(root)
+    cache = BuildCache(layout.root, force=force)
+    options = options or {}
+    report = []
+    for stage in stages:
+        start = time.perf_counter()
+        with stageProfiler.span(stage, season=season_num, root=str(layout.root)):
+            status = STAGE_RUNNERS[stage](layout, season_num, cache, options)
+        report.append((stage, time.perf_counter() - start, status))
+        if isinstance(status, str):
+            break
+    return report
+
+
+def _init_worker():
+    # 子进程只做离屏渲染，并预热字体缓存
+    from utils.renderPool import init_render_worker
+
+    init_render_worker()
+
+
+def run_pipeline(roots, seasons=None, stages=tuple(STAGES), workers=None,
+                 force=False, options=None):
+    """以赛季为单位把任务分发到进程池；结果按提交顺序返回
+
+    options 传给各阶段，如 {'reader': 'calamine'} 指定 xlsx 读取后端。
+    """
+    stages = stage_order(stages)
+    jobs = []
+    for root in roots:
+        layout = DataLayout(root)
+        for season_num in (seasons or layout.seasons()):
+            jobs.append((str(layout.root), season_num))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker()
+        reports = [run_season(root, num, stages, force, options)
+                   for root, num in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker) as pool:
+            futures = [pool.submit(run_season, root, num, stages, force, options)
+                       for root, num in jobs]
+            reports = [future.result() for future in futures]
+
+    return list(zip(jobs, reports))
+
+
+if __name__ == "__main__":
+    from xlsxToJson import READERS
+
+    parser = argparse.ArgumentParser(description="多赛季数据处理流水线")
+    parser.add_argument('--data-dir', action='append',
+                        help=f"数据目录，可重复指定多个（默认 {DEFAULT_DATA_DIR}）")
+    parser.add_argument('--archive', help="多玩家档案目录：处理 players/ 下每个玩家的数据目录")
+    parser.add_argument('--seasons', type=parse_seasons,
+                        help="赛季范围，如 18-41（默认为数据目录中全部赛季）")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help="要执行的阶段，逗号分隔（convert,analyze,render,markdown）")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="并行进程数（默认CPU核数）")
+    parser.add_argument('--force', action='store_true',
+                        help="忽略构建缓存，全部重新生成")
+    parser.add_argument('--reader', choices=READERS, default='pandas',
+                        help="xlsx 读取后端（默认 pandas）")
+    parser.add_argument('--store', action='store_true',
+                        help="同时生成 .mds 列式存储，并从存储计算统计")
+    parser.add_argument('--template', action='store_true',
+                        help="图表复用模板，只更新数据后保存")
+    parser.add_argument('--index', action='store_true',
+                        help="处理完成后重建跨赛季对局索引")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"未知阶段: {', '.join(sorted(unknown))}")
+
+    roots = list(args.data_dir or [])
+    if args.archive:
+        archive = ArchiveLayout(args.archive)
+        roots += [archive.player(name).root for name in archive.players()]
+    roots = roots or [DEFAULT_DATA_DIR]
+
+    start = time.perf_counter()
+    results = run_pipeline(
+        roots,
+        seasons=args.seasons,
+        stages=stages,
+        workers=args.workers,
+        force=args.force,
+        options={'reader': args.reader, 'store': args.store,
+                 'template': args.template},
+    )
+    for (root, season_num), report in results:
+        timings = ' '.join(
+            f"{stage}={elapsed:.2f}s" if status is True else f"{stage}=缓存"
+            for stage, elapsed, status in report if not isinstance(status, str)
+        )
+        skipped = [status for _, _, status in report if isinstance(status, str)]
+        status = skipped[0] if skipped else "处理完毕"
+        print(f"{root} s{season_num}: {status} {timings}")
+    if args.index:
+        from utils.matchIndex import build_index
+
+        for root in roots:
+            index = build_index(DataLayout(root))
+            print(f"{root} 索引完成：{len(index)}场对局")
+    print(f"总耗时 {time.perf_counter() - start:.2f}s")
+    stageProfiler.report()
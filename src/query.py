@@ -0,0 +1,79 @@
+import argparse
+import csv
+import json
+import sys
+
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout, parse_seasons
+from utils.matchIndex import MatchIndex, build_index, sync_index
+from utils.matchQuery import DEFAULT_METRICS, GROUP_COLUMNS, METRICS, Query
+from utils.textTable import grid_table
+
+
+def open_index(data_dir, rebuild=False):
+    """打开跨赛季索引：不存在时先构建，新增或变化的赛季先同步进索引"""
+    layout = DataLayout(data_dir)
+    if rebuild:
+        return build_index(layout)
+    return sync_index(MatchIndex(layout.index_dir), layout)
+
+
+def print_results(results, output_format):
+    if not results:
+        print("无匹配对局")
+        return
+    if output_format == 'json':
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    elif output_format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    else:
+        print(grid_table(results, headers='keys', floatfmt=".2f"))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="对局记录查询：过滤 / 分组 / 聚合",
+        epilog="例：python query.py --seasons 30-41 --op-deck 天杯龙 "
+               "--group-by season --agg count,win_rate,coin_win_rate_ci"
+    )
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--rebuild-index', action='store_true', help="重建索引后查询")
+    parser.add_argument('--seasons', type=parse_seasons, help="赛季范围，如 30-41")
+    parser.add_argument('--my-deck', action='append', help="己方卡组（可重复）")
+    parser.add_argument('--op-deck', action='append', help="对手卡组（可重复）")
+    parser.add_argument('--move', choices=['first', 'second'], help="先手/后手")
+    parser.add_argument('--coin', choices=['win', 'lose'], help="硬币结果")
+    parser.add_argument('--notes', help="备注正则，如 '大师|钻石'")
+    parser.add_argument('--group-by', default='',
+                        help=f"分组键，逗号分隔：{','.join(GROUP_COLUMNS)}")
+    parser.add_argument('--agg', default=','.join(DEFAULT_METRICS),
+                        help=f"聚合指标，逗号分隔：{','.join(METRICS)}")
+    parser.add_argument('--sort', help="按该字段降序排列")
+    parser.add_argument('--limit', type=int, help="只显示前N行")
+    parser.add_argument('--format', choices=['table', 'json', 'csv'], default='table')
+    return parser
+
+
+def run_query(args):
+    query = (
+        Query(open_index(args.data_dir, args.rebuild_index))
+        .where(seasons=args.seasons, my_deck=args.my_deck, op_deck=args.op_deck,
+               move=args.move, coin=args.coin, notes=args.notes)
+        .group_by(*[key for key in args.group_by.split(',') if key])
+        .agg(*args.agg.split(','))
+    )
+    if args.sort:
+        query = query.order_by(args.sort)
+    if args.limit is not None:
+        query = query.limit(args.limit)
+    print_results(query.run(), args.format)
+
+
+if __name__ == "__main__":
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        run_query(args)
+    except ValueError as e:
+        parser.error(str(e))
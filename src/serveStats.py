@@ -0,0 +1,344 @@
+"""本地 HTTP 看板：统计结果、对局查询与按需绘制的图表
+
+    GET /                                    赛季列表
+    GET /api/seasons                         已有赛季及是否已统计
+    GET /api/stats/41                        sN_stats.json
+    GET /api/query?seasons=30-41&op_deck=天杯龙&group_by=season&agg=count,win_rate
+    GET /chart/41/season_stats.png           按需绘制（.png / .svg）
+    GET /chart/41/deck_stats.svg?my_deck=XX  只统计符合条件的对局后绘制（my_deck / op_deck / move / coin）
+    GET /api/cache                           响应缓存命中情况
+
+生成的响应体按 (类型, 参数, 数据指纹) 缓存在内存 LRU 中，ETag 由同一个键得到，
+客户端带 If-None-Match 时直接返回 304，不需要重新绘制。
+请求由线程池并发处理；matplotlib 不是线程安全的，绘图在一把锁内串行进行。
+
+用法（在 src 目录下）：
+    python serveStats.py --port 8000
+"""
+import argparse
+import html
+import json
+import tempfile
+import threading
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from utils.buildCache import file_digest
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout, parse_seasons
+from utils.responseCache import DEFAULT_MAX_BYTES, ResponseCache, etag_for
+
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'json': 'application/json; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+}
+
+# 图表可用的对局过滤参数 -> (对局字段, 允许的取值)
+CHART_FILTERS = {
+    'my_deck': ('my_deck', None),
+    'op_deck': ('op_deck', None),
+    'move': ('first_move', ('first', 'second')),
+    'coin': ('coin_res', ('win', 'lose')),
+}
+
+# 查询接口的参数（与 query.py 的命令行参数同名）
+QUERY_PARAMS = ('seasons', 'my_deck', 'op_deck', 'move', 'coin', 'notes',
+                'group_by', 'agg', 'sort', 'limit')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _stat_key(path):
+    """(路径, 修改时间, 大小)，文件不存在时为 None"""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=64)
+def _load_json(path, mtime_ns, size):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=64)
+def _file_etag(path, mtime_ns, size):
+    return f'"{file_digest(path)}"'
+
+
+@lru_cache(maxsize=32)
+def _slice_stats(match_file, mtime_ns, size, filters):
+    """只统计符合过滤条件的对局（结果经 json 往返，与统计文件结构一致）"""
+    from calcStats import CustomEncoder, analyze_matches
+
+    matches = _load_json(match_file, mtime_ns, size)
+    for name, value in filters:
+        field = CHART_FILTERS[name][0]
+        matches = [match for match in matches if match[field] == value]
+    if not matches:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "没有符合条件的对局")
+    return json.loads(json.dumps(analyze_matches(matches), cls=CustomEncoder))
+
+
+class Dashboard:
+    """看板的数据访问与响应生成（与 HTTP 处理分离）"""
+
+    def __init__(self, root=DEFAULT_DATA_DIR, cache_bytes=DEFAULT_MAX_BYTES, template=True):
+        self.layout = DataLayout(root)
+        self.cache = ResponseCache(cache_bytes)
+        self.template = template
+        self._render_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._index = None
+        self._index_key = None
+
+    def seasons(self):
+        body = [
+            {'season': season_num, 'stats': self.layout.stats(season_num).exists()}
+            for season_num in self.layout.seasons()
+        ]
+        return _json_bytes(body), 'json'
+
+    def stats_file(self, season_num):
+        """统计文件路径与 ETag（文件内容摘要，按修改时间缓存）"""
+        key = _stat_key(self.layout.stats(season_num))
+        if key is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"s{season_num} 尚未统计")
+        return Path(key[0]), _file_etag(*key)
+
+    def _season_stats(self, season_num, filters):
+        if not filters:
+            key = _stat_key(self.layout.stats(season_num))
+            if key is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"s{season_num} 尚未统计")
+            return _load_json(*key)
+        key = _stat_key(self.layout.json(season_num))
+        if key is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"s{season_num} 没有对局记录")
+        return _slice_stats(*key, filters)
+
+    def chart(self, season_num, name, params):
+        from drawStats import CHART_FILES, chart_fingerprint
+
+        chart, _, fmt = name.rpartition('.')
+        chart_file = f"{chart}.png"
+        if chart_file not in CHART_FILES or fmt not in ('png', 'svg'):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"未知图表: {name}")
+        filters = _chart_filters(params)
+        stats = self._season_stats(season_num, filters)
+        key = ('chart', season_num, chart, fmt, filters,
+               chart_fingerprint(stats, season_num, chart_file))
+
+        def build():
+            return self._draw(stats, season_num, chart_file, fmt), fmt
+
+        return key, build
+
+    def _draw(self, stats, season_num, chart_file, fmt):
+        from drawStats import draw_chart
+
+        with self._render_lock, tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / f"chart.{fmt}"
+            draw_chart(stats, season_num, chart_file, str(output), template=self.template)
+            return output.read_bytes()
+
+    def _index_key_now(self):
+        """索引文件与各赛季对局文件的 stat，任一变化时需要重新打开 / 同步索引"""
+        from utils.matchIndex import source_stamps
+
+        stamps = tuple((season, tuple(stamp))
+                       for season, stamp in sorted(source_stamps(self.layout).items()))
+        return _stat_key(self.layout.index_dir / "meta.json"), stamps
+
+    def _match_index(self):
+        """跨赛季索引；索引文件或对局文件更新后重新打开并同步"""
+        from query import open_index
+
+        key = self._index_key_now()
+        with self._index_lock:
+            if self._index is None or key != self._index_key:
+                self._index = open_index(self.layout.root)
+                self._index_key = self._index_key_now()
+            return self._index, self._index_key
+
+    def query(self, params):
+        from utils.matchQuery import DEFAULT_METRICS, Query
+
+        unknown = set(params) - set(QUERY_PARAMS)
+        if unknown:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"未知参数: {', '.join(sorted(unknown))}")
+        index, index_key = self._match_index()
+        options = tuple((name, tuple(values)) for name, values in sorted(params.items()))
+        key = ('query', options, index_key)
+
+        def single(name):
+            values = params.get(name)
+            return values[-1] if values else None
+
+        def build():
+            try:
+                query = (
+                    Query(index)
+                    .where(seasons=parse_seasons(single('seasons')) if single('seasons') else None,
+                           my_deck=params.get('my_deck'), op_deck=params.get('op_deck'),
+                           move=single('move'), coin=single('coin'), notes=single('notes'))
+                    .group_by(*[g for g in (single('group_by') or '').split(',') if g])
+                    .agg(*(single('agg') or ','.join(DEFAULT_METRICS)).split(','))
+                )
+                if single('sort'):
+                    query = query.order_by(single('sort'))
+                if single('limit'):
+                    query = query.limit(int(single('limit')))
+                return _json_bytes(query.run()), 'json'
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from e
+
+        return key, build
+
+    def index_page(self):
+        from drawStats import CHART_FILES
+
+        rows = []
+        for season_num in self.layout.seasons():
+            links = [f'<a href="/api/stats/{season_num}">stats</a>'] + [
+                f'<a href="/chart/{season_num}/{chart}">{chart.split(".")[0]}</a>'
+                for chart in CHART_FILES
+            ]
+            rows.append(f"<li>s{season_num}: {' | '.join(links)}</li>")
+        body = (
+            "<!doctype html><meta charset='utf-8'><title>YGO-MDAT</title>"
+            f"<h1>赛季统计</h1><p>{html.escape(str(self.layout.root))}</p>"
+            f"<ul>{''.join(rows)}</ul>"
+        )
+        return body.encode('utf-8'), 'html'
+
+
+def _json_bytes(value):
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+
+def _chart_filters(params):
+    """图表过滤参数 -> 排序后的 ((参数, 取值), ...)，用作缓存键的一部分"""
+    filters = []
+    for name, values in params.items():
+        if name not in CHART_FILTERS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"未知参数: {name}")
+        allowed = CHART_FILTERS[name][1]
+        value = values[-1]
+        if allowed is not None and value not in allowed:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} 只能为 {'/'.join(allowed)}")
+        filters.append((name, value))
+    return tuple(sorted(filters))
+
+
+def _season(text):
+    try:
+        return int(text.lstrip('s'))
+    except ValueError:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"未知赛季: {text}") from None
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    dashboard = None
+    quiet = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        params = parse_qs(url.query)
+        try:
+            self._dispatch(parts, params)
+        except HTTPError as e:
+            self._send(e.status, _json_bytes({'error': str(e)}), 'json')
+
+    def _dispatch(self, parts, params):
+        dashboard = self.dashboard
+        if not parts:
+            return self._send(HTTPStatus.OK, *dashboard.index_page())
+        if parts == ['api', 'seasons']:
+            return self._send(HTTPStatus.OK, *dashboard.seasons())
+        if parts == ['api', 'cache']:
+            return self._send(HTTPStatus.OK, _json_bytes(dashboard.cache.info()), 'json')
+        if len(parts) == 3 and parts[:2] == ['api', 'stats']:
+            path, etag = dashboard.stats_file(_season(parts[2]))
+            if self._not_modified(etag):
+                return
+            return self._send(HTTPStatus.OK, path.read_bytes(), 'json', etag)
+        if parts == ['api', 'query']:
+            return self._cached(*dashboard.query(params))
+        if len(parts) == 3 and parts[0] == 'chart':
+            return self._cached(*dashboard.chart(_season(parts[1]), parts[2], params))
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"未知路径: {self.path}")
+
+    def _cached(self, key, build):
+        etag = etag_for(key)
+        if self._not_modified(etag):
+            return
+        body, fmt = self.dashboard.cache.get_or_build(key, build)
+        self._send(HTTPStatus.OK, body, fmt, etag)
+
+    def _not_modified(self, etag):
+        if etag is None or self.headers.get('If-None-Match') != etag:
+            return False
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        return True
+
+    def _send(self, status, body, fmt, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', CONTENT_TYPES[fmt])
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(dashboard, host='127.0.0.1', port=8000, quiet=False):
+    handler = type('Handler', (DashboardHandler,), {'dashboard': dashboard, 'quiet': quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="本地 HTTP 看板：统计结果、查询与按需绘制的图表")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_MAX_BYTES / 2 ** 20,
+                        help="响应缓存容量（MB，默认64）")
+    parser.add_argument('--no-template', action='store_true',
+                        help="每次绘制新建图表（默认复用进程内图表模板）")
+    parser.add_argument('--quiet', action='store_true', help="不打印访问日志")
+    args = parser.parse_args()
+
+    from utils.renderPool import init_render_worker
+
+    init_render_worker()
+    dashboard = Dashboard(args.data_dir, int(args.cache_mb * 2 ** 20),
+                          template=not args.no_template)
+    server = make_server(dashboard, args.host, args.port, args.quiet)
+    print(f"看板地址 http://{args.host}:{args.port}/ （Ctrl+C 退出）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,77 @@
+import argparse
+import math
+
+import numpy as np
+
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout, parse_seasons
+from utils.trendEngine import season_series
+
+# 默认绘制的趋势：最近20场滚动 + EWMA
+DEFAULT_TRENDS = ['rolling:20', 'ewma:0.1']
+
+
+def trend_filename(spec):
+    """rolling:50 -> trend_rolling50.png"""
+    return "trend_" + spec.replace(':', '').replace('.', '_') + ".png"
+
+
+def format_rate(value):
+    return '-' if value is None or math.isnan(value) else f"{value:.1f}%"
+
+
+def print_trend(season_num, trend):
+    """打印趋势序列的最新值与区间"""
+    print(f"s{season_num} {trend['label']}（{len(trend['x'])}个点）")
+    for key in ('win_rate', 'coin_win_rate', 'first_move_rate'):
+        values = trend[key][~np.isnan(trend[key])]
+        if not len(values):
+            continue
+        print(f"  {key:16s} 最新 {format_rate(trend[key][-1]):>7s} "
+              f"最低 {format_rate(values.min()):>7s} 最高 {format_rate(values.max()):>7s}")
+
+
+def save_trends(layout, season_num, specs, output_dir=None):
+    """绘制一个赛季的多个趋势图，返回输出文件"""
+    import json
+
+    from utils.dynamicStats import save_plot_analysis
+
+    with open(layout.stats(season_num), 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    series = season_series(layout, season_num)
+    output_dir = output_dir or layout.charts(season_num)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    outputs = []
+    for spec in specs:
+        filename = output_dir / trend_filename(spec)
+        save_plot_analysis(stats, str(filename), trend=series.trend(spec))
+        outputs.append(filename)
+    return outputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="滚动窗口 / EWMA 胜率趋势（由赛季前缀和缓存计算，任意窗口无需重新统计）",
+        epilog="例：python trendStats.py --seasons 40-41 --trend rolling:50 --trend ewma:0.05"
+    )
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--seasons', type=parse_seasons, help="赛季范围（默认全部）")
+    parser.add_argument('--trend', action='append',
+                        help="cumulative / rolling:N / ewma:α，可重复（默认 rolling:20 与 ewma:0.1）")
+    parser.add_argument('--print', action='store_true', help="只打印趋势摘要，不绘图")
+    args = parser.parse_args()
+
+    layout = DataLayout(args.data_dir)
+    specs = args.trend or DEFAULT_TRENDS
+    for season_num in args.seasons or layout.seasons():
+        if not layout.json(season_num).exists():
+            print(f"s{season_num}对局记录不存在，跳过")
+            continue
+        if args.print:
+            series = season_series(layout, season_num)
+            for spec in specs:
+                print_trend(season_num, series.trend(spec))
+            continue
+        for filename in save_trends(layout, season_num, specs):
+            print(f"Generated: {filename}")
@@ -0,0 +1,155 @@
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+# 修改输出格式等配置时递增，使全部缓存失效
+CACHE_VERSION = 1
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# 各阶段依赖的代码文件（代码变化时该阶段需要重建）
+STAGE_SOURCES = {
+    'convert': ['xlsxToJson.py'],
+    'analyze': [
+        'calcStats.py',
+        'utils/matchupMatrix.py',
+        'utils/streakEngine.py',
+        'utils/confidence.py',
+        'utils/fairness.py',
+        'utils/deckHistogram.py',
+        'utils/statsAccumulator.py',
+        'utils/matchStream.py',
+        'utils/matchStore.py',
+    ],
+    'render': [
+        'drawStats.py',
+        'utils/dynamicStats.py',
+        'utils/streakVisualizer.py',
+        'utils/streakEngine.py',
+        'utils/deckStatsVisualizer.py',
+        'utils/deckDistributionVisualizer.py',
+        'utils/deckHistogram.py',
+        'utils/seasonStatsVisualizer.py',
+        'utils/chartTemplate.py',
+        'utils/matchupHeatmapVisualizer.py',
+        'utils/matchupMatrix.py',
+    ],
+    'markdown': ['generateMD.py'],
+    'partial': [
+        'utils/shardAggregate.py',
+        'utils/seasonSummary.py',
+        'utils/streakEngine.py',
+        'utils/trendEngine.py',
+    ],
+    'sketch': [
+        'utils/shardAggregate.py',
+        'utils/deckHistogram.py',
+        'utils/matchStream.py',
+    ],
+}
+
+
+def file_stamp(path):
+    """文件的 [大小, 修改时间ns]（只 stat，不读内容）"""
+    stat = Path(path).stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def file_digest(path):
+    """文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_digest(stage):
+    """阶段代码版本：相关源文件内容 + CACHE_VERSION"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for name in STAGE_SOURCES.get(stage, []):
+        digest.update(name.encode())
+        digest.update(file_digest(SRC_DIR / name).encode())
+    return digest.hexdigest()
+
+
+def stats_slice(stats, path):
+    """按点分路径取统计结果的一部分，如 coin_streaks.streak_list（字段缺失时为 None）"""
+    value = stats
+    for key in path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def stats_fingerprint(stats, paths, extra=None):
+    """统计结果中指定字段（及 extra 附加信息）的 sha256 指纹"""
+    payload = {
+        'extra': extra,
+        'slices': {path: stats_slice(stats, path) for path in paths},
+    }
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+class BuildCache:
+    """内容哈希构建缓存：输入与代码未变且产物存在时跳过该赛季的阶段
+
+    清单按赛季分别保存在 <数据目录>/.build/sN.json，并行处理不同赛季时互不冲突。
+    """
+
+    def __init__(self, root, force=False):
+        self.manifest_dir = Path(root).expanduser() / ".build"
+        self.force = force
+
+    def _manifest_path(self, season_num):
+        return self.manifest_dir / f"s{season_num}.json"
+
+    def _load(self, season_num):
+        path = self._manifest_path(season_num)
+        if not path.exists():
+            return {}
+        with path.open('r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, season_num, manifest):
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        with self._manifest_path(season_num).open('w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    def digest(self, stage, inputs):
+        """阶段输入摘要（代码版本 + 各输入文件内容）"""
+        digest = hashlib.sha256(code_digest(stage).encode())
+        for path in inputs:
+            digest.update(Path(path).name.encode())
+            digest.update(file_digest(path).encode())
+        return digest.hexdigest()
+
+    def is_fresh(self, stage, season_num, inputs, outputs):
+        if self.force:
+            return False
+        if not all(Path(path).exists() for path in outputs):
+            return False
+        entry = self._load(season_num).get(stage)
+        return entry is not None and entry['digest'] == self.digest(stage, inputs)
+
+    def record(self, stage, season_num, inputs, outputs):
+        manifest = self._load(season_num)
+        manifest[stage] = {
+            'digest': self.digest(stage, inputs),
+            'inputs': [str(path) for path in inputs],
+            'outputs': [str(path) for path in outputs],
+        }
+        self._save(season_num, manifest)
+
+    def run(self, stage, season_num, inputs, outputs, build):
+        """输入未变时跳过，否则执行 build() 并记录；返回是否实际执行"""
+        if self.is_fresh(stage, season_num, inputs, outputs):
+            return False
+        build()
+        self.record(stage, season_num, inputs, outputs)
+        return True
@@ -0,0 +1,115 @@
+from matplotlib import rcParams
+from matplotlib.figure import Figure
+from utils.stageProfiler import span
+
+
+class ChartTemplate:
+    """图表模板：首次渲染时创建 figure 与全部 artists 并排版，
+    之后每个赛季只更新数据（set_data / set_height / set_text）再保存。
+
+    子类实现 build()（创建 figure 与 artists）和 update()（写入赛季数据），
+    数据形状超出模板容量时 fits() 返回 False，模板按新数据重建并重新排版。
+    """
+    figsize = (12, 8)
+    dpi = None
+    save_kwargs = {'bbox_inches': 'tight'}
+
+    def __init__(self):
+        self.fig = None
+
+    def new_figure(self):
+        # 不经过 pyplot，避免全局图形管理与 savefig 后的额外重绘
+        rcParams['font.sans-serif'] = ['LXGW WenKai']
+        return Figure(figsize=self.figsize, dpi=self.dpi)
+
+    def fits(self, stats):
+        return True
+
+    def build(self, stats, season_num):
+        raise NotImplementedError
+
+    def update(self, stats, season_num):
+        raise NotImplementedError
+
+    def layout(self):
+        """排版只在模板创建后的第一次更新时执行"""
+        self.fig.tight_layout()
+
+    def render(self, stats, season_num, filename):
+        rebuilt = self.fig is None or not self.fits(stats)
+        if rebuilt:
+            self.fig = self.new_figure()
+            self.build(stats, season_num)
+        self.update(stats, season_num)
+        if rebuilt:
+            self.layout()
+        with span('savefig'):
+            self.fig.savefig(filename, **self.save_kwargs)
+
+
+def bar_pool(ax, capacity, **kwargs):
+    """预先创建 capacity 个柱子，更新时只改高度与可见性"""
+    return list(ax.bar(range(capacity), [0] * capacity, **kwargs))
+
+
+def update_bars(bars, positions, heights, width=None):
+    """按数据更新柱子位置/高度，多余的柱子隐藏"""
+    for i, bar in enumerate(bars):
+        visible = i < len(heights)
+        bar.set_visible(visible)
+        if not visible:
+            continue
+        width = bar.get_width() if width is None else width
+        bar.set_x(positions[i] - width / 2)
+        bar.set_height(heights[i])
+
+
+def update_texts(texts, items):
+    """items 为 [(x, y, 文本)]，多余的文本隐藏"""
+    for i, text in enumerate(texts):
+        visible = i < len(items)
+        text.set_visible(visible)
+        if visible:
+            x, y, label = items[i]
+            text.set_position((x, y))
+            text.set_text(label)
+
+
+def rescale(ax, scalex=True, scaley=True):
+    """只按可见 artists 重新计算坐标范围"""
+    ax.relim(visible_only=True)
+    ax.autoscale_view(scalex=scalex, scaley=scaley)
+
+
+def error_segments(positions, lows, highs, cap=0.06):
+    """置信区间误差线（竖线与上下端短横线）的线段；区间缺失（None）的位置跳过"""
+    segments = []
+    for x, low, high in zip(positions, lows, highs):
+        if low is None or high is None:
+            continue
+        segments += [
+            [(x, low), (x, high)],
+            [(x - cap, low), (x + cap, low)],
+            [(x - cap, high), (x + cap, high)],
+        ]
+    return segments
+
+
+def error_bars(ax, positions=(), lows=(), highs=(), **kwargs):
+    """添加误差线集合，之后可用 set_segments(error_segments(...)) 更新"""
+    from matplotlib.collections import LineCollection
+
+    style = {'colors': '#333333', 'linewidths': 1, 'zorder': 3}
+    style.update(kwargs)
+    return ax.add_collection(LineCollection(error_segments(positions, lows, highs), **style))
+
+
+def split_intervals(intervals):
+    """[[下限, 上限], ...] 拆为 (下限列表, 上限列表)；旧版统计结果没有区间（None）时两者均为 None"""
+    bounds = [interval or (None, None) for interval in intervals]
+    return [low for low, _ in bounds], [high for _, high in bounds]
+
+
+def label_height(value, high):
+    """数值标签放在柱顶与区间上端中较高处"""
+    return value if high is None else max(value, high)
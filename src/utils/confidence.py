@@ -0,0 +1,97 @@
+from statistics import NormalDist
+
+import numpy as np
+
+# 95% 置信水平对应的正态分位数
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Wilson 得分区间（百分比），支持数组；trials 为 0 时区间为 (0, 0)"""
+    k = np.asarray(successes, dtype=float)
+    n = np.asarray(trials, dtype=float)
+    safe_n = np.where(n > 0, n, 1)
+    p = k / safe_n
+    z2 = z * z
+    denom = 1 + z2 / safe_n
+    center = (p + z2 / (2 * safe_n)) / denom
+    half = z * np.sqrt(p * (1 - p) / safe_n + z2 / (4 * safe_n * safe_n)) / denom
+    low = np.where(n > 0, np.clip(center - half, 0, 1), 0) * 100
+    high = np.where(n > 0, np.clip(center + half, 0, 1), 0) * 100
+    return low, high
+
+
+# 自助法重抽样次数；每行的随机数由 (种子, 成功数, 试验数) 生成，
+# 同一份计数无论在哪个批次、排在第几行，各统计路径上都得到相同区间
+BOOTSTRAP_RESAMPLES = 10_000
+BOOTSTRAP_SEED = 0
+
+
+def _row_generators(pairs, seed):
+    """每个 (成功数, 试验数) 一个独立的随机数生成器"""
+    return [np.random.default_rng([seed, k, n]) for k, n in pairs.tolist()]
+
+
+def _order_statistic_quantiles(uniform, qs):
+    """uniform 每行排序后按 numpy 'linear' 规则取分位所需的 (下位置值, 上位置值, 插值权重)"""
+    count = uniform.shape[1]
+    positions = [(count - 1) * q for q in qs]
+    lower = [int(np.floor(h)) for h in positions]
+    upper = [min(j + 1, count - 1) for j in lower]
+    ordered = np.partition(uniform, sorted(set(lower + upper)), axis=1)
+    return [(ordered[:, j], ordered[:, k], h - j)
+            for j, k, h in zip(lower, upper, positions)]
+
+
+def bootstrap_interval(successes, trials, resamples=BOOTSTRAP_RESAMPLES, level=0.95,
+                       seed=BOOTSTRAP_SEED, method='binomial'):
+    """自助法百分位区间（百分比），支持数组，所有概率一次抽样
+
+    二元结果数组有放回重抽样 n 次的成功数服从 Binomial(n, k/n)，因此直接按
+    (成功数, 试验数) 抽样，不需要保留逐场结果。每次重抽样用一个均匀随机数做逆变换抽样；
+    逆变换单调，样本分位数就是均匀数对应顺序统计量的逆变换，只需对这几个值求逆。
+    method='poisson' 为泊松自助法（每条记录权重 ~ Poisson(1)，成功/失败的权重和
+    分别 ~ Poisson(k)、Poisson(n-k)），与流式累加的计数同样适用。
+    全胜/全负（含 n 为 0）时重抽样分布退化为一点，改用 Wilson 区间。
+    相同的 (成功数, 试验数) 只抽样一次。
+    """
+    if method not in ('binomial', 'poisson'):
+        raise ValueError(f"未知的自助法: {method}（可用 binomial / poisson）")
+    k, n = np.broadcast_arrays(np.asarray(successes, dtype=np.int64),
+                               np.asarray(trials, dtype=np.int64))
+    shape = k.shape
+    pairs, inverse = np.unique(np.stack([k.ravel(), n.ravel()], axis=1), axis=0,
+                               return_inverse=True)
+    inverse = inverse.reshape(-1)
+    k, n = pairs[:, 0], pairs[:, 1]
+    safe_n = np.maximum(n, 1)
+    generators = _row_generators(pairs, seed)
+    alpha = (1 - level) / 2
+
+    if method == 'binomial':
+        from scipy.stats import binom
+
+        p = k / safe_n
+        uniform = np.array([rng.random(resamples) for rng in generators]).reshape(len(n), resamples)
+        bounds = []
+        for low_u, high_u, weight in _order_statistic_quantiles(uniform, (alpha, 1 - alpha)):
+            low_draw = binom.ppf(low_u, n, p)
+            high_draw = binom.ppf(high_u, n, p)
+            bounds.append((low_draw + (high_draw - low_draw) * weight) / safe_n * 100)
+        low, high = bounds
+    else:
+        draws = np.empty((resamples, len(n)))
+        for i, rng in enumerate(generators):
+            hits = rng.poisson(k[i], size=resamples)
+            total = hits + rng.poisson(n[i] - k[i], size=resamples)
+            draws[:, i] = np.divide(hits, total, out=np.full(resamples, k[i] / safe_n[i]),
+                                    where=total > 0)
+        low, high = np.quantile(draws, [alpha, 1 - alpha], axis=0) * 100
+
+    degenerate = (k == 0) | (k == n)
+    if degenerate.any():
+        z = NormalDist().inv_cdf(1 - alpha)
+        wilson_low, wilson_high = wilson_interval(k, n, z=z)
+        low = np.where(degenerate, wilson_low, low)
+        high = np.where(degenerate, wilson_high, high)
+    return low[inverse].reshape(shape), high[inverse].reshape(shape)
@@ -0,0 +1,111 @@
+import re
+from pathlib import Path
+
+DEFAULT_DATA_DIR = "~/yugioh-data/data"
+
+
+def parse_seasons(text):
+    """解析赛季范围，如 18-41 或 18,20,39-41"""
+    seasons = []
+    for part in text.split(','):
+        if '-' in part:
+            start, end = part.split('-')
+            seasons.extend(range(int(start), int(end) + 1))
+        else:
+            seasons.append(int(part))
+    return seasons
+
+
+class DataLayout:
+    """数据目录结构：xlsx/ json/ store/ stats/ chart/ MD/ index/"""
+
+    def __init__(self, root=DEFAULT_DATA_DIR):
+        self.root = Path(root).expanduser()
+        self.xlsx_dir = self.root / "xlsx"
+        self.json_dir = self.root / "json"
+        self.store_dir = self.root / "store"
+        self.stats_dir = self.root / "stats"
+        self.chart_dir = self.root / "chart"
+        self.md_dir = self.root / "MD"
+        self.index_dir = self.root / "index"
+
+    def xlsx(self, season_num):
+        return self.xlsx_dir / f"s{season_num}.xlsx"
+
+    def json(self, season_num):
+        return self.json_dir / f"s{season_num}.json"
+
+    def store(self, season_num):
+        return self.store_dir / f"s{season_num}.mds"
+
+    def stats(self, season_num):
+        return self.stats_dir / f"s{season_num}_stats.json"
+
+    def series(self, season_num):
+        """趋势引擎的前缀和缓存"""
+        return self.stats_dir / f"s{season_num}_series.npz"
+
+    def partial(self, season_num):
+        """分片的部分聚合（多玩家合并统计用）"""
+        return self.stats_dir / f"s{season_num}_partial.json"
+
+    def sketch(self, season_num):
+        """分片的对手卡组草图（多玩家合并统计 --sketch 用）"""
+        return self.stats_dir / f"s{season_num}_sketch.json"
+
+    def charts(self, season_num):
+        return self.chart_dir / f"s{season_num}"
+
+    def md(self, season_num):
+        return self.md_dir / f"s{season_num}.md"
+
+    def seasons(self):
+        """数据目录中已有的赛季编号（按 xlsx/json 文件名）"""
+        found = set()
+        for directory, pattern in ((self.xlsx_dir, r"s(\d+)\.xlsx"),
+                                   (self.json_dir, r"s(\d+)\.json")):
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                match = re.fullmatch(pattern, path.name)
+                if match:
+                    found.add(int(match.group(1)))
+        return sorted(found)
+
+    def __repr__(self):
+        return f"DataLayout({str(self.root)!r})"
+
+
+class ArchiveLayout:
+    """多玩家档案：players/<玩家>/ 各为一个完整的数据目录（按玩家、赛季分片），
+    aggregate/ 保存合并结果。已有的单人数据目录可直接链接为 players/<玩家>。
+    """
+
+    def __init__(self, root):
+        self.root = Path(root).expanduser()
+        self.players_dir = self.root / "players"
+        self.aggregate_dir = self.root / "aggregate"
+
+    def player(self, name):
+        return DataLayout(self.players_dir / name)
+
+    def players(self):
+        if not self.players_dir.is_dir():
+            return []
+        return sorted(path.name for path in self.players_dir.iterdir() if path.is_dir())
+
+    def shards(self, players=None, seasons=None):
+        """[(玩家, 赛季)]：各玩家已有对局记录的赛季（可按玩家 / 赛季筛选）"""
+        shards = []
+        for name in players or self.players():
+            layout = self.player(name)
+            for season_num in layout.seasons():
+                if (seasons is None or season_num in seasons) and layout.json(season_num).exists():
+                    shards.append((name, season_num))
+        return shards
+
+    def aggregate(self, name):
+        return self.aggregate_dir / f"{name}.json"
+
+    def __repr__(self):
+        return f"ArchiveLayout({str(self.root)!r})"
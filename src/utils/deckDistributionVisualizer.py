@@ -2,7 +2,23 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from utils.chartTemplate import ChartTemplate
+from utils.deckHistogram import top_k
+from utils.stageProfiler import span
+
+# 饼图显示的卡组数
+TOP_K = 10
+
+
+def deck_distribution(stats, k=TOP_K):
+    """由完整的对手卡组直方图取前 k 个卡组 {卡组: 场数}"""
+    return top_k(stats['op_decks'], k)
+
+
 class DeckDistributionVisualizer:
+    # 图表读取的统计字段（点分路径）
+    STATS_KEYS = ('op_decks',)
+
     def __init__(self, deck_data, season_num=None, figsize=(10, 8)):
         rcParams['font.sans-serif'] = ['LXGW WenKai']
 
@@ -47,7 +63,7 @@ class DeckDistributionVisualizer:
         # 设置样式
         self.ax.axis('equal')  # 正圆形
         self.ax.set_title(
-            f's{self.season_num}赛季天梯环境TOP10分布',
+            f's{self.season_num}赛季天梯环境TOP{TOP_K}分布',
             fontsize=14,
             pad=20
         )
@@ -64,6 +80,83 @@ class DeckDistributionVisualizer:
 
     def save(self, filename):
         plt.tight_layout()
-        plt.savefig(filename, bbox_inches='tight')
+        with span('savefig'):
+            plt.savefig(filename, bbox_inches='tight')
         plt.close()
 
+
+
+class DeckDistributionTemplate(ChartTemplate):
+    """TOP_K 分布饼图模板：扇区与标签只创建一次，之后按新数据重算角度"""
+    figsize = (14, 10)
+    start_angle = 90
+    explode = 0.1
+    label_distance = 1.1
+    pct_distance = 0.75
+
+    def fits(self, stats):
+        return len(deck_distribution(stats)) <= len(self.wedges)
+
+    def build(self, stats, season_num):
+        deck_data = deck_distribution(stats)
+        self.ax = self.fig.subplots()
+        size = max(len(deck_data), 1)
+        self.wedges, self.texts, self.autotexts = self.ax.pie(
+            [1] * size,
+            labels=[''] * size,
+            colors=plt.cm.Paired.colors,
+            startangle=self.start_angle,
+            autopct=lambda p: '',
+            pctdistance=self.pct_distance,
+            counterclock=False
+        )
+        self.ax.axis('equal')
+        for autotext in self.autotexts:
+            autotext.set_color('white')
+            autotext.set_fontsize(10)
+
+    def update(self, stats, season_num):
+        deck_data = deck_distribution(stats)
+        sorted_pairs = sorted(zip(deck_data.values(), deck_data.keys()), reverse=True)
+        total = sum(count for count, _ in sorted_pairs)
+
+        # 与 Axes.pie 相同的几何计算（顺时针，最大值突出）
+        theta1 = self.start_angle / 360
+        for i, wedge in enumerate(self.wedges):
+            visible = i < len(sorted_pairs)
+            for artist in (wedge, self.texts[i], self.autotexts[i]):
+                artist.set_visible(visible)
+            if not visible:
+                continue
+            count, deck = sorted_pairs[i]
+            frac = count / total
+            theta2 = theta1 - frac
+            thetam = np.pi * (theta1 + theta2)
+            offset = self.explode if i == 0 else 0
+            x, y = offset * np.cos(thetam), offset * np.sin(thetam)
+
+            wedge.set_center((x, y))
+            wedge.set_theta1(360 * theta2)
+            wedge.set_theta2(360 * theta1)
+            label_x = x + self.label_distance * np.cos(thetam)
+            self.texts[i].set_position(
+                (label_x, y + self.label_distance * np.sin(thetam)))
+            self.texts[i].set_horizontalalignment('left' if label_x > 0 else 'right')
+            self.texts[i].set_text(deck)
+            self.autotexts[i].set_position((x + self.pct_distance * np.cos(thetam),
+                                            y + self.pct_distance * np.sin(thetam)))
+            self.autotexts[i].set_text(f'{100 * frac:.1f}%')
+            theta1 = theta2
+
+        self.ax.legend(
+            self.wedges[:len(sorted_pairs)],
+            [f'{d} ({c}次)' for c, d in sorted_pairs],
+            title="卡组分布",
+            loc="center left",
+            bbox_to_anchor=(1, 0, 0.5, 1)
+        )
+        self.ax.set_title(
+            f's{season_num}赛季天梯环境TOP{TOP_K}分布',
+            fontsize=14,
+            pad=20
+        )
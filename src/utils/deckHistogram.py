@@ -0,0 +1,145 @@
+"""对手卡组分布：完整直方图的紧凑存储与 Space-Saving 重频项草图
+
+统计结果的 op_decks 字段保存完整直方图，按场数降序（相同时保持首次出现顺序）的两个并列数组：
+    'op_decks': {'decks': [卡组, ...], 'counts': [场数, ...]}
+top_10_decks 即其前 10 项；任意 top-k 与跨赛季的环境占比都由完整直方图精确得到。
+
+多玩家合并时卡组总数随档案数增长，SpaceSaving 以固定容量 m 跟踪重频卡组：
+每项记录 (计数上界, 误差)，真实场数在 [计数-误差, 计数] 内，误差不超过 总场数/m；
+两个草图可直接合并（误差界仍成立），适合树形归约。
+"""
+import heapq
+import json
+from itertools import count as counter
+
+
+def deck_name(deck):
+    """与 json 对象键的写法一致（表格中缺失的卡组名 NaN 写作 'NaN'）"""
+    return deck if isinstance(deck, str) else json.dumps(deck)
+
+
+def compact_histogram(deck_counts):
+    """{卡组: 场数} -> 按场数降序的 {'decks', 'counts'}"""
+    ranked = sorted(deck_counts.items(), key=lambda item: item[1], reverse=True)
+    return {'decks': [deck_name(deck) for deck, _ in ranked],
+            'counts': [count for _, count in ranked]}
+
+
+def histogram_counts(histogram):
+    """紧凑直方图 -> {卡组: 场数}"""
+    return dict(zip(histogram['decks'], histogram['counts']))
+
+
+def top_k(source, k=10):
+    """前 k 个卡组 {卡组: 场数}；source 为 {卡组: 场数}、紧凑直方图或 SpaceSaving"""
+    if isinstance(source, SpaceSaving):
+        return {deck: count for deck, count, _ in source.top(k)}
+    if 'decks' in source and 'counts' in source and isinstance(source['decks'], list):
+        return dict(zip(source['decks'][:k], source['counts'][:k]))
+    return dict(sorted(source.items(), key=lambda item: item[1], reverse=True)[:k])
+
+
+class SpaceSaving:
+    """Space-Saving 草图（Metwally 等），容量 capacity 个计数器
+
+    最小计数器由小顶堆维护（惰性删除：计数变化时压入新项，取最小值时丢弃过期项），
+    每次 add 为 O(log capacity)。
+    """
+
+    def __init__(self, capacity, items=None, total=0):
+        if capacity <= 0:
+            raise ValueError(f"草图容量需为正整数: {capacity}")
+        self.capacity = int(capacity)
+        # 卡组 -> [计数上界, 误差]
+        self.items = items or {}
+        self.total = total
+        self._order = counter()
+        self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        # 堆项 (计数, 序号, 卡组)：序号避免比较卡组名
+        self._heap = [(value[0], next(self._order), deck) for deck, value in self.items.items()]
+        heapq.heapify(self._heap)
+
+    def _push(self, deck):
+        heapq.heappush(self._heap, (self.items[deck][0], next(self._order), deck))
+        if len(self._heap) > 2 * self.capacity + 16:
+            self._rebuild_heap()
+
+    def _min(self):
+        while True:
+            count, _, deck = self._heap[0]
+            value = self.items.get(deck)
+            if value is not None and value[0] == count:
+                return deck, value
+            heapq.heappop(self._heap)
+
+    def add(self, deck, count=1):
+        deck = deck_name(deck)
+        self.total += count
+        if deck in self.items:
+            self.items[deck][0] += count
+        elif len(self.items) < self.capacity:
+            self.items[deck] = [count, 0]
+        else:
+            # 替换计数最小的卡组，新卡组继承其计数作为误差
+            victim, (floor, _) = self._min()
+            heapq.heappop(self._heap)
+            del self.items[victim]
+            self.items[deck] = [floor + count, floor]
+        self._push(deck)
+
+    def _floor(self):
+        """未被跟踪的卡组的计数上界（未满时为 0）"""
+        if len(self.items) < self.capacity:
+            return 0
+        return self._min()[1][0]
+
+    def merge(self, other):
+        """合并两个草图（不修改操作数）：一侧缺失的卡组按该侧的最小计数估计"""
+        capacity = max(self.capacity, other.capacity)
+        floors = (self._floor(), other._floor())
+        merged = {}
+        for deck in self.items.keys() | other.items.keys():
+            count = error = 0
+            for sketch, floor in zip((self, other), floors):
+                value = sketch.items.get(deck)
+                count += value[0] if value else floor
+                error += value[1] if value else floor
+            merged[deck] = [count, error]
+        kept = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:capacity]
+        return SpaceSaving(capacity, {deck: value for deck, value in kept},
+                           self.total + other.total)
+
+    @property
+    def error_bound(self):
+        """任一卡组计数误差的上界"""
+        return self.total / self.capacity
+
+    def top(self, k=None):
+        """[(卡组, 计数上界, 误差)]，按计数降序"""
+        ranked = sorted(self.items.items(), key=lambda item: item[1][0], reverse=True)
+        return [(deck, count, error) for deck, (count, error) in ranked[:k]]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total,
+                'items': [list(item) for item in self.top()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['capacity'],
+                   {deck: [count, error] for deck, count, error in data['items']},
+                   data['total'])
+
+
+def tree_merge_sketches(sketches, capacity):
+    """按两两归并合并草图；空列表返回空草图"""
+    level = list(sketches)
+    if not level:
+        return SpaceSaving(capacity)
+    while len(level) > 1:
+        merged = [level[i].merge(level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
@@ -2,7 +2,29 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 
+from utils.chartTemplate import (
+    ChartTemplate,
+    bar_pool,
+    error_bars,
+    error_segments,
+    label_height,
+    split_intervals,
+    update_bars,
+    update_texts,
+)
+from utils.stageProfiler import span
+
+# 概率标签的最高位置（区间上端接近 100% 时标签留在坐标轴内）
+RATE_LABEL_TOP = 95
+
+def deck_intervals(data, key):
+    """各卡组该概率 95% 置信区间的 (下限列表, 上限列表)"""
+    return split_intervals([d.get(f"{key}_ci") for d in data.values()])
+
 class DeckStatsVisualizer:
+    # 图表读取的统计字段（点分路径）
+    STATS_KEYS = ('my_decks',)
+
     def __init__(self, stats_data, season_num=None, figsize=(14, 8)):
         rcParams['font.sans-serif'] = ['LXGW WenKai']
 
@@ -68,8 +90,14 @@ class DeckStatsVisualizer:
                      hatch='/'
                      )
 
+        # 胜率 / 硬币胜率的 95% 置信区间
+        for offset, key in ((0.09, 'win_rate'), (0.27, 'coin_win_rate')):
+            error_bars(self.ax2, x + offset, *deck_intervals(self.data, key))
+
     def _add_labels(self):
-        # 添加所有柱状图数值标签
+        # 添加所有柱状图数值标签（概率标签放在置信区间上端）
+        _, win_highs = deck_intervals(self.data, 'win_rate')
+        _, coin_highs = deck_intervals(self.data, 'coin_win_rate')
         for i, deck in enumerate(self.decks):
             # 主Y轴标签
             self.ax.text(i - 0.27, self.data[deck]['total'] + 1,
@@ -78,13 +106,17 @@ class DeckStatsVisualizer:
                          self.data[deck]['wins'], ha='center', fontsize=9)
 
             # 次Y轴标签
-            self.ax2.text(i + 0.09, self.data[deck]['win_rate'] + 1.5,
+            self.ax2.text(i + 0.09,
+                          min(label_height(self.data[deck]['win_rate'], win_highs[i]) + 1.5,
+                              RATE_LABEL_TOP),
                           f"{self.data[deck]['win_rate']}%",
                           ha='center',
                           fontsize=9,
                           color='#4d4d4d')  # 深灰色
 
-            self.ax2.text(i + 0.27, self.data[deck]['coin_win_rate'] + 1.5,
+            self.ax2.text(i + 0.27,
+                          min(label_height(self.data[deck]['coin_win_rate'], coin_highs[i]) + 1.5,
+                              RATE_LABEL_TOP),
                           f"{self.data[deck]['coin_win_rate']}%",
                           ha='center',
                           fontsize=9,
@@ -123,5 +155,91 @@ class DeckStatsVisualizer:
 
     def save(self, filename):
         plt.tight_layout()
-        plt.savefig(filename, bbox_inches='tight')
+        with span('savefig'):
+            plt.savefig(filename, bbox_inches='tight')
         plt.close()
+
+
+class DeckStatsTemplate(ChartTemplate):
+    """卡组使用统计图模板：四组柱子与数值标签按卡组数预先创建"""
+    figsize = (14, 8)
+
+    # (坐标轴, 字段, 偏移, 标签, 颜色, 额外样式)
+    SERIES = (
+        (0, 'total', -0.27, '总对局', '#78dce8', {}),
+        (0, 'wins', -0.09, '胜利次数', '#a9dc76', {}),
+        (1, 'win_rate', 0.09, '总胜率', '#ffd866',
+         {'alpha': 0.9, 'edgecolor': '#817c6e', 'hatch': '/'}),
+        (1, 'coin_win_rate', 0.27, '硬币胜率', '#FF6B6B',
+         {'alpha': 0.9, 'edgecolor': '#817c6e', 'hatch': '/'}),
+    )
+    bar_width = 0.18
+
+    def fits(self, stats):
+        return len(stats['my_decks']) <= self.capacity
+
+    def build(self, stats, season_num):
+        self.capacity = max(len(stats['my_decks']), 1)
+        ax = self.fig.subplots()
+        ax2 = ax.twinx()
+        self.axes = (ax, ax2)
+        self.title = self.fig.suptitle('', fontsize=16)
+
+        self.bars = []
+        self.labels = []
+        self.errors = []
+        for axis, _, _, label, color, style in self.SERIES:
+            target = self.axes[axis]
+            self.bars.append(bar_pool(target, self.capacity, width=self.bar_width,
+                                      label=label, color=color, **style))
+            text_style = {'color': '#4d4d4d'} if axis else {}
+            self.labels.append([
+                target.text(0, 0, '', ha='center', fontsize=9, **text_style)
+                for _ in range(self.capacity)
+            ])
+            # 概率柱附带置信区间误差线
+            self.errors.append(error_bars(target) if axis else None)
+
+        ax2.set_ylim(0, 100)
+        ax.set_ylabel('对局次数', fontsize=12)
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        ax2.set_ylabel('胜率 (%)', fontsize=12)
+        lines, labels = ax.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        ax.legend(lines + lines2, labels + labels2, loc='upper left')
+
+        # 基准参考线
+        color = '#FF4500'
+        ax2.axhline(50, color=color, linestyle='--', alpha=0.5, lw=1.5)
+        self.avg_label = ax2.text(0, 50, ' 50% 基准线', color=color, va='center',
+                                  ha='right', fontsize=10,
+                                  bbox=dict(facecolor='white', alpha=0.8,
+                                            edgecolor='none'))
+
+    def update(self, stats, season_num):
+        data = stats['my_decks']
+        decks = list(data.keys())
+        x = np.arange(len(decks))
+        ax, ax2 = self.axes
+        self.title.set_text("卡组使用统计" + (f" (赛季 {season_num})" if season_num else ""))
+
+        for (axis, key, offset, _, _, _), bars, texts, errors in zip(
+                self.SERIES, self.bars, self.labels, self.errors):
+            values = [d[key] for d in data.values()]
+            update_bars(bars, x + offset, values)
+            if axis:
+                lows, highs = deck_intervals(data, key)
+                errors.set_segments(error_segments(x + offset, lows, highs))
+                items = [(i + offset, min(label_height(v, high) + 1.5, RATE_LABEL_TOP), f"{v}%")
+                         for i, (v, high) in enumerate(zip(values, highs))]
+            else:
+                items = [(i + offset, v + 1, v) for i, v in enumerate(values)]
+            update_texts(texts, items)
+
+        ax.set_ylim(0, max(d['total'] for d in data.values()) * 1.15)
+        ax.set_xticks(x)
+        ax.set_xticklabels(decks, rotation=0, ha='right', fontsize=12)
+        ax.relim(visible_only=True)
+        ax2.relim(visible_only=True)
+        ax.autoscale_view(scaley=False)
+        self.avg_label.set_x(ax2.get_xlim()[1] + 0.2)
@@ -1,15 +1,30 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 from matplotlib.gridspec import GridSpec
 from abc import ABC, abstractmethod
 
+from utils.chartTemplate import ChartTemplate, rescale
+from utils.stageProfiler import span
+
 class BasePlotter(ABC):
-    """图表绘制基类"""
-    def __init__(self, stats_data, colors, markers):
+    """图表绘制基类
+
+    默认绘制 interval_stats（每20场的累计概率）；给出 trend 时改为绘制趋势引擎的
+    滚动窗口 / EWMA 序列（utils.trendEngine.TrendSeries.trend() 的结果）。
+    """
+    # 图表读取的统计字段（点分路径）
+    STATS_KEYS = ('interval_stats',)
+
+    def __init__(self, stats_data, colors, markers, trend=None):
         self.stats = stats_data
         self.colors = colors
         self.markers = markers
-        self.x = [i['total_matches'] for i in self.stats['interval_stats']]
+        self.trend = trend
+        if trend is None:
+            self.x = [i['total_matches'] for i in self.stats['interval_stats']]
+        else:
+            self.x = trend['x']
 
 
         # 配置中文字体
@@ -18,6 +33,12 @@ class BasePlotter(ABC):
     def showx(self):
         print(self.x)
 
+    def rate(self, key):
+        """某项概率的序列（与 self.x 对齐）"""
+        if self.trend is not None:
+            return self.trend[key]
+        return [i[key] for i in self.stats['interval_stats']]
+
     @abstractmethod
     def _get_plot_data(self):
         """子类需实现的数据提取方法"""
@@ -34,9 +55,11 @@ class BasePlotter(ABC):
 
     def _set_dynamic_ylim(self, ax, data_series):
         """动态设置Y轴范围"""
-        all_values = sum(data_series, [])  # 展开多维列表
-        safe_min = min(min(all_values), 50)
-        safe_max = max(max(all_values), 50)
+        # 展开多维序列（列表或数组），忽略 nan
+        all_values = np.concatenate([np.asarray(d, dtype=float) for d in data_series] + [[50]])
+        all_values = all_values[~np.isnan(all_values)]
+        safe_min = all_values.min()
+        safe_max = all_values.max()
         ax.set_ylim(
             max(safe_min-10, 0),
             min(safe_max+10, 100)
@@ -46,9 +69,11 @@ class BasePlotter(ABC):
         """主绘制方法"""
         plot_data = self._get_plot_data()
 
-        # 绘制各条折线
+        # 绘制各条折线（点数多时只隔点标记）
+        markevery = max(1, len(self.x) // 50)
         for (label, data), color, marker in zip(plot_data, self.colors, self.markers):
-            ax.plot(self.x, data, marker=marker, color=color, label=label)
+            ax.plot(self.x, data, marker=marker, color=color, label=label,
+                    markevery=markevery)
 
         # 配置坐标轴
         self._setup_axes(ax)
@@ -64,8 +89,8 @@ class CoreStatsPlotter(BasePlotter):
     """核心统计图表"""
     def _get_plot_data(self):
         return [
-            ('对局胜率', [i['win_rate'] for i in self.stats['interval_stats']]),
-            ('硬币胜率', [i['coin_win_rate'] for i in self.stats['interval_stats']])
+            ('对局胜率', self.rate('win_rate')),
+            ('硬币胜率', self.rate('coin_win_rate'))
         ]
 
     def _setup_axes(self, ax):
@@ -76,9 +101,9 @@ class MoveStatsPlotter(BasePlotter):
     """先后手统计图表"""
     def _get_plot_data(self):
         return [
-            ('先手率', [i['first_move_rate'] for i in self.stats['interval_stats']]),
-            ('先手胜率', [i['first_move_win_rate'] for i in self.stats['interval_stats']]),
-            ('后手胜率', [i['second_move_win_rate'] for i in self.stats['interval_stats']])
+            ('先手率', self.rate('first_move_rate')),
+            ('先手胜率', self.rate('first_move_win_rate')),
+            ('后手胜率', self.rate('second_move_win_rate'))
         ]
 
     def _setup_axes(self, ax):
@@ -89,8 +114,8 @@ class CoinStatsPlotter(BasePlotter):
     """硬币关联统计图表"""
     def _get_plot_data(self):
         return [
-            ('赢硬币胜率', [i['win_coin_win_rate'] for i in self.stats['interval_stats']]),
-            ('输硬币胜率', [i['lose_coin_win_rate'] for i in self.stats['interval_stats']])
+            ('赢硬币胜率', self.rate('win_coin_win_rate')),
+            ('输硬币胜率', self.rate('lose_coin_win_rate'))
         ]
 
     def _setup_axes(self, ax):
@@ -98,45 +123,74 @@ class CoinStatsPlotter(BasePlotter):
         ax.set_xlabel('对局数')
         ax.set_ylabel('百分比 (%)')
 
-def show_plot_analysis(stats):
+# 各子图的绘制类与样式
+CHART_CONFIGS = [
+    (CoreStatsPlotter, {'colors': ['#ff6188', '#78dce8'], 'markers': ['o', 's']}),
+    (MoveStatsPlotter, {'colors': ['#bda4ea', '#ffd866', '#a9dc76'], 'markers': ['^', '*', 'x']}),
+    (CoinStatsPlotter, {'colors': ['#fc9867', '#2b9692'], 'markers': ['D', 'v']})
+]
+
+def show_plot_analysis(stats, trend=None):
     # 初始化图表
     fig = plt.figure(figsize=(15, 10))
     gs = GridSpec(3, 1, height_ratios=[1, 1, 1])
-
-    # 配置各图表参数
-    chart_configs = [
-        (CoreStatsPlotter, {'colors': ['#ff6188', '#78dce8'], 'markers': ['o', 's']}),
-        (MoveStatsPlotter, {'colors': ['#bda4ea', '#ffd866', '#a9dc76'], 'markers': ['^', '*', 'x']}),
-        (CoinStatsPlotter, {'colors': ['#fc9867', '#2b9692'], 'markers': ['D', 'v']})
-    ]
+    if trend is not None:
+        fig.suptitle(f"趋势：{trend['label']}", fontsize=14)
 
     # 逐个绘制子图
-    for idx, (plotter_cls, style) in enumerate(chart_configs):
+    for idx, (plotter_cls, style) in enumerate(CHART_CONFIGS):
         ax = fig.add_subplot(gs[idx])
-        plotter = plotter_cls(stats, **style)
+        plotter = plotter_cls(stats, trend=trend, **style)
         plotter.plot(ax)
 
     plt.tight_layout()
     plt.show()
 
-def save_plot_analysis(stats, filename):
+def save_plot_analysis(stats, filename, trend=None):
     # 初始化图表
     fig = plt.figure(figsize=(15, 10))
     gs = GridSpec(3, 1, height_ratios=[1, 1, 1])
-
-    # 配置各图表参数
-    chart_configs = [
-        (CoreStatsPlotter, {'colors': ['#ff6188', '#78dce8'], 'markers': ['o', 's']}),
-        (MoveStatsPlotter, {'colors': ['#bda4ea', '#ffd866', '#a9dc76'], 'markers': ['^', '*', 'x']}),
-        (CoinStatsPlotter, {'colors': ['#fc9867', '#2b9692'], 'markers': ['D', 'v']})
-    ]
+    if trend is not None:
+        fig.suptitle(f"趋势：{trend['label']}", fontsize=14)
 
     # 逐个绘制子图
-    for idx, (plotter_cls, style) in enumerate(chart_configs):
+    for idx, (plotter_cls, style) in enumerate(CHART_CONFIGS):
         ax = fig.add_subplot(gs[idx])
-        plotter = plotter_cls(stats, **style)
+        plotter = plotter_cls(stats, trend=trend, **style)
         plotter.plot(ax)
 
     plt.tight_layout()
-    plt.savefig(filename, bbox_inches='tight')
+    with span('savefig'):
+        plt.savefig(filename, bbox_inches='tight')
     plt.close()
+
+class DynamicStatsTemplate(ChartTemplate):
+    """动态趋势图模板：子图、折线、基准线与图例只创建一次，之后只调用 set_data"""
+    figsize = (15, 10)
+
+    def build(self, stats, season_num):
+        gs = GridSpec(3, 1, height_ratios=[1, 1, 1], figure=self.fig)
+        self.subplots = []
+        for idx, (plotter_cls, style) in enumerate(CHART_CONFIGS):
+            ax = self.fig.add_subplot(gs[idx])
+            plotter = plotter_cls(stats, **style)
+            lines = [
+                ax.plot([], [], marker=marker, color=color, label=label)[0]
+                for (label, _), color, marker in zip(
+                    plotter._get_plot_data(), plotter.colors, plotter.markers)
+            ]
+            plotter._setup_axes(ax)
+            plotter._add_baseline(ax)
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+            self.subplots.append((ax, plotter_cls, style, lines))
+
+    def update(self, stats, season_num):
+        for ax, plotter_cls, style, lines in self.subplots:
+            plotter = plotter_cls(stats, **style)
+            plot_data = plotter._get_plot_data()
+            for line, (_, data) in zip(lines, plot_data):
+                line.set_data(plotter.x, data)
+                line.set_markevery(max(1, len(plotter.x) // 50))
+            rescale(ax, scaley=False)
+            plotter._set_dynamic_ylim(ax, [d[1] for d in plot_data])
@@ -0,0 +1,94 @@
+"""硬币公平性检验的批量计算引擎
+
+一次调用对一组 (硬币胜场, 场数[, 游程数]) 向量化计算卡方 / 二项 / 游程检验，
+结果按参数缓存（每20场、各卡组的 (k, n) 大量重复），只计算未缓存的部分。
+卡方与二项检验的结果与 scipy.stats.chisquare / binomtest（p=0.5）逐位一致。
+"""
+import numpy as np
+
+from utils.stageProfiler import span
+
+_tests_cache = {}   # (k, n) -> (chi2_statistic, chi2_p, binom_p)
+_runs_cache = {}    # (k, n, runs) -> runs_p
+
+
+def _compute_tests(k, n):
+    """卡方拟合度检验与双侧二项检验（p=0.5）"""
+    from scipy.stats import binom, chi2
+
+    expected = n.astype(float) * 0.5
+    statistic = (k - expected) ** 2 / expected + ((n - k) - expected) ** 2 / expected
+    chi2_p = chi2.sf(statistic, 1)
+
+    # p=0.5 时分布对称，双侧 p 值为两侧尾部概率之和
+    low = np.minimum(k, n - k)
+    binom_p = np.minimum(1.0, binom.cdf(low, n, 0.5) + binom.sf(n - low - 1, n, 0.5))
+    binom_p = np.where(2 * k == n, 1.0, binom_p)
+    return statistic, chi2_p, binom_p
+
+
+def _compute_runs(k, n, runs):
+    """Wald–Wolfowitz 游程检验（正态近似，双侧）；全胜/全负时无定义，记为 nan"""
+    from scipy.stats import norm
+
+    n1 = k.astype(float)
+    n2 = (n - k).astype(float)
+    total = n1 + n2
+    mean = 2 * n1 * n2 / np.where(total > 0, total, 1) + 1
+    variance = (2 * n1 * n2 * (2 * n1 * n2 - total)
+                / np.where(total > 1, total * total * (total - 1), 1))
+    valid = variance > 0
+    z = (runs - mean) / np.sqrt(np.where(valid, variance, 1))
+    return np.where(valid, 2 * norm.sf(np.abs(z)), np.nan)
+
+
+def _lookup(cache, keys, compute, width):
+    """从缓存取值，未命中的唯一参数组合一次性向量化计算后写回缓存"""
+    missing = sorted({key for key in keys if key not in cache})
+    if missing:
+        columns = np.array(missing, dtype=np.int64).T
+        computed = compute(*columns)
+        if width == 1:
+            computed = (computed,)
+        for key, values in zip(missing, zip(*(c.tolist() for c in computed))):
+            cache[key] = values if width > 1 else values[0]
+    return [cache[key] for key in keys]
+
+
+def fairness_batch(successes, trials, runs=None):
+    """批量公平性检验
+
+    successes / trials / runs 为等长序列（硬币胜场、场数、硬币结果的游程数），
+    返回 {'chi2_statistic', 'chi2_p', 'binom_p'[, 'runs_p']} 的数组字典。
+    """
+    with span('fairness'):
+        return _fairness_batch(successes, trials, runs)
+
+
+def _fairness_batch(successes, trials, runs):
+    k = np.asarray(successes, dtype=np.int64).reshape(-1)
+    n = np.asarray(trials, dtype=np.int64).reshape(-1)
+    keys = list(zip(k.tolist(), n.tolist()))
+
+    tests = np.array(_lookup(_tests_cache, keys, _compute_tests, 3),
+                     dtype=float).reshape(-1, 3)
+    result = {
+        'chi2_statistic': tests[:, 0],
+        'chi2_p': tests[:, 1],
+        'binom_p': tests[:, 2],
+    }
+    if runs is not None:
+        r = np.asarray(runs, dtype=np.int64).reshape(-1)
+        run_keys = [key + (count,) for key, count in zip(keys, r.tolist())]
+        result['runs_p'] = np.array(
+            _lookup(_runs_cache, run_keys, _compute_runs, 1), dtype=float)
+    return result
+
+
+def cache_info():
+    return {'tests': len(_tests_cache), 'runs': len(_runs_cache)}
+
+
+def clear_cache():
+    _tests_cache.clear()
+    _runs_cache.clear()
@@ -0,0 +1,141 @@
+"""目录变化监视：Linux 下用 inotify（ctypes 直接调用 libc），其他平台轮询文件大小与修改时间
+
+两种监视器接口相同：wait(timeout) 阻塞至多 timeout 秒，返回发生变化且文件名
+匹配 pattern 的文件名集合（超时返回空集合）。
+Debouncer 把同一文件的连续变化合并为一次：最后一次变化后静默 delay 秒才视为保存完成。
+"""
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import time
+from pathlib import Path
+
+# inotify 事件（见 <sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# 表格软件保存时多为写临时文件后改名，关注写完与移入
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """inotify 监视单个目录"""
+
+    def __init__(self, directory, pattern):
+        self.directory = Path(directory).expanduser()
+        self.pattern = re.compile(pattern)
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(self.directory), WATCH_MASK)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"无法监视 {self.directory}")
+
+    def wait(self, timeout=None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if self.pattern.fullmatch(name):
+                names.add(name)
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """按间隔比较目录中匹配文件的 (大小, 修改时间)"""
+
+    def __init__(self, directory, pattern, interval=0.5):
+        self.directory = Path(directory).expanduser()
+        self.pattern = re.compile(pattern)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if self.pattern.fullmatch(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {name for name, value in snapshot.items()
+                       if self.snapshot.get(name) != value}
+            self.snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            sleep = self.interval
+            if deadline is not None:
+                sleep = min(sleep, max(deadline - time.monotonic(), 0))
+            time.sleep(sleep)
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, pattern, poll_interval=0.5, polling=False):
+    """优先使用 inotify，不可用（非 Linux / 句柄数超限等）时退回轮询"""
+    if not polling and hasattr(select, 'select') and ctypes.util.find_library('c'):
+        try:
+            return InotifyWatcher(directory, pattern)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, pattern, poll_interval)
+
+
+class Debouncer:
+    """记录每个键最后一次变化的时间，静默 delay 秒后才返回该键"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.pending = {}
+
+    def touch(self, key, now=None):
+        self.pending[key] = time.monotonic() if now is None else now
+
+    def due(self, now=None):
+        now = time.monotonic() if now is None else now
+        keys = [key for key, last in self.pending.items() if now - last >= self.delay]
+        for key in keys:
+            del self.pending[key]
+        return keys
+
+    def timeout(self, now=None):
+        """距离最早一个键到期的秒数；没有待处理的键时为 None（一直等待）"""
+        if not self.pending:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(min(self.pending.values()) + self.delay - now, 0)
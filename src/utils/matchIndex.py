@@ -0,0 +1,286 @@
+"""跨赛季对局索引
+
+所有赛季的对局按追加顺序保存在 index/matches.bin（定长记录，mmap 读取），
+meta.json 记录全局卡组/备注字典、每个赛季的起始行与行数，以及建索引时各赛季
+对局文件的大小与修改时间（sync_index 据此发现新增或变化的赛季）；
+按 my_deck / op_deck 的二级索引为 CSR 形式的 .npy（偏移数组 + 行号数组）。
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from utils.buildCache import file_stamp
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout
+from utils.matchStore import MatchStore, counters_from_flags
+
+# 记录格式变化时递增，旧格式的索引视为空索引（由调用方重建）
+INDEX_VERSION = 2
+
+RECORD_DTYPE = np.dtype([
+    ('season', '<u2'),
+    ('position', '<u4'),
+    ('my_deck', '<u4'),
+    ('op_deck', '<u4'),
+    ('flags', 'u1'),
+    ('notes', '<u4'),
+])
+
+# 建立二级索引的列
+INDEXED_COLUMNS = ('my_deck', 'op_deck')
+
+
+def _empty_meta():
+    return {'version': INDEX_VERSION, 'rows': 0, 'decks': [], 'notes': [], 'seasons': {},
+            'sources': {}}
+
+
+def _intern(table, names):
+    """把局部字典映射到全局字典（新名称追加到末尾），返回局部→全局编码表"""
+    lookup = {name: code for code, name in enumerate(table)}
+    mapping = []
+    for name in names:
+        if name not in lookup:
+            lookup[name] = len(table)
+            table.append(name)
+        mapping.append(lookup[name])
+    return np.array(mapping, dtype=np.int64)
+
+
+class MatchIndex:
+    """只追加的跨赛季对局索引"""
+
+    def __init__(self, index_dir):
+        self.index_dir = Path(index_dir).expanduser()
+        self.meta = self._load_meta()
+        self._deck_codes = {}
+        self._open()
+
+    @property
+    def data_path(self):
+        return self.index_dir / "matches.bin"
+
+    def _load_meta(self):
+        path = self.index_dir / "meta.json"
+        if not path.exists():
+            return _empty_meta()
+        with path.open('r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta if meta.get('version') == INDEX_VERSION else _empty_meta()
+
+    def _save_meta(self):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with (self.index_dir / "meta.json").open('w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+
+    def _open(self):
+        rows = self.meta['rows']
+        if rows:
+            self.records = np.memmap(self.data_path, dtype=RECORD_DTYPE,
+                                     mode='r', shape=(rows,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+        self.secondary = {}
+        for column in INDEXED_COLUMNS:
+            offsets = self.index_dir / f"{column}_offsets.npy"
+            row_ids = self.index_dir / f"{column}_rows.npy"
+            if rows and offsets.exists() and row_ids.exists():
+                self.secondary[column] = (np.load(offsets, mmap_mode='r'),
+                                          np.load(row_ids, mmap_mode='r'))
+
+    def __len__(self):
+        return self.meta['rows']
+
+    @property
+    def seasons(self):
+        return sorted(int(season) for season in self.meta['seasons'])
+
+    def append_season(self, season_num, store, replace=False, reindex=True, source=None):
+        """追加一个赛季；replace=True 时可替换最后追加的赛季（如进行中的赛季）
+
+        source 为该赛季对局文件的 file_stamp，记录在 meta 中供 sync_index 比较
+        """
+        key = str(season_num)
+        start = self.meta['rows']
+        if key in self.meta['seasons']:
+            old_start, old_count = self.meta['seasons'][key]
+            if not replace:
+                raise ValueError(f"s{season_num} 已在索引中")
+            if old_start + old_count != start:
+                raise ValueError(f"s{season_num} 不是最后追加的赛季，需要重建索引")
+            start = old_start
+
+        deck_map = _intern(self.meta['decks'], store.decks)
+        note_map = _intern(self.meta['notes'], store.note_table)
+
+        block = np.empty(len(store), dtype=RECORD_DTYPE)
+        block['season'] = season_num
+        block['position'] = np.arange(len(store))
+        block['my_deck'] = deck_map[store.my_deck]
+        block['op_deck'] = deck_map[store.op_deck]
+        block['flags'] = store.flags
+        block['notes'] = note_map[store.notes]
+
+        # 释放旧的映射后再写文件
+        self.records = None
+        self.secondary = {}
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        mode = 'r+b' if self.data_path.exists() else 'wb'
+        with self.data_path.open(mode) as f:
+            f.truncate(start * RECORD_DTYPE.itemsize)
+            f.seek(start * RECORD_DTYPE.itemsize)
+            f.write(block.tobytes())
+
+        self.meta['seasons'][key] = [start, len(store)]
+        if source is not None:
+            self.meta.setdefault('sources', {})[key] = source
+        self.meta['rows'] = start + len(store)
+        self._save_meta()
+        self._open()
+        if reindex:
+            self.reindex()
+
+    def reindex(self):
+        """重建 my_deck / op_deck 二级索引"""
+        size = len(self.meta['decks'])
+        for column in INDEXED_COLUMNS:
+            codes = np.asarray(self.records[column])
+            row_ids = np.argsort(codes, kind='stable').astype(np.uint32)
+            offsets = np.concatenate(
+                ([0], np.cumsum(np.bincount(codes, minlength=size)))
+            ).astype(np.int64)
+            np.save(self.index_dir / f"{column}_offsets.npy", offsets)
+            np.save(self.index_dir / f"{column}_rows.npy", row_ids)
+        self._open()
+
+    def deck_code(self, deck):
+        # 卡组字典只追加，长度变化时才重建查找表
+        if len(self._deck_codes) != len(self.meta['decks']):
+            self._deck_codes = {name: code for code, name in enumerate(self.meta['decks'])}
+        return self._deck_codes.get(deck)
+
+    def season_rows(self, season_num):
+        start, count = self.meta['seasons'][str(season_num)]
+        return np.arange(start, start + count)
+
+    def rows(self, seasons=None, my_deck=None, op_deck=None):
+        """满足条件的行号（升序）；条件为 None 表示不过滤"""
+        candidates = None
+        for column, deck in (('my_deck', my_deck), ('op_deck', op_deck)):
+            if deck is None:
+                continue
+            code = self.deck_code(deck)
+            if code is None:
+                return np.zeros(0, dtype=np.int64)
+            offsets, row_ids = self.secondary[column]
+            selected = np.asarray(row_ids[offsets[code]:offsets[code + 1]])
+            candidates = selected if candidates is None else np.intersect1d(
+                candidates, selected, assume_unique=True)
+
+        if seasons is not None:
+            ranges = [self.meta['seasons'][str(season)] for season in seasons
+                      if str(season) in self.meta['seasons']]
+            if candidates is None:
+                candidates = np.concatenate(
+                    [np.arange(start, start + count) for start, count in ranges]
+                    or [np.zeros(0, dtype=np.int64)]
+                )
+            else:
+                mask = np.zeros(len(candidates), dtype=bool)
+                for start, count in ranges:
+                    mask |= (candidates >= start) & (candidates < start + count)
+                candidates = candidates[mask]
+
+        if candidates is None:
+            return np.arange(len(self))
+        return candidates
+
+    def aggregate(self, rows=None):
+        """对选中行计算计数器与各项概率"""
+        from calcStats import rate_stats
+
+        flags = self.records['flags'] if rows is None else self.records['flags'][rows]
+        counters = counters_from_flags(flags)
+        counters.update(rate_stats(counters))
+        return counters
+
+
+def season_source(layout, season_num):
+    """该赛季建索引读取的文件：优先 .mds 存储，其次 json；都不存在时为 None"""
+    for path in (layout.store(season_num), layout.json(season_num)):
+        if path.exists():
+            return path
+    return None
+
+
+def source_stamps(layout):
+    """{赛季(str): 对局文件的 file_stamp}"""
+    stamps = {}
+    for season_num in layout.seasons():
+        path = season_source(layout, season_num)
+        if path is not None:
+            stamps[str(season_num)] = file_stamp(path)
+    return stamps
+
+
+def load_season_store(layout, season_num):
+    """优先读取 .mds 存储，否则从 json 编码"""
+    path = season_source(layout, season_num)
+    if path == layout.store(season_num):
+        return MatchStore.open(path)
+    return MatchStore.from_json(layout.json(season_num))
+
+
+def build_index(layout, index_dir=None):
+    """从数据目录中的全部赛季重建索引"""
+    index_dir = Path(index_dir or layout.index_dir)
+    for name in ("matches.bin", "meta.json"):
+        (index_dir / name).unlink(missing_ok=True)
+
+    index = MatchIndex(index_dir)
+    for key, stamp in sorted(source_stamps(layout).items(), key=lambda item: int(item[0])):
+        index.append_season(int(key), load_season_store(layout, int(key)),
+                            reindex=False, source=stamp)
+    if len(index):
+        index.reindex()
+    return index
+
+
+def sync_index(index, layout):
+    """使索引与数据目录一致，返回（可能重建后的）索引
+
+    对局文件未变时不做任何事；只有最后追加的赛季变化、或新增赛季都在已索引赛季之后时
+    用 append_season 增量更新，其余情况（中间赛季变化、赛季被删除）重建索引。
+    """
+    stamps = source_stamps(layout)
+    recorded = index.meta.get('sources', {})
+    changed = sorted(int(key) for key, stamp in stamps.items() if recorded.get(key) != stamp)
+    removed = set(index.meta['seasons']) - set(stamps)
+    if not changed and not removed:
+        return index
+
+    indexed = index.seasons
+    last = indexed[-1] if indexed else None
+    incremental = not removed and all(
+        season_num == last or last is None or season_num > last for season_num in changed)
+    if not incremental:
+        return build_index(layout, index.index_dir)
+
+    for season_num in changed:
+        index.append_season(season_num, load_season_store(layout, season_num),
+                            replace=season_num == last, reindex=False,
+                            source=stamps[str(season_num)])
+    index.reindex()
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="重建跨赛季对局索引")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    args = parser.parse_args()
+
+    index = build_index(DataLayout(args.data_dir))
+    print(f"索引完成：{len(index.seasons)}个赛季，{len(index)}场对局，"
+          f"{len(index.meta['decks'])}个卡组")
@@ -0,0 +1,227 @@
+"""对局记录的过滤 / 分组 / 聚合查询
+
+    Query(index).where(seasons=range(30, 42), op_deck='天杯龙')
+                .group_by('season')
+                .agg('count', 'win_rate', 'coin_win_rate_ci')
+                .run()
+
+查询对象只记录条件，run() 时才在索引的 mmap 列上向量化执行，不生成中间记录列表。
+"""
+import re
+
+import numpy as np
+
+from utils.confidence import wilson_interval
+from utils.matchStore import COIN_WIN, FIRST, WIN
+
+# 分组键 → 索引列
+GROUP_COLUMNS = {
+    'deck': 'my_deck',
+    'opponent': 'op_deck',
+    'season': 'season',
+    'notes': 'notes',
+}
+
+# 概率指标：(分子, 分母)
+RATE_METRICS = {
+    'win_rate': ('wins', 'count'),
+    'coin_win_rate': ('coin_wins', 'count'),
+    'first_move_rate': ('first_moves', 'count'),
+    'first_move_win_rate': ('first_move_wins', 'first_moves'),
+    'second_move_win_rate': ('second_move_wins', 'second_moves'),
+    'win_coin_win_rate': ('win_coin_wins', 'coin_wins'),
+    'lose_coin_win_rate': ('lose_coin_wins', 'coin_loses'),
+}
+
+COUNT_METRICS = (
+    'count', 'wins', 'coin_wins', 'coin_loses', 'first_moves', 'second_moves',
+    'first_move_wins', 'second_move_wins', 'win_coin_wins', 'lose_coin_wins',
+)
+
+METRICS = (
+    list(COUNT_METRICS)
+    + list(RATE_METRICS)
+    + [f"{name}_ci" for name in RATE_METRICS]
+)
+
+DEFAULT_METRICS = ('count', 'wins', 'win_rate', 'coin_win_rate', 'win_rate_ci')
+
+
+def _as_list(value):
+    if value is None or isinstance(value, (list, tuple, set, range)):
+        return value
+    return [value]
+
+
+class Query:
+    """惰性查询：where / group_by / agg 返回新的查询对象，run() 时执行"""
+
+    def __init__(self, index, filters=None, groups=(), metrics=DEFAULT_METRICS,
+                 order=None, limit_rows=None):
+        self.index = index
+        self.filters = dict(filters or {})
+        self.groups = tuple(groups)
+        self.metrics = tuple(metrics)
+        self.order = order
+        self.limit_rows = limit_rows
+
+    def _replace(self, **changes):
+        params = {
+            'filters': self.filters,
+            'groups': self.groups,
+            'metrics': self.metrics,
+            'order': self.order,
+            'limit_rows': self.limit_rows,
+        }
+        params.update(changes)
+        return Query(self.index, **params)
+
+    def where(self, seasons=None, my_deck=None, op_deck=None, move=None,
+              coin=None, notes=None):
+        """过滤条件：赛季范围、卡组、先后手（first/second）、硬币（win/lose）、备注正则"""
+        if move not in (None, 'first', 'second'):
+            raise ValueError(f"move 只能是 first/second: {move}")
+        if coin not in (None, 'win', 'lose'):
+            raise ValueError(f"coin 只能是 win/lose: {coin}")
+        filters = dict(self.filters)
+        for key, value in (('seasons', seasons), ('my_deck', my_deck),
+                           ('op_deck', op_deck), ('move', move),
+                           ('coin', coin), ('notes', notes)):
+            if value is not None:
+                filters[key] = value
+        return self._replace(filters=filters)
+
+    def group_by(self, *keys):
+        unknown = set(keys) - set(GROUP_COLUMNS)
+        if unknown:
+            raise ValueError(f"未知分组键: {', '.join(sorted(unknown))}")
+        return self._replace(groups=keys)
+
+    def agg(self, *metrics):
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"未知指标: {', '.join(sorted(unknown))}")
+        return self._replace(metrics=metrics)
+
+    def order_by(self, metric, descending=True):
+        if metric not in self.metrics and metric not in self.groups:
+            raise ValueError(f"排序字段需在指标或分组键中: {metric}")
+        return self._replace(order=(metric, descending))
+
+    def limit(self, n):
+        return self._replace(limit_rows=n)
+
+    def _select_rows(self):
+        """先用二级索引/赛季区间缩小范围，再用标志位和备注向量化过滤"""
+        index = self.index
+        filters = self.filters
+        my_decks = _as_list(filters.get('my_deck'))
+        op_decks = _as_list(filters.get('op_deck'))
+
+        # 单个卡组走二级索引，多个卡组用 isin 过滤
+        rows = index.rows(
+            seasons=filters.get('seasons'),
+            my_deck=my_decks[0] if my_decks and len(my_decks) == 1 else None,
+            op_deck=op_decks[0] if op_decks and len(op_decks) == 1 else None,
+        )
+        records = index.records
+
+        mask = np.ones(len(rows), dtype=bool)
+        for column, decks in (('my_deck', my_decks), ('op_deck', op_decks)):
+            if decks and len(decks) > 1:
+                codes = [code for code in map(index.deck_code, decks) if code is not None]
+                mask &= np.isin(records[column][rows], codes)
+
+        flags = records['flags'][rows]
+        if 'move' in filters:
+            mask &= ((flags & FIRST) != 0) == (filters['move'] == 'first')
+        if 'coin' in filters:
+            mask &= ((flags & COIN_WIN) != 0) == (filters['coin'] == 'win')
+        if 'notes' in filters:
+            pattern = re.compile(filters['notes'])
+            codes = [code for code, note in enumerate(index.meta['notes'])
+                     if isinstance(note, str) and pattern.search(note)]
+            mask &= np.isin(records['notes'][rows], codes)
+        return rows[mask]
+
+    def _group_labels(self, column, codes):
+        if column in ('my_deck', 'op_deck'):
+            return [self.index.meta['decks'][code] for code in codes]
+        if column == 'notes':
+            return [self.index.meta['notes'][code] for code in codes]
+        return codes
+
+    def run(self):
+        """执行查询，返回每组一行的字典列表"""
+        rows = self._select_rows()
+        records = self.index.records
+
+        if self.groups:
+            keys = np.stack(
+                [np.asarray(records[GROUP_COLUMNS[g]][rows], dtype=np.int64)
+                 for g in self.groups],
+                axis=1
+            )
+            group_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            group_keys = np.zeros((1, 0), dtype=np.int64)
+            inverse = np.zeros(len(rows), dtype=np.int64)
+        size = len(group_keys)
+
+        flags = records['flags'][rows]
+        first = (flags & FIRST) != 0
+        win = (flags & WIN) != 0
+        coin = (flags & COIN_WIN) != 0
+
+        def count(mask=None):
+            selected = inverse if mask is None else inverse[mask]
+            return np.bincount(selected, minlength=size)
+
+        counts = {
+            'count': count(),
+            'wins': count(win),
+            'coin_wins': count(coin),
+            'coin_loses': count(~coin),
+            'first_moves': count(first),
+            'second_moves': count(~first),
+            'first_move_wins': count(first & win),
+            'second_move_wins': count(~first & win),
+            'win_coin_wins': count(coin & win),
+            'lose_coin_wins': count(~coin & win),
+        }
+
+        columns = {}
+        for metric in self.metrics:
+            name = metric[:-3] if metric.endswith('_ci') else metric
+            if name in counts:
+                columns[metric] = counts[name].tolist()
+                continue
+            numerator, denominator = (counts[key] for key in RATE_METRICS[name])
+            if metric.endswith('_ci'):
+                low, high = wilson_interval(numerator, denominator)
+                columns[metric] = [
+                    (round(lo, 2), round(hi, 2))
+                    for lo, hi in zip(low.tolist(), high.tolist())
+                ]
+            else:
+                rates = np.divide(numerator * 100, denominator,
+                                  out=np.zeros(size), where=denominator > 0)
+                columns[metric] = [round(rate, 2) for rate in rates.tolist()]
+
+        labels = [
+            self._group_labels(GROUP_COLUMNS[g], group_keys[:, i].tolist())
+            for i, g in enumerate(self.groups)
+        ]
+        results = []
+        for i in range(size):
+            row = {g: labels[j][i] for j, g in enumerate(self.groups)}
+            row.update({metric: columns[metric][i] for metric in self.metrics})
+            results.append(row)
+
+        if self.order:
+            key, descending = self.order
+            results.sort(key=lambda row: row[key], reverse=descending)
+        if self.limit_rows is not None:
+            results = results[:self.limit_rows]
+        return results
@@ -0,0 +1,222 @@
+"""紧凑的列式对局存储（.mds）
+
+文件布局：
+    8 字节魔数 | 4 字节头部长度(小端) | JSON 头部 | 按 8 字节对齐的各列数组
+
+头部记录行数、卡组字典、备注字符串表及各列的 dtype/偏移。卡组与备注按字典编码为
+小整数，先后手/胜负/硬币三个结果压缩在同一个字节的标志位中。读取时通过 mmap
+直接映射各列，不做拷贝。
+"""
+import argparse
+import json
+import mmap
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'YGOMDS01'
+
+# 结果标志位
+FIRST = 1            # 先手
+WIN = 2              # 胜
+COIN_WIN = 4         # 赢硬币
+FIRST_MISSING = 8    # 先后手缺失
+RESULT_MISSING = 16  # 胜负缺失
+
+RECORD_KEYS = ['my_deck', 'op_deck', 'first_move', 'match_res', 'coin_res', 'notes']
+
+
+def counters_from_flags(flags):
+    """由标志位数组计算计数器（字段与 calcStats.COUNTER_KEYS 一致）"""
+    flags = np.asarray(flags)
+    first = (flags & FIRST) != 0
+    win = (flags & WIN) != 0
+    coin = (flags & COIN_WIN) != 0
+    return {
+        'total_matches': int(len(flags)),
+        'wins': int(np.count_nonzero(win)),
+        'coin_wins': int(np.count_nonzero(coin)),
+        'first_moves': int(np.count_nonzero(first)),
+        'first_move_wins': int(np.count_nonzero(first & win)),
+        'second_move_wins': int(np.count_nonzero(~first & win)),
+        'win_coin_wins': int(np.count_nonzero(coin & win)),
+        'lose_coin_wins': int(np.count_nonzero(~coin & win)),
+    }
+
+
+def _code_dtype(size):
+    return np.dtype('<u2') if size <= 0xFFFF else np.dtype('<u4')
+
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class MatchStore:
+    """单个赛季的列式对局数据"""
+
+    def __init__(self, my_deck, op_deck, flags, notes, decks, note_table, buffer=None):
+        self.my_deck = my_deck
+        self.op_deck = op_deck
+        self.flags = flags
+        self.notes = notes
+        self.decks = decks
+        self.note_table = note_table
+        self._buffer = buffer
+
+    def __len__(self):
+        return len(self.flags)
+
+    @classmethod
+    def from_records(cls, records):
+        """由对局记录列表（json 格式）编码"""
+        df = pd.DataFrame.from_records(records, columns=RECORD_KEYS)
+        n = len(df)
+
+        deck_codes, decks = pd.factorize(
+            pd.concat([df['my_deck'], df['op_deck']], ignore_index=True),
+            use_na_sentinel=False
+        )
+        note_codes, note_table = pd.factorize(df['notes'], use_na_sentinel=False)
+
+        first_move = df['first_move']
+        match_res = df['match_res']
+        flags = (
+            (first_move == 'first').to_numpy() * FIRST
+            | (match_res == 'win').to_numpy() * WIN
+            | (df['coin_res'] == 'win').to_numpy() * COIN_WIN
+            | (~first_move.isin(['first', 'second'])).to_numpy() * FIRST_MISSING
+            | (~match_res.isin(['win', 'lose'])).to_numpy() * RESULT_MISSING
+        ).astype(np.uint8)
+
+        code_dtype = _code_dtype(len(decks))
+        return cls(
+            deck_codes[:n].astype(code_dtype),
+            deck_codes[n:].astype(code_dtype),
+            flags,
+            note_codes.astype(_code_dtype(len(note_table))),
+            list(decks),
+            list(note_table),
+        )
+
+    @classmethod
+    def from_json(cls, json_file):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            return cls.from_records(json.load(f))
+
+    def save(self, path):
+        columns = {
+            'my_deck': self.my_deck,
+            'op_deck': self.op_deck,
+            'flags': self.flags,
+            'notes': self.notes,
+        }
+        header = {
+            'rows': len(self),
+            'decks': self.decks,
+            'notes': self.note_table,
+            'columns': {},
+        }
+
+        # 偏移相对于数据区起点（头部之后按 8 字节对齐处）
+        offset = 0
+        for name, array in columns.items():
+            header['columns'][name] = {'dtype': array.dtype.str, 'offset': offset}
+            offset = _align(offset + array.nbytes)
+        raw_header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        data_start = _align(len(MAGIC) + 4 + len(raw_header))
+
+        with Path(path).open('wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(raw_header)))
+            f.write(raw_header)
+            for name, array in columns.items():
+                position = data_start + header['columns'][name]['offset']
+                f.write(b'\0' * (position - f.tell()))
+                f.write(np.ascontiguousarray(array).tobytes())
+        return self
+
+    @classmethod
+    def open(cls, path):
+        """以 mmap 方式打开（各列为只读的零拷贝视图）"""
+        with Path(path).open('rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} 不是对局存储文件")
+        (header_size,) = struct.unpack_from('<I', buffer, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[start:start + header_size]).decode('utf-8'))
+        data_start = _align(start + header_size)
+
+        rows = header['rows']
+        arrays = {
+            name: np.frombuffer(buffer, dtype=np.dtype(spec['dtype']),
+                                count=rows, offset=data_start + spec['offset'])
+            for name, spec in header['columns'].items()
+        }
+        return cls(
+            arrays['my_deck'],
+            arrays['op_deck'],
+            arrays['flags'],
+            arrays['notes'],
+            header['decks'],
+            header['notes'],
+            buffer=buffer,
+        )
+
+    def columns(self):
+        """analyze_columns 所需的列式数据"""
+        return {
+            'coin': (self.flags & COIN_WIN) != 0,
+            'win': (self.flags & WIN) != 0,
+            'first': (self.flags & FIRST) != 0,
+            'my_deck': self.my_deck,
+            'my_deck_names': self.decks,
+            'op_deck': self.op_deck,
+            'op_deck_names': self.decks,
+        }
+
+    def to_records(self):
+        """还原为 json 格式的对局记录列表"""
+        records = []
+        for my_deck, op_deck, flags, note in zip(
+                self.my_deck.tolist(), self.op_deck.tolist(),
+                self.flags.tolist(), self.notes.tolist()):
+            if flags & FIRST_MISSING:
+                first_move = float('nan')
+            else:
+                first_move = 'first' if flags & FIRST else 'second'
+            if flags & RESULT_MISSING:
+                match_res = float('nan')
+            else:
+                match_res = 'win' if flags & WIN else 'lose'
+            records.append({
+                'my_deck': self.decks[my_deck],
+                'op_deck': self.decks[op_deck],
+                'first_move': first_move,
+                'match_res': match_res,
+                'coin_res': 'win' if flags & COIN_WIN else 'lose',
+                'notes': self.note_table[note],
+            })
+        return records
+
+    def save_json(self, json_file):
+        with Path(json_file).open('w', encoding='utf-8') as f:
+            json.dump(self.to_records(), f, ensure_ascii=False, indent=2)
+        return self
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="json 与 .mds 对局存储互相转换")
+    parser.add_argument('command', choices=['import', 'export'],
+                        help="import: json → mds；export: mds → json")
+    parser.add_argument('source')
+    parser.add_argument('target')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        MatchStore.from_json(args.source).save(args.target)
+    else:
+        MatchStore.open(args.source).save_json(args.target)
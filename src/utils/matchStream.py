@@ -0,0 +1,95 @@
+"""流式读取对局记录（json 数组或 NDJSON），内存占用与文件大小无关"""
+import json
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """逐个产出 json 数组中的元素（sN.json 格式），按块读取文件"""
+    with Path(path).open('r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        started = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        while True:
+            # 跳过空白和分隔符
+            while pos < len(buf) and buf[pos] in _WHITESPACE + (',' if started else ''):
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"{path}: json 数组不完整")
+                fill()
+                continue
+
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError(f"{path}: 不是 json 数组")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # 元素之后应为分隔符；数字等元素在块边界处截断时其前缀仍可能合法
+            # （如 -0.5e|-3 解析为 -0.5），此时补读后重新解析
+            after = end
+            while after < len(buf) and buf[after] in _WHITESPACE:
+                after += 1
+            if after == len(buf) or buf[after] not in ',]':
+                if eof:
+                    raise ValueError(f"{path}: json 数组格式错误")
+                fill()
+                continue
+            pos = end
+            yield obj
+
+
+def iter_ndjson(path):
+    """逐行读取 NDJSON（每行一条对局记录）"""
+    with Path(path).open('r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_match_file(path):
+    """按扩展名选择读取方式：.ndjson/.jsonl 逐行，其余按 json 数组"""
+    if Path(path).suffix in ('.ndjson', '.jsonl'):
+        return iter_ndjson(path)
+    return iter_json_array(path)
+
+
+def count_matches(path):
+    """只计数不保留记录（两遍扫描时的第一遍）"""
+    if Path(path).suffix in ('.ndjson', '.jsonl'):
+        with Path(path).open('r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.strip())
+    return sum(1 for _ in iter_json_array(path))
+
+
+def write_ndjson(matches, path):
+    """把对局记录写为 NDJSON"""
+    with Path(path).open('w', encoding='utf-8') as f:
+        for match in matches:
+            f.write(json.dumps(match, ensure_ascii=False))
+            f.write('\n')
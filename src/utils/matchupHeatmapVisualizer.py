@@ -0,0 +1,87 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib import rcParams
+
+from utils.matchupMatrix import MatchupMatrix
+from utils.stageProfiler import span
+
+# 分面方式：(标题, first, coin)
+SPLITS = {
+    'first': [('全部', None, None), ('先手', True, None), ('后手', False, None)],
+    'coin': [('全部', None, None), ('赢硬币', None, True), ('输硬币', None, False)],
+}
+
+
+class MatchupHeatmapVisualizer:
+    """己方卡组 × 对手卡组胜率热力图（按先后手或硬币分面）"""
+    # 图表读取的统计字段（点分路径）
+    STATS_KEYS = ('matchups',)
+
+    def __init__(self, matchups, season_num=None, split='first', max_op_decks=12,
+                 figsize=None):
+        rcParams['font.sans-serif'] = ['LXGW WenKai']
+
+        # 旧版统计结果没有对局矩阵时绘制空图
+        self.matrix = MatchupMatrix.from_stats(matchups) if matchups else MatchupMatrix()
+        self.season_num = season_num
+
+        # 对手卡组按对局数取前 max_op_decks 个
+        totals, _ = self.matrix.matrix()
+        self.op_order = np.argsort(-totals.sum(axis=0), kind='stable')[:max_op_decks]
+        self.my_decks = self.matrix.my_decks
+        self.op_decks = [self.matrix.op_decks[j] for j in self.op_order]
+
+        panels = SPLITS[split]
+        if figsize is None:
+            figsize = (6 * len(panels), 2 + 0.6 * max(len(self.my_decks), 1))
+        self.fig, self.axes = plt.subplots(1, len(panels), figsize=figsize,
+                                           squeeze=False)
+        self._plot_panels(panels)
+
+    def _plot_panels(self, panels):
+        title = "卡组对局胜率" + (f" (赛季 {self.season_num})" if self.season_num else "")
+        self.fig.suptitle(title, fontsize=16)
+
+        image = None
+        for ax, (label, first, coin) in zip(self.axes[0], panels):
+            totals, rates = self.matrix.matrix(first=first, coin=coin)
+            totals, rates = totals[:, self.op_order], rates[:, self.op_order]
+            image = self._plot_heatmap(ax, totals, rates, label)
+
+        if image is not None:
+            self.fig.colorbar(image, ax=self.axes[0].tolist(), label='胜率 (%)',
+                              shrink=0.8)
+
+    def _plot_heatmap(self, ax, totals, rates, label):
+        ax.set_title(label)
+        if not self.my_decks or not self.op_decks:
+            ax.text(0.5, 0.5, '无对局数据', ha='center', va='center',
+                    transform=ax.transAxes)
+            ax.set_axis_off()
+            return None
+
+        cmap = plt.get_cmap('RdYlGn').copy()
+        cmap.set_bad('#eeeeee')
+        image = ax.imshow(np.ma.masked_invalid(rates), cmap=cmap, vmin=0, vmax=100,
+                          aspect='auto')
+
+        # 格内标注 胜率 与 场数
+        for i, j in zip(*np.nonzero(totals)):
+            ax.text(j, i, f"{rates[i, j]:.0f}%\n{totals[i, j]}场",
+                    ha='center', va='center', fontsize=8)
+
+        ax.set_xticks(range(len(self.op_decks)))
+        ax.set_xticklabels(self.op_decks, rotation=45, ha='right')
+        ax.set_yticks(range(len(self.my_decks)))
+        ax.set_yticklabels(self.my_decks)
+        ax.set_xlabel('对手卡组')
+        ax.set_ylabel('己方卡组')
+        return image
+
+    def show(self):
+        plt.show()
+
+    def save(self, filename):
+        with span('savefig'):
+            plt.savefig(filename, bbox_inches='tight')
+        plt.close()
@@ -0,0 +1,124 @@
+"""卡组对局矩阵：己方卡组 × 对手卡组 × 先后手 × 硬币
+
+counts[己方, 对手, 先手, 赢硬币] = (场数, 胜场)，先手/赢硬币下标 1 表示先手/赢硬币。
+一次 bincount 由整数编码的卡组 ID 建立，任意对局组合的查询为 O(1) 下标访问。
+统计结果中以稀疏形式保存（只保存非零格）：
+    {'my_decks': [...], 'op_decks': [...],
+     'cells': [[己方, 对手, 先手, 赢硬币, 场数, 胜场], ...]}
+"""
+import json
+
+import numpy as np
+
+# 单格的取值：场数、胜场
+TOTAL, WINS = 0, 1
+
+
+def deck_key(deck):
+    """卡组名作为键（缺失值如 NaN 转为与 JSON 输出一致的字符串）"""
+    return deck if isinstance(deck, str) else json.dumps(deck)
+
+
+def appearance_order(codes, names):
+    """按首次出现顺序重新编号：返回 (新编号数组, 卡组名列表)，未出现的卡组去掉"""
+    codes = np.asarray(codes, dtype=np.int64)
+    uniq, first_idx = np.unique(codes, return_index=True)
+    order = uniq[np.argsort(first_idx, kind='stable')]
+    remap = np.zeros(max(len(names), 1), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return remap[codes], [deck_key(names[code]) for code in order.tolist()]
+
+
+def _axis(value):
+    """None 表示对该维求和，否则取对应下标"""
+    return slice(None) if value is None else int(bool(value))
+
+
+class MatchupMatrix:
+    def __init__(self, my_decks=(), op_decks=(), counts=None):
+        self.my_decks = list(my_decks)
+        self.op_decks = list(op_decks)
+        if counts is None:
+            counts = np.zeros((len(self.my_decks), len(self.op_decks), 2, 2, 2),
+                              dtype=np.int64)
+        self.counts = counts
+        self._my_index = {deck: i for i, deck in enumerate(self.my_decks)}
+        self._op_index = {deck: i for i, deck in enumerate(self.op_decks)}
+
+    @classmethod
+    def from_columns(cls, my_codes, my_names, op_codes, op_names, first, coin, win):
+        """列式数据一次向量化计数（卡组按首次出现顺序编号）"""
+        my_codes, my_decks = appearance_order(my_codes, my_names)
+        op_codes, op_decks = appearance_order(op_codes, op_names)
+        first = np.asarray(first, dtype=np.int64)
+        coin = np.asarray(coin, dtype=np.int64)
+        win = np.asarray(win, dtype=bool)
+
+        shape = (len(my_decks), len(op_decks), 2, 2)
+        cell = ((my_codes * shape[1] + op_codes) * 2 + first) * 2 + coin
+        size = int(np.prod(shape))
+        counts = np.stack([
+            np.bincount(cell, minlength=size),
+            np.bincount(cell[win], minlength=size),
+        ], axis=-1).reshape(shape + (2,))
+        return cls(my_decks, op_decks, counts)
+
+    @classmethod
+    def from_stats(cls, matchups):
+        """由统计结果中的稀疏结构还原"""
+        matrix = cls(matchups['my_decks'], matchups['op_decks'])
+        cells = np.asarray(matchups['cells'], dtype=np.int64).reshape(-1, 6)
+        matrix.counts[tuple(cells[:, :4].T)] = cells[:, 4:]
+        return matrix
+
+    def to_stats(self):
+        """稀疏结构：只保存有对局的格，按 (己方, 对手, 先手, 赢硬币) 排序"""
+        index = np.argwhere(self.counts[..., TOTAL] > 0)
+        values = self.counts[tuple(index.T)]
+        return {
+            'my_decks': list(self.my_decks),
+            'op_decks': list(self.op_decks),
+            'cells': np.hstack([index, values]).tolist(),
+        }
+
+    def _deck_index(self, deck, index, decks, axis):
+        key = deck_key(deck)
+        if key not in index:
+            index[key] = len(decks)
+            decks.append(key)
+            pad = [(0, 0)] * self.counts.ndim
+            pad[axis] = (0, 1)
+            self.counts = np.pad(self.counts, pad)
+        return index[key]
+
+    def add(self, my_deck, op_deck, first, coin, win):
+        """计入一场对局（流式/增量统计用），新卡组时扩展矩阵"""
+        i = self._deck_index(my_deck, self._my_index, self.my_decks, 0)
+        j = self._deck_index(op_deck, self._op_index, self.op_decks, 1)
+        cell = self.counts[i, j, int(bool(first)), int(bool(coin))]
+        cell[TOTAL] += 1
+        cell[WINS] += bool(win)
+
+    def lookup(self, my_deck, op_deck, first=None, coin=None):
+        """(场数, 胜场)；first/coin 为 None 时对该维求和，卡组不存在时为 (0, 0)"""
+        i = self._my_index.get(deck_key(my_deck))
+        j = self._op_index.get(deck_key(op_deck))
+        if i is None or j is None:
+            return 0, 0
+        cells = self.counts[i, j, _axis(first), _axis(coin)].reshape(-1, 2)
+        total, wins = cells.sum(axis=0).tolist()
+        return total, wins
+
+    def matrix(self, first=None, coin=None):
+        """二维 (场数, 胜率%) 矩阵，行为己方卡组、列为对手卡组；无对局处胜率为 nan"""
+        cells = self.counts[:, :, _axis(first), _axis(coin)]
+        # 未固定的先后手/硬币维度求和，剩下 (己方, 对手, 2)
+        cells = cells.sum(axis=tuple(range(2, cells.ndim - 1)))
+        totals = cells[..., TOTAL]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = np.where(totals > 0, cells[..., WINS] / totals * 100, np.nan)
+        return totals, rates
+
+    def __repr__(self):
+        return (f"MatchupMatrix({len(self.my_decks)} 己方卡组 × "
+                f"{len(self.op_decks)} 对手卡组, {int(self.counts[..., TOTAL].sum())} 场)")
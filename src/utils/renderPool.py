@@ -0,0 +1,82 @@
+"""图表渲染进程池
+
+每个工作进程只初始化一次 matplotlib（Agg 后端、中文字体、预热字体缓存），
+之后从任务队列逐张领取图表任务 (统计文件, 赛季, 图表文件名, 输出路径)，
+并返回每张图的耗时。
+"""
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+from utils.stageProfiler import span
+
+FONT_FAMILY = 'LXGW WenKai'
+
+# 预热时绘制的文字（触发字体查找与字形缓存）
+_WARM_TEXT = '硬币胜率 先手率 0123456789%'
+
+
+def init_render_worker():
+    """工作进程初始化：Agg 后端、字体配置与字体缓存预热"""
+    with span('font_warmup'):
+        import matplotlib
+        matplotlib.use('Agg')
+
+        from matplotlib import font_manager, rcParams
+        from matplotlib.figure import Figure
+
+        rcParams['font.sans-serif'] = [FONT_FAMILY]
+        font_manager.findfont(font_manager.FontProperties(family=['sans-serif']))
+
+        fig = Figure(figsize=(1, 1))
+        fig.text(0, 0, _WARM_TEXT)
+        fig.canvas.draw()
+
+
+@lru_cache(maxsize=8)
+def _load_stats(stats_file, mtime_ns):
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def render_job(stats_file, season_num, chart, output, template=False):
+    """渲染一张图表，返回 (赛季, 图表, 耗时秒)"""
+    from drawStats import render_chart
+
+    start = time.perf_counter()
+    stats = _load_stats(str(stats_file), os.stat(stats_file).st_mtime_ns)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    render_chart(stats, season_num, chart, str(output), template=template)
+    return season_num, chart, time.perf_counter() - start
+
+
+def render_charts(jobs, workers=None, template=False):
+    """并行渲染图表任务列表，返回每张图的 (赛季, 图表, 耗时秒)
+
+    workers 为 1 时在当前进程内依次渲染；template=True 时各进程复用图表模板。
+    """
+    jobs = list(jobs)
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    if workers == 1:
+        init_render_worker()
+        return [render_job(*job, template=template) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=init_render_worker) as pool:
+        futures = [pool.submit(render_job, *job, template=template) for job in jobs]
+        return [future.result() for future in as_completed(futures)]
+
+
+def timing_summary(timings):
+    """按图表类型汇总耗时：[(图表, 张数, 总耗时, 平均耗时)]"""
+    grouped = defaultdict(list)
+    for _, chart, elapsed in timings:
+        grouped[chart].append(elapsed)
+    return [
+        (chart, len(values), sum(values), sum(values) / len(values))
+        for chart, values in sorted(grouped.items())
+    ]
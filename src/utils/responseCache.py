@@ -0,0 +1,74 @@
+"""按字节数限制容量的 LRU 响应缓存（线程安全）
+
+键为可哈希的元组，如 (图表, 格式, 参数, 数据指纹)；值为 (响应体, Content-Type)。
+ETag 由键直接得到，客户端带 If-None-Match 时不需要生成响应体即可判断是否未变。
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+
+
+def etag_for(key):
+    return '"' + hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '"'
+
+
+class ResponseCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # 每个键一把生成锁：同一响应并发请求时只生成一次
+        self._building = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, content_type):
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key)[0])
+            if len(body) > self.max_bytes:
+                return
+            self._entries[key] = (body, content_type)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (old, _) = self._entries.popitem(last=False)
+                self.size -= len(old)
+
+    def get_or_build(self, key, build):
+        """命中时直接返回，否则调用 build() -> (响应体, Content-Type) 并缓存"""
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            lock = self._building.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                # 等待期间其他线程可能已生成
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is None:
+                    entry = build()
+                    self.put(key, *entry)
+        finally:
+            # build() 出错时也要清除生成中标记，之后的请求可以重试
+            with self._lock:
+                self._building.pop(key, None)
+        return entry
+
+    def info(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.size,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
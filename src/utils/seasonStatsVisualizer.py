@@ -2,7 +2,55 @@ import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 import numpy as np
 
+from utils.chartTemplate import ChartTemplate, error_bars, error_segments, label_height, split_intervals
+from utils.stageProfiler import span
+
+MAIN_COLUMNS = [
+    '进度','总对局数', '先手次数', '硬币胜场', '胜率', '硬币胜率',
+    '先手率', '先手胜率', '后手胜率', '赢硬币胜率', '输硬币胜率'
+]
+TEST_COLUMNS = ['检验类型', '统计量', 'P值', '结论']
+RATE_LABELS = ['胜率', '硬币胜率', '先手率', '先手胜率', '后手胜率', '赢硬币胜率', '输硬币胜率']
+RATE_KEYS = [
+    'win_rate', 'coin_win_rate', 'first_move_rate', 'first_move_win_rate',
+    'second_move_win_rate', 'win_coin_win_rate', 'lose_coin_win_rate',
+]
+
+def rate_intervals(data):
+    """各概率 95% 置信区间的 (下限列表, 上限列表)"""
+    return split_intervals([data.get(f"{key}_ci") for key in RATE_KEYS])
+
+def chart_top(data):
+    """对比图 y 轴上限：概率与区间上端的最大值留出标签空间"""
+    _, highs = rate_intervals(data)
+    return (max([data[key] for key in RATE_KEYS] + [h for h in highs if h is not None]) + 5) * 1.3
+
+def main_row(label, data):
+    """主数据表格的一行"""
+    return [label, data['total_matches'], data['first_moves'], data['coin_wins']] + [
+        f"{data[key]}%" for key in RATE_KEYS
+    ]
+
+def test_rows(data):
+    """硬币公平性检验表格内容"""
+    return [
+        ['卡方检验',
+         f"{data['coin_fairness_test']['chi2_statistic']:.6f}",
+         f"{data['coin_fairness_test']['p_value']:.6f}",
+         '符合公平' if data['coin_fairness_test']['is_fair'] else '可能不公平'],
+        ['二项检验',
+         '-',
+         f"{data['binom_test']:.6f}",
+         '符合公平' if data['binom_test'] > 0.05 else '可能不公平']
+    ]
+
 class SeasonStatsVisualizer:
+    # 图表读取的统计字段（点分路径）
+    STATS_KEYS = (
+        'total_matches', 'first_moves', 'coin_wins', *RATE_KEYS,
+        *(f"{key}_ci" for key in RATE_KEYS), 'coin_fairness_test', 'binom_test', 'middle_stats',
+    )
+
     def __init__(self, stats, season_num=18):
         plt.rcParams['font.sans-serif'] = ['LXGW WenKai']
         self.stats = stats
@@ -22,39 +70,11 @@ class SeasonStatsVisualizer:
         ax.axis('off')
 
         # 主数据表格
-        columns = [
-            '进度','总对局数', '先手次数', '硬币胜场', '胜率', '硬币胜率',
-            '先手率', '先手胜率', '后手胜率', '赢硬币胜率', '输硬币胜率'
-        ]
+        columns = MAIN_COLUMNS
 
         # 构建行数据
-        full_season_row = [
-            '全赛季',
-            self.stats['total_matches'],
-            self.stats['first_moves'],
-            self.stats['coin_wins'],
-            f"{self.stats['win_rate']}%",
-            f"{self.stats['coin_win_rate']}%",
-            f"{self.stats['first_move_rate']}%",
-            f"{self.stats['first_move_win_rate']}%",
-            f"{self.stats['second_move_win_rate']}%",
-            f"{self.stats['win_coin_win_rate']}%",
-            f"{self.stats['lose_coin_win_rate']}%"
-        ]
-
-        mid_season_row = [
-            '中期',
-            self.mid_stats.get('total_matches', ''),
-            self.mid_stats.get('first_moves', ''),
-            self.mid_stats.get('coin_wins', ''),
-            self._fmt_rate(self.mid_stats, 'win_rate'),
-            self._fmt_rate(self.mid_stats, 'coin_win_rate'),
-            self._fmt_rate(self.mid_stats, 'first_move_rate'),
-            self._fmt_rate(self.mid_stats, 'first_move_win_rate'),
-            self._fmt_rate(self.mid_stats, 'second_move_win_rate'),
-            self._fmt_rate(self.mid_stats, 'win_coin_win_rate'),
-            self._fmt_rate(self.mid_stats, 'lose_coin_win_rate')
-        ] if self.mid_stats else None
+        full_season_row = main_row('全赛季', self.stats)
+        mid_season_row = main_row('中期', self.mid_stats) if self.mid_stats else None
 
         cell_text = [mid_season_row]
         cell_text.append(full_season_row)
@@ -83,8 +103,7 @@ class SeasonStatsVisualizer:
             self.stats['lose_coin_win_rate'],
         ]
 
-        y_max = max(full_season) + 5
-        ax.set_ylim(0, y_max * 1.3)  # 增加15%的空间
+        ax.set_ylim(0, chart_top(self.stats))  # 增加30%的空间
 
 
         if self.mid_stats:
@@ -102,16 +121,14 @@ class SeasonStatsVisualizer:
             bars_mid = ax.bar(x - 0.2, mid, 0.4, label='中期', color='#a9dc76')
             bars_full = ax.bar(x + 0.2, full_season, 0.4, label='全赛季', color='#78dce8')
 
-            # 在柱子上方添加数值标签
-            for bar in bars_mid:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:.1f}%',
-                        ha='center', va='bottom', fontsize=8)
-
-                for bar in bars_full:
+            # 95% 置信区间误差线，数值标签放在区间上端
+            for offset, data, bars in ((-0.2, self.mid_stats, bars_mid),
+                                       (0.2, self.stats, bars_full)):
+                lows, highs = rate_intervals(data)
+                error_bars(ax, x + offset, lows, highs)
+                for bar, high in zip(bars, highs):
                     height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
+                    ax.text(bar.get_x() + bar.get_width()/2., label_height(height, high),
                             f'{height:.1f}%',
                             ha='center', va='bottom', fontsize=8)
 
@@ -131,17 +148,8 @@ class SeasonStatsVisualizer:
         ax.axis('off')
 
         # 创建检验结果表格
-        columns = ['检验类型', '统计量', 'P值', '结论']
-        cell_text = [
-            ['卡方检验',
-             f"{self.stats['coin_fairness_test']['chi2_statistic']:.6f}",
-             f"{self.stats['coin_fairness_test']['p_value']:.6f}",
-             '符合公平' if self.stats['coin_fairness_test']['is_fair'] else '可能不公平'],
-            ['二项检验',
-             '-',
-             f"{self.stats['binom_test']:.6f}",
-             '符合公平' if self.stats['binom_test'] > 0.05 else '可能不公平']
-        ]
+        columns = TEST_COLUMNS
+        cell_text = test_rows(self.stats)
 
         table = ax.table(cellText=cell_text,
                         colLabels=columns,
@@ -161,17 +169,8 @@ class SeasonStatsVisualizer:
         ax.axis('off')
 
         # 创建中期检验结果表格
-        columns = ['检验类型', '统计量', 'P值', '结论']
-        cell_text = [
-            ['卡方检验',
-             f"{self.mid_stats['coin_fairness_test']['chi2_statistic']:.6f}",
-             f"{self.mid_stats['coin_fairness_test']['p_value']:.6f}",
-             '符合公平' if self.mid_stats['coin_fairness_test']['is_fair'] else '可能不公平'],
-            ['二项检验',
-             '-',
-             f"{self.mid_stats['binom_test']:.6f}",
-             '符合公平' if self.mid_stats['binom_test'] > 0.05 else '可能不公平']
-        ]
+        columns = TEST_COLUMNS
+        cell_text = test_rows(self.mid_stats)
 
         table = ax.table(cellText=cell_text,
                         colLabels=columns,
@@ -183,15 +182,115 @@ class SeasonStatsVisualizer:
         table.set_fontsize(10)
         ax.set_title(f's{self.season_num}中期硬币公平性检验', fontsize=12)
 
-    def _fmt_rate(self, data, key):
-        return f"{data.get(key, '')}%" if data else ''
-
     def show(self):
         plt.tight_layout(pad=1.0, h_pad=1.0, w_pad=1.0)
         plt.show()
 
     def save(self, filename):
         plt.tight_layout(pad=1.0, h_pad=1.0, w_pad=1.0)
-        plt.savefig(filename, bbox_inches='tight')
+        with span('savefig'):
+            plt.savefig(filename, bbox_inches='tight')
         plt.close()
 
+
+
+class SeasonStatsTemplate(ChartTemplate):
+    """赛季数据图模板：表格、对比柱状图与检验表格只创建一次，之后只改文字与柱高"""
+    figsize = (12, 8)
+    dpi = 120
+
+    def fits(self, stats):
+        return bool(stats['middle_stats']) == self.has_mid
+
+    def build(self, stats, season_num):
+        self.has_mid = bool(stats['middle_stats'])
+        gs = GridSpec(3, 2, figure=self.fig, height_ratios=[0.8, 2, 0.7])
+        placeholder = lambda rows, cols: [[''] * cols for _ in range(rows)]
+
+        # 主数据表格
+        ax = self.fig.add_subplot(gs[0, :])
+        ax.axis('off')
+        self.main_rows = 2 if self.has_mid else 1
+        self.main_table = ax.table(
+            cellText=placeholder(self.main_rows, len(MAIN_COLUMNS)),
+            colLabels=MAIN_COLUMNS,
+            loc='upper center',
+            cellLoc='center',
+            colColours=['#f0f0f0']*len(MAIN_COLUMNS),
+            bbox=[0, 0, 1, 1]
+        )
+        self.main_ax = ax
+
+        # 中期 / 全赛季对比柱状图
+        ax = self.fig.add_subplot(gs[1, :])
+        ax.margins(y=0.05)
+        x = np.arange(len(RATE_LABELS))
+        self.bar_groups = []
+        if self.has_mid:
+            for offset, label, color in ((-0.2, '中期', '#a9dc76'),
+                                         (0.2, '全赛季', '#78dce8')):
+                bars = ax.bar(x + offset, [0] * len(x), 0.4, label=label, color=color)
+                texts = [ax.text(bar.get_x() + bar.get_width()/2., 0, '',
+                                 ha='center', va='bottom', fontsize=8)
+                         for bar in bars]
+                self.bar_groups.append((bars, texts, error_bars(ax)))
+            ax.set_xticks(x)
+        ax.set_xticklabels(RATE_LABELS, rotation=0)
+        ax.set_ylabel('百分比 (%)')
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+        ax.yaxis.set_major_locator(plt.MultipleLocator(15))
+        self.chart_ax = ax
+
+        # 硬币公平性检验表格：全赛季在右，中期在左
+        self.test_tables = []
+        for position, key in (((2, 1), 'full'), ((2, 0), 'mid')):
+            if key == 'mid' and not self.has_mid:
+                continue
+            ax = self.fig.add_subplot(gs[position])
+            ax.axis('off')
+            table = ax.table(cellText=placeholder(2, len(TEST_COLUMNS)),
+                             colLabels=TEST_COLUMNS,
+                             loc='upper center',
+                             cellLoc='center',
+                             colColours=['#f0f0f0']*len(TEST_COLUMNS),
+                             colWidths=[0.25, 0.25, 0.25, 0.25])
+            table.auto_set_font_size(False)
+            table.set_fontsize(10)
+            self.test_tables.append((key, ax, table))
+
+    @staticmethod
+    def _fill(table, rows):
+        for r, row in enumerate(rows, start=1):
+            for c, value in enumerate(row):
+                table[r, c].get_text().set_text(value)
+
+    def update(self, stats, season_num):
+        mid = stats['middle_stats'][0] if self.has_mid else None
+        rows = [main_row('全赛季', stats)]
+        if mid:
+            rows.insert(0, main_row('中期', mid))
+        self._fill(self.main_table, rows)
+        self.main_ax.set_title(f's{season_num}赛季数据', fontsize=12)
+
+        self.chart_ax.set_ylim(0, chart_top(stats))
+        if mid:
+            x = np.arange(len(RATE_KEYS))
+            for (bars, texts, errors), offset, data in zip(self.bar_groups, (-0.2, 0.2),
+                                                           (mid, stats)):
+                lows, highs = rate_intervals(data)
+                errors.set_segments(error_segments(x + offset, lows, highs))
+                for bar, text, key, high in zip(bars, texts, RATE_KEYS, highs):
+                    height = data[key]
+                    bar.set_height(height)
+                    text.set_y(label_height(height, high))
+                    text.set_text(f'{height:.1f}%')
+        self.chart_ax.set_title(f's{season_num}赛季数据对比', fontsize=12, pad=10)
+
+        for key, ax, table in self.test_tables:
+            self._fill(table, test_rows(stats if key == 'full' else mid))
+            label = '全赛季' if key == 'full' else '中期'
+            ax.set_title(f's{season_num}{label}硬币公平性检验', fontsize=12)
+
+    def layout(self):
+        self.fig.tight_layout(pad=1.0, h_pad=1.0, w_pad=1.0)
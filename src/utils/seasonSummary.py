@@ -0,0 +1,229 @@
+"""可合并的赛季摘要（幺半群）：任意赛季区间 / 分片不读原始对局即可精确合并
+
+SeasonSummary 包含：
+    counters   计数器（逐项相加）
+    op_decks   完整的对手卡组直方图 {卡组: 场数}
+    my_decks   我的卡组表 {卡组: [场数, 胜场, 硬币胜场]}
+    runs       各序列（硬币 / 胜负 / 先后手）的游程状态 RunState
+
+merge() 表示把另一段对局接在本段之后：满足结合律，empty() 为单位元；
+游程状态保留两端尚未结束的游程，拼接处取值相同的游程合并为一个，跨赛季的连续也能精确统计。
+不同玩家等相互独立的序列先 closed() 结束两端游程再合并，不会被拼接。
+"""
+from utils.streakEngine import STREAK_SERIES, run_lengths
+from utils.trendEngine import FLAG_KEYS, flag_matrix
+
+SUMMARY_VERSION = 1
+
+COUNTER_KEYS = ('total_matches',) + FLAG_KEYS
+
+
+def _add_run(distribution, label, length, count=1):
+    counts = distribution.setdefault(label, [])
+    if len(counts) < length:
+        counts.extend([0] * (length - len(counts)))
+    counts[length - 1] += count
+
+
+def _add_distribution(target, source):
+    for label, counts in source.items():
+        for length, count in enumerate(counts, 1):
+            if count:
+                _add_run(target, label, length, count)
+
+
+class RunState:
+    """一段序列的游程状态
+
+    head   左端未结束的游程 [取值, 长度]（可与前一段拼接），None 表示左端已结束
+    tail   右端未结束的游程（可与后一段拼接）
+    single 整段只有一个游程且两端都未结束（此时只用 head，tail 为 None）
+    inner  已结束游程的长度分布 {取值: [长度1的游程数, ...]}
+    """
+
+    def __init__(self, head=None, tail=None, single=False, inner=None):
+        self.head = head
+        self.tail = tail
+        self.single = single
+        self.inner = inner if inner is not None else {}
+
+    @classmethod
+    def from_values(cls, values, labels):
+        """布尔序列；labels 为 (为真时的取值, 为假时的取值)"""
+        types, lengths = run_lengths(values)
+        runs = [[labels[0] if value else labels[1], length]
+                for value, length in zip(types.tolist(), lengths.tolist())]
+        if not runs:
+            return cls()
+        if len(runs) == 1:
+            return cls(head=runs[0], single=True)
+        state = cls(head=runs[0], tail=runs[-1])
+        for label, length in runs[1:-1]:
+            _add_run(state.inner, label, length)
+        return state
+
+    @property
+    def is_empty(self):
+        return self.head is None and self.tail is None and not self.inner
+
+    def _right(self):
+        """右端未结束的游程"""
+        return self.head if self.single else self.tail
+
+    def merge(self, other):
+        if other.is_empty:
+            return self.copy()
+        if self.is_empty:
+            return other.copy()
+        inner = {}
+        _add_distribution(inner, self.inner)
+        _add_distribution(inner, other.inner)
+        right, left = self._right(), other.head
+        if right is not None and left is not None and right[0] == left[0]:
+            joined = [right[0], right[1] + left[1]]
+            if self.single and other.single:
+                return RunState(head=joined, single=True, inner=inner)
+            head = joined if self.single else self.head
+            tail = joined if other.single else other.tail
+            if not self.single and not other.single:
+                _add_run(inner, *joined)
+            return RunState(head=head, tail=tail, inner=inner)
+
+        # 拼接处取值不同（或一侧已结束）：两侧的端点游程在此结束
+        head = self.head
+        if not self.single and right is not None:
+            _add_run(inner, *right)
+        tail = other.head if other.single else other.tail
+        if not other.single and left is not None:
+            _add_run(inner, *left)
+        return RunState(head=head, tail=tail, inner=inner)
+
+    def closed(self):
+        """两端游程都结束后的状态（之后不再与相邻分片拼接）"""
+        inner = {}
+        _add_distribution(inner, self.inner)
+        for run in (self.head, self.tail):
+            if run is not None:
+                _add_run(inner, *run)
+        return RunState(inner=inner)
+
+    def distribution(self):
+        """全部游程（含两端未结束的）的长度分布"""
+        return self.closed().inner
+
+    def copy(self):
+        return RunState.from_dict(self.to_dict())
+
+    def to_dict(self):
+        return {'head': self.head, 'tail': self.tail, 'single': self.single,
+                'inner': {label: list(counts) for label, counts in self.inner.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            head=list(data['head']) if data['head'] else None,
+            tail=list(data['tail']) if data['tail'] else None,
+            single=data['single'],
+            inner={label: list(counts) for label, counts in data['inner'].items()},
+        )
+
+
+class SeasonSummary:
+    """可合并的赛季（或赛季区间 / 分片）摘要"""
+
+    def __init__(self, counters=None, op_decks=None, my_decks=None, runs=None):
+        self.counters = counters or {key: 0 for key in COUNTER_KEYS}
+        self.op_decks = op_decks if op_decks is not None else {}
+        self.my_decks = my_decks if my_decks is not None else {}
+        self.runs = runs or {name: RunState() for name in STREAK_SERIES}
+
+    @classmethod
+    def empty(cls):
+        return cls()
+
+    @classmethod
+    def from_matches(cls, matches):
+        coin = [match['coin_res'] == 'win' for match in matches]
+        win = [match['match_res'] == 'win' for match in matches]
+        first = [match['first_move'] == 'first' for match in matches]
+        totals = flag_matrix(coin, win, first).sum(axis=0).tolist() if matches else [0] * len(FLAG_KEYS)
+        summary = cls(counters=dict(zip(COUNTER_KEYS, [len(matches)] + totals)))
+
+        for match in matches:
+            op_deck = match['op_deck']
+            summary.op_decks[op_deck] = summary.op_decks.get(op_deck, 0) + 1
+            deck = summary.my_decks.setdefault(match['my_deck'], [0, 0, 0])
+            deck[0] += 1
+            deck[1] += match['match_res'] == 'win'
+            deck[2] += match['coin_res'] == 'win'
+
+        values = {'coin_res': coin, 'match_res': win, 'first_move': first}
+        summary.runs = {
+            name: RunState.from_values(values[field], labels)
+            for name, (field, *labels) in STREAK_SERIES.items()
+        }
+        return summary
+
+    @property
+    def total_matches(self):
+        return self.counters['total_matches']
+
+    def merge(self, other):
+        """把 other 接在本摘要之后（不修改两个操作数）"""
+        counters = {key: self.counters[key] + other.counters[key] for key in COUNTER_KEYS}
+        op_decks = dict(self.op_decks)
+        for deck, count in other.op_decks.items():
+            op_decks[deck] = op_decks.get(deck, 0) + count
+        my_decks = {deck: list(values) for deck, values in self.my_decks.items()}
+        for deck, values in other.my_decks.items():
+            total = my_decks.setdefault(deck, [0, 0, 0])
+            for i, value in enumerate(values):
+                total[i] += value
+        runs = {name: self.runs[name].merge(other.runs[name]) for name in STREAK_SERIES}
+        return SeasonSummary(counters, op_decks, my_decks, runs)
+
+    def closed(self):
+        """结束两端游程：相互独立的序列（如不同玩家）合并前使用"""
+        return SeasonSummary(dict(self.counters), dict(self.op_decks),
+                             {deck: list(values) for deck, values in self.my_decks.items()},
+                             {name: state.closed() for name, state in self.runs.items()})
+
+    def streaks(self):
+        """与统计结果 'streaks' 字段相同结构的游程长度分布"""
+        return {
+            name: {label: self.runs[name].distribution().get(label, []) for label in labels}
+            for name, (_, *labels) in STREAK_SERIES.items()
+        }
+
+    def to_dict(self):
+        return {
+            'version': SUMMARY_VERSION,
+            'counters': self.counters,
+            'op_decks': self.op_decks,
+            'my_decks': self.my_decks,
+            'runs': {name: state.to_dict() for name, state in self.runs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != SUMMARY_VERSION:
+            raise ValueError(f"摘要版本不符: {data.get('version')}")
+        return cls(
+            counters=dict(data['counters']),
+            op_decks=dict(data['op_decks']),
+            my_decks={deck: list(values) for deck, values in data['my_decks'].items()},
+            runs={name: RunState.from_dict(state) for name, state in data['runs'].items()},
+        )
+
+
+def tree_merge(summaries):
+    """按顺序两两归并（树形归约，深度 log n）；空列表返回单位元"""
+    level = list(summaries)
+    if not level:
+        return SeasonSummary.empty()
+    while len(level) > 1:
+        merged = [level[i].merge(level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
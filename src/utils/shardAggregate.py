@@ -0,0 +1,168 @@
+"""多玩家档案的分片聚合（map-reduce）
+
+map：每个 (玩家, 赛季) 分片由对局记录得到 SeasonSummary 摘要，保存在该玩家的
+     stats/sN_partial.json，经构建缓存判断：对局记录与代码未变时直接读取，
+     新增一个玩家或赛季只计算新分片；
+reduce：同一玩家的赛季按顺序合并（跨赛季的连续游程精确拼接），
+     不同玩家之间相互独立，先结束两端游程再合并，得到全体 / 每个玩家 / 每个赛季的摘要。
+     指定草图容量时，对手卡组改为在 map 阶段逐条对局流式写入 SpaceSaving 草图
+     （缓存在 stats/sN_sketch.json），reduce 只合并草图，不再合并完整直方图。
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.buildCache import BuildCache, file_stamp
+from utils.dataLayout import DataLayout
+from utils.deckHistogram import SpaceSaving, tree_merge_sketches
+from utils.seasonSummary import SeasonSummary, tree_merge
+from utils.stageProfiler import add_rows, span
+
+
+def map_shard(player_root, season_num, force=False):
+    """计算（或读取缓存的）分片摘要，返回 (SeasonSummary, 是否重新计算)"""
+    layout = DataLayout(player_root)
+    source = layout.json(season_num)
+    target = layout.partial(season_num)
+    cache = BuildCache(layout.root, force=force)
+
+    def build():
+        with open(source, 'r', encoding='utf-8') as f:
+            matches = json.load(f)
+        add_rows(len(matches))
+        layout.stats_dir.mkdir(parents=True, exist_ok=True)
+        data = SeasonSummary.from_matches(matches).to_dict()
+        data['source'] = file_stamp(source)
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    with span('partial', season=season_num, root=str(layout.root)):
+        built = cache.run('partial', season_num, [source], [target], build)
+    with open(target, 'r', encoding='utf-8') as f:
+        return SeasonSummary.from_dict(json.load(f)), built
+
+
+def load_summary(player_root, season_num):
+    """读取缓存的分片摘要：对局记录的大小与修改时间与摘要中记录的相同时直接使用
+    （不读原始对局），否则经 map_shard 重新生成"""
+    layout = DataLayout(player_root)
+    target = layout.partial(season_num)
+    if target.exists():
+        with open(target, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('source') == file_stamp(layout.json(season_num)):
+            try:
+                return SeasonSummary.from_dict(data)
+            except ValueError:
+                pass  # 摘要版本不符，重新生成
+    return map_shard(player_root, season_num)[0]
+
+
+def map_sketch(player_root, season_num, capacity, force=False):
+    """计算（或读取缓存的）分片对手卡组草图：逐条读取对局，内存只与容量有关"""
+    from utils.matchStream import iter_match_file
+
+    layout = DataLayout(player_root)
+    source = layout.json(season_num)
+    target = layout.sketch(season_num)
+    if target.exists():
+        with open(target, 'r', encoding='utf-8') as f:
+            # 容量不同的草图不能复用
+            force = force or json.load(f)['capacity'] != capacity
+    cache = BuildCache(layout.root, force=force)
+
+    def build():
+        sketch = SpaceSaving(capacity)
+        for match in iter_match_file(source):
+            sketch.add(match['op_deck'])
+        add_rows(sketch.total)
+        layout.stats_dir.mkdir(parents=True, exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(sketch.to_dict(), f, ensure_ascii=False)
+
+    with span('sketch', season=season_num, root=str(layout.root)):
+        cache.run('sketch', season_num, [source], [target], build)
+    with open(target, 'r', encoding='utf-8') as f:
+        return SpaceSaving.from_dict(json.load(f))
+
+
+def map_job(player_root, season_num, force=False, sketch=None):
+    """单个分片的 map：(摘要, 是否重新计算, 草图)；草图模式下摘要不带 op_decks"""
+    summary, built = map_shard(player_root, season_num, force)
+    if not sketch:
+        return summary, built, None
+    summary.op_decks = {}
+    return summary, built, map_sketch(player_root, season_num, sketch, force)
+
+
+def map_shards(archive, shards, workers=None, force=False, sketch=None):
+    """并行计算各分片的摘要，返回与 shards 同序的 [(SeasonSummary, 是否重新计算, 草图)]"""
+    jobs = [(str(archive.player(player).root), season_num) for player, season_num in shards]
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    if workers == 1:
+        return [map_job(root, season_num, force, sketch) for root, season_num in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(map_job, root, season_num, force, sketch)
+                   for root, season_num in jobs]
+        return [future.result() for future in futures]
+
+
+def aggregate_archive(archive, players=None, seasons=None, workers=None, force=False,
+                      sketch=None):
+    """map-reduce 合并档案中的分片
+
+    返回 {'total': 全部合并, 'players': {玩家: 合并}, 'seasons': {赛季: 合并},
+          'shards': 分片数, 'computed': 本次重新计算的分片数}，各合并结果为 SeasonSummary；
+    sketch 为草图容量时另有 'sketch': 全体对手卡组的 SpaceSaving 草图，
+    此时各摘要的 op_decks 为空（不合并完整直方图）
+    """
+    shards = archive.shards(players, seasons)
+    results = map_shards(archive, shards, workers, force, sketch)
+
+    by_player, by_season = {}, {}
+    for (player, season_num), (summary, *_) in sorted(zip(shards, results), key=lambda x: x[0]):
+        by_player.setdefault(player, []).append(summary)
+        by_season.setdefault(season_num, []).append(summary.closed())
+    with span('reduce'):
+        player_summaries = {name: tree_merge(parts) for name, parts in by_player.items()}
+        result = {
+            'total': tree_merge(summary.closed() for summary in player_summaries.values()),
+            'players': player_summaries,
+            'seasons': {num: tree_merge(parts) for num, parts in sorted(by_season.items())},
+            'shards': len(shards),
+            'computed': sum(built for _, built, _ in results),
+        }
+        if sketch:
+            result['sketch'] = tree_merge_sketches(
+                (shard_sketch for _, _, shard_sketch in results), sketch)
+        return result
+
+
+def environment_share(op_decks, k=None):
+    """[(对手卡组, 场数, 占比%)]，按场数降序（相同时保持首次出现顺序）"""
+    total = sum(op_decks.values())
+    ranked = sorted(op_decks.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(deck, count, count / total * 100 if total else 0) for deck, count in ranked]
+
+
+def sketch_share(sketch, k=None):
+    """[(对手卡组, 场数上界, 误差, 占比%)]，按草图的计数上界降序"""
+    total = sketch.total
+    return [(deck, count, error, count / total * 100 if total else 0)
+            for deck, count, error in sketch.top(k)]
+
+
+def pooled_fairness(groups):
+    """{名称: SeasonSummary} 各组与合并后的硬币公平性：[(名称, 场数, 硬币胜场, 硬币胜率%, 卡方p, 二项p)]"""
+    from utils.fairness import fairness_batch
+
+    rows = list(groups.items())
+    rows.append(('合计', tree_merge(summary.closed() for _, summary in rows)))
+    coin_wins = [summary.counters['coin_wins'] for _, summary in rows]
+    totals = [summary.total_matches for _, summary in rows]
+    tests = fairness_batch(coin_wins, totals)
+    return [
+        (name, n, k, k / n * 100 if n else 0, chi2_p, binom_p)
+        for (name, _), k, n, chi2_p, binom_p in zip(
+            rows, coin_wins, totals, tests['chi2_p'].tolist(), tests['binom_p'].tolist())
+    ]
@@ -0,0 +1,233 @@
+"""可选的阶段计时与剖析（默认关闭）
+
+通过环境变量开启，并行流水线的工作进程自动继承：
+    MDAT_TRACE=trace.ndjson        每个阶段结束时追加一行 json 记录（多进程共用一个文件）
+    MDAT_PROFILE_STAGE=analyze     对该阶段启用剖析，结果保存在追踪文件旁
+    MDAT_PROFILER=cprofile         剖析器：cprofile / pyinstrument（可选依赖）
+
+每条记录包含阶段名、赛季、墙钟/CPU 时间、处理行数与行/秒、读写字节数
+（/proc/self/io 的 rchar/wchar）与进程内存峰值（ru_maxrss）。
+未开启时 span() 只检查一次环境变量。
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_ENV = 'MDAT_TRACE'
+PROFILE_STAGE_ENV = 'MDAT_PROFILE_STAGE'
+PROFILER_ENV = 'MDAT_PROFILER'
+PROFILERS = ('cprofile', 'pyinstrument')
+
+_local = threading.local()
+
+
+class Span:
+    """一个计时区间；rows 由被测代码通过 add_rows() 累加"""
+
+    def __init__(self, name, season=None, parent=None, fields=None):
+        self.name = name
+        self.season = season
+        self.parent = parent
+        self.fields = fields or {}
+        self.rows = 0
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def enabled():
+    return bool(os.environ.get(TRACE_ENV) or os.environ.get(PROFILE_STAGE_ENV))
+
+
+def add_rows(count):
+    """把处理的行数计入当前最内层的区间（未开启时无操作）"""
+    stack = _stack()
+    if stack:
+        stack[-1].rows += count
+
+
+def io_counters():
+    """本进程累计读写字节数；非 Linux 平台返回 (None, None)"""
+    try:
+        with open('/proc/self/io', 'rb') as f:
+            counters = dict(line.split(b':') for line in f.read().splitlines())
+        return int(counters[b'rchar']), int(counters[b'wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2 ** 20 if os.uname().sysname == 'Darwin' else 2 ** 10), 1)
+
+
+def _delta(after, before):
+    return None if after is None or before is None else after - before
+
+
+def _write_record(trace, record):
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+    # O_APPEND 单次写入一整行，多进程同时追加不会交错
+    fd = os.open(trace, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _profile_path(name, season, suffix):
+    trace = os.environ.get(TRACE_ENV)
+    directory = Path(trace).parent if trace else Path('.')
+    season = '' if season is None else f"-s{season}"
+    return directory / f"profile-{name}{season}-{os.getpid()}{suffix}"
+
+
+@contextmanager
+def _profiled(name, season):
+    if os.environ.get(PROFILER_ENV, 'cprofile') == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError("pyinstrument 剖析需要安装 pyinstrument") from e
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            _profile_path(name, season, '.html').write_text(
+                profiler.output_html(), encoding='utf-8')
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(_profile_path(name, season, '.prof'))
+
+
+@contextmanager
+def span(name, season=None, **fields):
+    """记录一个阶段（可嵌套）；fields 为附加字段，如 chart='streak.png'"""
+    if not enabled():
+        yield None
+        return
+
+    stack = _stack()
+    current = Span(name, season, stack[-1].name if stack else None, fields)
+    if season is None and stack:
+        current.season = stack[-1].season
+    stack.append(current)
+
+    read_before, written_before = io_counters()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    started_at = time.time()
+    try:
+        if name == os.environ.get(PROFILE_STAGE_ENV):
+            with _profiled(name, current.season):
+                yield current
+        else:
+            yield current
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        read_after, written_after = io_counters()
+        stack.pop()
+
+        trace = os.environ.get(TRACE_ENV)
+        if trace:
+            _write_record(trace, {
+                'name': name,
+                'season': current.season,
+                'parent': current.parent,
+                'pid': os.getpid(),
+                'start': round(started_at, 6),
+                'wall': round(wall, 6),
+                'cpu': round(cpu, 6),
+                'rows': current.rows,
+                'rows_per_second': round(current.rows / wall) if current.rows and wall > 0 else None,
+                'bytes_read': _delta(read_after, read_before),
+                'bytes_written': _delta(written_after, written_before),
+                'peak_rss_mb': peak_rss_mb(),
+                **current.fields,
+            })
+
+
+def load_trace(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """按阶段汇总：[(阶段, 次数, 墙钟s, CPU s, 行数, 行/秒, 读MB, 写MB, 峰值RSS MB)]"""
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record['name'], []).append(record)
+
+    def total(items, key):
+        values = [item[key] for item in items if item.get(key) is not None]
+        return sum(values) if values else None
+
+    rows = []
+    for name, items in grouped.items():
+        wall = total(items, 'wall')
+        processed = total(items, 'rows') or 0
+        read, written = total(items, 'bytes_read'), total(items, 'bytes_written')
+        peak = [item['peak_rss_mb'] for item in items if item.get('peak_rss_mb') is not None]
+        rows.append((
+            name, len(items), round(wall, 3), round(total(items, 'cpu'), 3),
+            processed, round(processed / wall) if processed and wall else None,
+            None if read is None else round(read / 2 ** 20, 2),
+            None if written is None else round(written / 2 ** 20, 2),
+            max(peak) if peak else None,
+        ))
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+SUMMARY_HEADERS = ['阶段', '次数', '墙钟s', 'CPU s', '行数', '行/秒', '读MB', '写MB', '峰值RSS MB']
+
+
+def add_arguments(parser):
+    """给脚本的命令行加上剖析参数"""
+    group = parser.add_argument_group('性能剖析')
+    group.add_argument('--trace', help="记录各阶段耗时到该文件（NDJSON），结束时打印汇总表")
+    group.add_argument('--profile-stage', help="对该阶段启用剖析（如 analyze、read_sheet、chart）")
+    group.add_argument('--profiler', choices=PROFILERS, default='cprofile')
+
+
+def configure(args):
+    """按命令行参数开启剖析（写入环境变量，子进程继承）；清空旧的追踪文件"""
+    if getattr(args, 'trace', None):
+        trace = Path(args.trace).expanduser().resolve()
+        trace.parent.mkdir(parents=True, exist_ok=True)
+        trace.write_text('', encoding='utf-8')
+        os.environ[TRACE_ENV] = str(trace)
+    if getattr(args, 'profile_stage', None):
+        os.environ[PROFILE_STAGE_ENV] = args.profile_stage
+        os.environ[PROFILER_ENV] = args.profiler
+
+
+def report():
+    """运行结束时打印追踪文件的汇总表（未开启追踪时无操作）"""
+    trace = os.environ.get(TRACE_ENV)
+    if not trace or not os.path.exists(trace):
+        return
+    from utils.textTable import grid_table
+
+    print(grid_table(summarize(load_trace(trace)), headers=SUMMARY_HEADERS))
+    print(f"追踪文件: {trace}")
@@ -0,0 +1,238 @@
+import hashlib
+import json
+from pathlib import Path
+
+from calcStats import (
+    COUNTER_KEYS,
+    build_results,
+    deck_entry,
+    fairness_columns,
+    interval_entry,
+    middle_entry,
+)
+from utils.matchupMatrix import MatchupMatrix, deck_key
+from utils.streakEngine import STREAK_SERIES, RunLengthCounter
+
+STATE_VERSION = 5
+
+
+def new_counters():
+    return {key: 0 for key in COUNTER_KEYS}
+
+
+def count_match(counters, match):
+    """把一场对局计入计数器"""
+    win = match['match_res'] == 'win'
+    coin = match['coin_res'] == 'win'
+    first = match['first_move'] == 'first'
+
+    counters['total_matches'] += 1
+    counters['wins'] += win
+    counters['coin_wins'] += coin
+    counters['first_moves'] += first
+    counters['first_move_wins'] += first and win
+    counters['second_move_wins'] += (not first) and win
+    counters['win_coin_wins'] += coin and win
+    counters['lose_coin_wins'] += (not coin) and win
+
+
+def array_end(raw):
+    """json 数组文本中最后一个元素结束处的字节位置（去掉结尾的 ] 与空白）
+
+    追加对局只改写该位置之后的内容，之前的字节（已处理的前缀）保持不变。
+    """
+    end = len(raw)
+    while end and raw[end - 1] in b' \t\r\n':
+        end -= 1
+    if not end or raw[end - 1] != ord(']'):
+        raise ValueError("对局记录不是 json 数组")
+    end -= 1
+    while end and raw[end - 1] in b' \t\r\n':
+        end -= 1
+    return end
+
+
+class StatsAccumulator:
+    """赛季统计累加器：保存计数器/连续序列/卡组统计，只折叠新增对局
+
+    已知赛季总场数时（expected_total），逐场 add() 到中期位置即记录中期快照，
+    可用于单遍流式统计；否则由 extend() 根据完整记录推进中期快照。
+    """
+
+    def __init__(self, state=None, expected_total=None):
+        self.expected_total = expected_total
+        state = state or {}
+        self.counters = state.get('counters', new_counters())
+        self.middle = state.get('middle', new_counters())
+        self.middle_stats = state.get('middle_stats', [])
+        self.streak = state.get('streak', {'type': None, 'length': 0})
+        self.coin_runs = state.get('coin_runs', 0)
+        self.streak_list = state.get('streak_list', {'win': [], 'lose': []})
+        self.run_counters = {
+            name: RunLengthCounter(labels, state.get('streaks', {}).get(name))
+            for name, (_, *labels) in STREAK_SERIES.items()
+        }
+        self.my_decks = state.get('my_decks', {})
+        self.deck_counts = state.get('deck_counts', {})
+        self.matchups = (MatchupMatrix.from_stats(state['matchups'])
+                         if 'matchups' in state else MatchupMatrix())
+        self.interval_stats = state.get('interval_stats', [])
+        # 已处理前缀在 json 文本中的字节长度及其 sha1
+        self.prefix_end = state.get('prefix_end', 0)
+        self.digest = state.get('digest', hashlib.sha1().hexdigest())
+
+    @property
+    def total_matches(self):
+        return self.counters['total_matches']
+
+    def add(self, match):
+        """折叠一场新对局"""
+        count_match(self.counters, match)
+
+        win = match['match_res'] == 'win'
+        coin = match['coin_res'] == 'win'
+
+        # [场数, 胜场, 硬币胜场, 硬币游程数, 上一场硬币结果]
+        deck = self.my_decks.setdefault(deck_key(match['my_deck']),
+                                        [0, 0, 0, 0, None])
+        deck[0] += 1
+        deck[1] += win
+        deck[2] += coin
+        deck[3] += match['coin_res'] != deck[4]
+        deck[4] = match['coin_res']
+
+        op_deck = deck_key(match['op_deck'])
+        self.deck_counts[op_deck] = self.deck_counts.get(op_deck, 0) + 1
+        self.matchups.add(match['my_deck'], match['op_deck'],
+                          match['first_move'] == 'first', coin, win)
+
+        # 连续硬币统计
+        current_coin = match['coin_res']
+        if current_coin == self.streak['type']:
+            self.streak['length'] += 1
+        else:
+            self._close_streak()
+            self.streak = {'type': current_coin, 'length': 1}
+            self.coin_runs += 1
+
+        for name, (field, *_) in STREAK_SERIES.items():
+            self.run_counters[name].add(match[field])
+
+        # 记录每20场统计
+        if self.total_matches % 20 == 0:
+            fairness, = fairness_columns([self.counters['coin_wins']],
+                                         [self.total_matches], [self.coin_runs])
+            self.interval_stats.append(interval_entry(self.counters, fairness))
+
+        # 赛季中期统计（已知总场数时）
+        if (self.expected_total is not None
+                and self.total_matches == self.expected_total // 2):
+            self.middle = dict(self.counters)
+            self.middle_stats = [middle_entry(self.middle)]
+
+    def _close_streak(self):
+        if self.streak['length'] >= 3:
+            self.streak_list[self.streak['type']].append(self.streak['length'])
+
+    def _advance_middle(self, matches):
+        """中期位置 total_matches // 2 变化时才向前推进中期快照"""
+        target = self.total_matches // 2
+        if target == self.middle['total_matches']:
+            return
+        for match in matches[self.middle['total_matches']:target]:
+            count_match(self.middle, match)
+        self.middle_stats = [middle_entry(self.middle)] if target > 0 else []
+
+    def extend(self, matches, raw=None):
+        """matches 为赛季完整记录；已处理前缀被修改时从头重算
+
+        raw 为 matches 所在 json 文件的原始字节，用于判断前缀是否被修改：只对前缀字节求一次
+        sha1 并接着计入新增部分，不重新序列化记录；未给出时按 json.dumps(matches) 的文本判断。
+        """
+        if raw is None:
+            raw = json.dumps(matches, ensure_ascii=False).encode('utf-8')
+        view = memoryview(raw)
+        end = array_end(raw)
+        processed = self.total_matches
+        digest = hashlib.sha1(view[:self.prefix_end])
+        if (len(matches) < processed or self.prefix_end > end
+                or digest.hexdigest() != self.digest):
+            self.__init__(expected_total=self.expected_total)
+            processed = 0
+            digest = hashlib.sha1()
+
+        new_matches = matches[processed:]
+        for match in new_matches:
+            self.add(match)
+        self._advance_middle(matches)
+        digest.update(view[self.prefix_end:end])
+        self.prefix_end = end
+        self.digest = digest.hexdigest()
+        return len(new_matches)
+
+    def to_stats(self):
+        """生成与 analyze_match_data 相同结构的结果"""
+        if self.total_matches == 0:
+            raise ValueError("对局数据为空")
+        if self.expected_total not in (None, self.total_matches):
+            raise ValueError(
+                f"对局数 {self.total_matches} 与给定总数 {self.expected_total} 不一致")
+
+        streak_list = {key: list(value) for key, value in self.streak_list.items()}
+        if self.streak['length'] >= 3:
+            streak_list[self.streak['type']].append(self.streak['length'])
+
+        deck_fairness = fairness_columns(
+            [values[2] for values in self.my_decks.values()],
+            [values[0] for values in self.my_decks.values()],
+            [values[3] for values in self.my_decks.values()]
+        )
+        my_deck_results = {
+            deck: deck_entry(*values[:3], fairness)
+            for (deck, values), fairness in zip(self.my_decks.items(), deck_fairness)
+        }
+        return build_results(
+            self.counters,
+            self.deck_counts,
+            my_deck_results,
+            streak_list,
+            # rate_intervals 会就地加入 _ci 字段，不能写进累加器状态
+            [dict(entry) for entry in self.middle_stats],
+            self.interval_stats,
+            self.matchups.to_stats(),
+            {name: counter.distribution() for name, counter in self.run_counters.items()}
+        )
+
+    def state(self):
+        return {
+            'version': STATE_VERSION,
+            'prefix_end': self.prefix_end,
+            'digest': self.digest,
+            'counters': self.counters,
+            'middle': self.middle,
+            'middle_stats': self.middle_stats,
+            'streak': self.streak,
+            'coin_runs': self.coin_runs,
+            'streak_list': self.streak_list,
+            'streaks': {name: counter.state() for name, counter in self.run_counters.items()},
+            'my_decks': self.my_decks,
+            'deck_counts': self.deck_counts,
+            'matchups': self.matchups.to_stats(),
+            'interval_stats': self.interval_stats,
+        }
+
+    @classmethod
+    def load(cls, state_path):
+        """读取累加器状态，不存在或版本不符时返回空累加器"""
+        state_path = Path(state_path)
+        if not state_path.exists():
+            return cls()
+        with state_path.open('r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            return cls()
+        return cls(state)
+
+    def save(self, state_path, encoder=None):
+        with Path(state_path).open('w', encoding='utf-8') as f:
+            json.dump(self.state(), f, ensure_ascii=False, cls=encoder)
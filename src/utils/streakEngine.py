@@ -0,0 +1,238 @@
+"""连续序列（游程）引擎：布尔序列的游程长度分布与公平硬币下的蒙特卡洛期望
+
+统计结果中每个序列保存完整的游程长度分布（下标 0 为长度 1）：
+    'streaks': {'coin': {'win': [长度1的游程数, 长度2的游程数, ...], 'lose': [...]},
+                'match': {...}, 'first_move': {'first': [...], 'second': [...]}}
+StreakSimulation 以二维数组一次模拟一批赛季（每行一个赛季），按行求游程数、
+各方向最长连续与各长度的游程数，结果累加为直方图（下标为取值），分批模拟直接相加，
+用于给出观测值在公平硬币下的期望区间与单侧 p 值。
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# 序列名 -> (对局字段, 为真时的取值, 为假时的取值)
+STREAK_SERIES = {
+    'coin': ('coin_res', 'win', 'lose'),
+    'match': ('match_res', 'win', 'lose'),
+    'first_move': ('first_move', 'first', 'second'),
+}
+
+# 列式数据中对应的布尔列
+SERIES_COLUMNS = {'coin': 'coin', 'match': 'win', 'first_move': 'first'}
+
+# 模拟分布记录的最大游程长度（更长的游程只计入最长连续与游程数）
+MAX_LENGTH = 32
+# 每批模拟的硬币数，控制内存占用
+BATCH_FLIPS = 1 << 22
+# 图表默认的模拟赛季数与总硬币数上限（超长赛季自动减少模拟次数）
+DEFAULT_SIMULATIONS = 1_000_000
+SIMULATION_BUDGET = 2 * 10 ** 8
+
+
+def run_lengths(values):
+    """游程编码：返回 (每个游程的取值, 长度)"""
+    values = np.asarray(values, dtype=bool)
+    if len(values) == 0:
+        return values, np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    return values[starts], np.diff(np.append(starts, len(values)))
+
+
+def length_distribution(lengths):
+    """[长度1的游程数, 长度2的游程数, ...]，到最长游程为止"""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    return np.bincount(lengths)[1:].tolist() if len(lengths) else []
+
+
+def streak_distribution(values, labels=('win', 'lose')):
+    """布尔序列两个方向的游程长度分布"""
+    types, lengths = run_lengths(values)
+    true_label, false_label = labels
+    return {
+        true_label: length_distribution(lengths[types]),
+        false_label: length_distribution(lengths[~types]),
+    }
+
+
+def streak_stats(columns):
+    """列式数据（coin / win / first 布尔列）各序列的游程长度分布"""
+    return {
+        name: streak_distribution(columns[SERIES_COLUMNS[name]], labels)
+        for name, (_, *labels) in STREAK_SERIES.items()
+    }
+
+
+def distribution_from_lengths(lengths):
+    """由游程长度列表（如旧版 streak_list）得到分布"""
+    return length_distribution(lengths)
+
+
+def summarize(distribution):
+    """{方向: (游程数, 最长连续)}"""
+    return {label: (sum(counts), len(counts)) for label, counts in distribution.items()}
+
+
+class RunLengthCounter:
+    """逐个值累加的游程长度分布（参考实现与流式/增量统计用）"""
+
+    def __init__(self, labels, state=None):
+        self.labels = tuple(labels)
+        state = state or {}
+        self.current = state.get('current')
+        self.length = state.get('length', 0)
+        self.counts = state.get('counts', {label: [] for label in self.labels})
+
+    def add(self, value):
+        # 与列式引擎一致：不等于第一个取值的都计为第二个取值
+        value = self.labels[0] if value == self.labels[0] else self.labels[1]
+        if value == self.current:
+            self.length += 1
+            return
+        self._close(self.counts)
+        self.current = value
+        self.length = 1
+
+    def _close(self, counts):
+        if not self.length:
+            return
+        counts = counts[self.current]
+        if len(counts) < self.length:
+            counts.extend([0] * (self.length - len(counts)))
+        counts[self.length - 1] += 1
+
+    def distribution(self):
+        """包含当前未结束游程的分布（不改变累加状态）"""
+        counts = {label: list(values) for label, values in self.counts.items()}
+        self._close(counts)
+        return counts
+
+    def state(self):
+        return {'current': self.current, 'length': self.length, 'counts': self.counts}
+
+
+def _fair_flips(rng, size):
+    """公平硬币：每个随机字节拆成 8 次抛掷"""
+    return np.unpackbits(rng.integers(0, 256, size=-(-size // 8), dtype=np.uint8))[:size]
+
+
+def histogram_quantile(hist, q):
+    """直方图（下标为取值，可为二维按行）的 q 分位数"""
+    cdf = np.cumsum(hist, axis=-1)
+    return (cdf < q * cdf[..., -1:]).sum(axis=-1)
+
+
+def tail_p(hist, observed, upper=True):
+    """单侧概率 P(X >= observed)（upper）或 P(X <= observed)"""
+    hist = np.asarray(hist)
+    total = hist.sum()
+    if total == 0:
+        return float('nan')
+    observed = min(max(int(observed), 0), len(hist) - 1)
+    tail = hist[observed:] if upper else hist[:observed + 1]
+    return float(tail.sum() / total)
+
+
+class StreakSimulation:
+    """matches 场、每场为真概率 p 的赛季模拟分布（各量为直方图）
+
+    runs[k]                    游程数为 k 的赛季数
+    max_streak[方向][k]        该方向最长连续为 k 的赛季数
+    length_counts[方向][l, k]  长度 l+1 的游程恰有 k 个的赛季数
+    """
+
+    def __init__(self, matches, p=0.5, labels=('win', 'lose'), max_length=MAX_LENGTH):
+        self.matches = int(matches)
+        self.p = p
+        self.labels = tuple(labels)
+        self.max_length = max(1, min(max_length, self.matches))
+        self.simulations = 0
+        size = self.matches + 1
+        self.runs = np.zeros(size, dtype=np.int64)
+        self.max_streak = {label: np.zeros(size, dtype=np.int64) for label in self.labels}
+        self.length_counts = {
+            label: np.zeros((self.max_length, size), dtype=np.int64) for label in self.labels
+        }
+
+    def simulate(self, simulations, seed=None):
+        if self.matches == 0:
+            return self
+        rng = np.random.default_rng(seed)
+        rows_per_batch = max(1, BATCH_FLIPS // self.matches)
+        remaining = int(simulations)
+        while remaining > 0:
+            rows = min(rows_per_batch, remaining)
+            size = rows * self.matches
+            flips = _fair_flips(rng, size) if self.p == 0.5 else rng.random(size) < self.p
+            self._add_batch(flips.astype(bool, copy=False).reshape(rows, self.matches))
+            remaining -= rows
+        return self
+
+    def _add_batch(self, flips):
+        rows, n = flips.shape
+        flat = flips.ravel()
+        # 每行开头强制断开，整批展平后一次游程编码
+        breaks = np.empty(flat.size, dtype=bool)
+        breaks[0] = True
+        np.not_equal(flat[1:], flat[:-1], out=breaks[1:])
+        breaks[::n] = True
+        starts = np.flatnonzero(breaks)
+        lengths = np.diff(starts, append=flat.size)
+        types = flat[starts]
+        row = starts // n
+        row_first = np.searchsorted(row, np.arange(rows))
+
+        self.runs += np.bincount(np.diff(row_first, append=len(starts)), minlength=n + 1)
+        # 每个赛季每个方向各长度的游程数（超过 max_length 的计入溢出格后丢弃）
+        width = self.max_length + 1
+        side = (~types).view(np.int8)
+        code = (row * 2 + side) * width + np.minimum(lengths, width) - 1
+        per_row = np.bincount(code, minlength=rows * 2 * width).reshape(rows, 2, width)
+
+        size = n + 1
+        offsets = np.arange(self.max_length) * size
+        for i, (label, mask) in enumerate(zip(self.labels, (types, ~types))):
+            longest = np.maximum.reduceat(np.where(mask, lengths, 0), row_first)
+            self.max_streak[label] += np.bincount(longest, minlength=size)
+            # 每个 (长度, 游程数) 组合出现的赛季数
+            cell = (offsets + per_row[:, i, :self.max_length]).ravel()
+            self.length_counts[label] += np.bincount(
+                cell, minlength=self.max_length * size).reshape(self.max_length, size)
+        self.simulations += rows
+
+    def expected_counts(self, label, low=0.05, high=0.95):
+        """各长度游程数的 (均值, 下分位, 上分位) 数组，下标 0 为长度 1"""
+        hist = self.length_counts[label]
+        total = max(self.simulations, 1)
+        mean = (hist * np.arange(hist.shape[1])).sum(axis=1) / total
+        return mean, histogram_quantile(hist, low), histogram_quantile(hist, high)
+
+    def interval(self, hist, low=0.05, high=0.95):
+        return int(histogram_quantile(hist, low)), int(histogram_quantile(hist, high))
+
+    def compare(self, distribution, low=0.05, high=0.95):
+        """观测分布与模拟分布对比：
+        {'runs': (观测, 下分位, 上分位, P(游程数<=观测)),
+         方向: (最长连续, 下分位, 上分位, P(最长连续>=观测))}
+        """
+        runs = sum(sum(counts) for counts in distribution.values())
+        result = {'runs': (runs, *self.interval(self.runs, low, high),
+                           tail_p(self.runs, runs, upper=False))}
+        for label in self.labels:
+            longest = len(distribution.get(label, []))
+            result[label] = (longest, *self.interval(self.max_streak[label], low, high),
+                             tail_p(self.max_streak[label], longest))
+        return result
+
+
+def simulation_count(matches, simulations=DEFAULT_SIMULATIONS, budget=SIMULATION_BUDGET):
+    """模拟赛季数：总硬币数不超过 budget（至少 1000 次）"""
+    return int(min(simulations, max(1000, budget // max(matches, 1))))
+
+
+@lru_cache(maxsize=16)
+def fair_coin_simulation(matches, simulations=DEFAULT_SIMULATIONS, seed=0,
+                         budget=SIMULATION_BUDGET):
+    """公平硬币下 matches 场赛季的模拟分布（同一进程内按场数缓存）"""
+    return StreakSimulation(matches).simulate(
+        simulation_count(matches, simulations, budget), seed)
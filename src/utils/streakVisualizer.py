@@ -1,49 +1,150 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
+from matplotlib.patches import Patch
+
+from utils.chartTemplate import ChartTemplate, bar_pool, rescale, update_bars
+from utils.stageProfiler import span
+from utils.streakEngine import distribution_from_lengths, fair_coin_simulation
+
+# 图表用的模拟赛季数与总硬币数上限：每次渲染都要模拟（赛季场数随对局增加而变化，
+# 按场数缓存很少命中），1e4 次时各长度的 5%/95% 分位与 1e5 次相差不超过 2，
+# 单张图的模拟在 1e4 场以内都约 0.2 秒
+CHART_SIMULATIONS = 10_000
+CHART_BUDGET = 10 ** 7
+
+# (方向, 颜色, 标题)
+PANELS = (
+    ('win', '#a9dc76', '硬币连续胜'),
+    ('lose', '#ff6188', '硬币连续负'),
+)
+
+
+def coin_distribution(stats):
+    """硬币游程长度分布；旧版统计结果只有长度>=3的 streak_list"""
+    if stats.get('streaks'):
+        return stats['streaks']['coin']
+    streak_list = stats['coin_streaks']['streak_list']
+    return {label: distribution_from_lengths(streak_list[label]) for label in ('win', 'lose')}
+
+
+def streak_panels(distribution, total_matches, simulations=CHART_SIMULATIONS):
+    """每个方向的 (长度, 观测游程数, 期望均值, 5%分位, 95%分位, 标题后缀) 与整体游程标题"""
+    simulation = fair_coin_simulation(total_matches, simulations, budget=CHART_BUDGET)
+    summary = simulation.compare(distribution)
+    panels = []
+    for label, _, _ in PANELS:
+        observed = np.asarray(distribution.get(label, []), dtype=float)
+        mean, low, high = simulation.expected_counts(label)
+        # 长度范围覆盖观测与期望区间中出现的游程
+        size = max(len(observed), int(np.flatnonzero(high).max(initial=-1)) + 1, 1)
+
+        def fit(values):
+            values = np.asarray(values, dtype=float)[:size]
+            return np.pad(values, (0, size - len(values)))
+
+        longest, lo, hi, p_value = summary[label]
+        panels.append((
+            np.arange(1, size + 1), fit(observed), fit(mean), fit(low), fit(high),
+            f"最长 {longest}（期望 {lo}–{hi}，p={p_value:.3f}）",
+        ))
+    runs, lo, hi, _ = summary['runs']
+    return panels, f"游程 {runs}（公平硬币期望 {lo}–{hi}）"
+
 
 class StreakVisualizer:
-    def __init__(self, win_streaks, lose_streaks, season_num, figsize=(12, 6)):
+    """硬币游程长度分布：观测游程数（柱）与公平硬币模拟的期望均值与 90% 区间"""
+    # 图表读取的统计字段（点分路径）
+    STATS_KEYS = ('streaks.coin', 'coin_streaks.streak_list', 'total_matches')
+
+    def __init__(self, distribution, total_matches, season_num,
+                 simulations=CHART_SIMULATIONS, figsize=(12, 6)):
         rcParams['font.sans-serif'] = ['LXGW WenKai']
 
-        self.win_streaks = win_streaks
-        self.lose_streaks = lose_streaks
+        self.distribution = distribution
+        self.total_matches = total_matches
         self.season_num = season_num
+        self.panels, self.runs_title = streak_panels(distribution, total_matches, simulations)
 
         self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=figsize)
         self._configure_figure()
         self._plot_streaks()
 
     def _configure_figure(self):
-        self.fig.suptitle(f's{self.season_num}赛季硬币连续情况', fontsize=16)
-        plt.tight_layout()
+        self.fig.suptitle(f's{self.season_num}赛季硬币连续情况  {self.runs_title}', fontsize=16)
 
     def _plot_streaks(self):
-        self._plot_single_streak(
-            self.ax1,
-            self.win_streaks,
-            '#a9dc76',
-            '硬币连续胜',
-            '连胜长度'
-        )
-
-        self._plot_single_streak(
-            self.ax2,
-            self.lose_streaks,
-            '#ff6188',
-            '硬币连续负',  # 修正原代码中的标题错误
-            '连负长度'
-        )
-
-    def _plot_single_streak(self, ax, data, color, title, ylabel):
-        ax.bar(range(1, len(data)+1), data, color=color, alpha=0.7)
-        ax.set_title(title)
-        ax.set_ylabel(ylabel)
-        ax.set_xticks(range(1, len(data)+1))  # 修正原代码的刻度偏移问题
+        for ax, (_, color, title), panel in zip((self.ax1, self.ax2), PANELS, self.panels):
+            self._plot_single_streak(ax, panel, color, title)
+        plt.tight_layout()
+
+    def _plot_single_streak(self, ax, panel, color, title):
+        lengths, observed, mean, low, high, summary = panel
+        ax.bar(lengths, observed, color=color, alpha=0.7, label='观测')
+        ax.fill_between(lengths, low, high, step='mid', color='gray', alpha=0.25,
+                        label='公平硬币 90% 区间')
+        ax.plot(lengths, mean, color='#333333', linestyle='--', marker='o',
+                markersize=3, label='期望')
+        ax.set_title(f"{title}  {summary}")
+        ax.set_xlabel('连续长度')
+        ax.set_ylabel('次数')
+        ax.set_xticks(lengths)
         ax.grid(axis='y', linestyle='--', alpha=0.7)
+        ax.legend()
 
     def show(self):
         plt.show()
 
     def save(self, filename):
-        self.fig.savefig(filename)
+        with span('savefig'):
+            self.fig.savefig(filename)
         plt.close()
+
+
+class StreakTemplate(ChartTemplate):
+    """硬币连续情况图模板：柱子按最长游程长度预先创建，之后只改高度；期望区间每次重画"""
+    figsize = (12, 6)
+    save_kwargs = {}
+
+    def _panels(self, stats):
+        return streak_panels(coin_distribution(stats), stats['total_matches'])
+
+    def fits(self, stats):
+        panels, _ = self._panels(stats)
+        return max(len(panel[0]) for panel in panels) <= self.capacity
+
+    def build(self, stats, season_num):
+        panels, _ = self._panels(stats)
+        self.capacity = max(len(panel[0]) for panel in panels)
+        self.axes = self.fig.subplots(1, 2)
+        self.title = self.fig.suptitle('', fontsize=16)
+
+        self.bars, self.means, self.bands, self.titles = [], [], [None, None], []
+        for ax, (_, color, _) in zip(self.axes, PANELS):
+            self.bars.append(bar_pool(ax, self.capacity, color=color, alpha=0.7))
+            self.means.append(ax.plot([], [], color='#333333', linestyle='--', marker='o',
+                                      markersize=3)[0])
+            self.titles.append(ax.set_title(''))
+            ax.set_xlabel('连续长度')
+            ax.set_ylabel('次数')
+            ax.grid(axis='y', linestyle='--', alpha=0.7)
+            ax.legend(
+                [self.bars[-1][0], Patch(color='gray', alpha=0.25), self.means[-1]],
+                ['观测', '公平硬币 90% 区间', '期望'],
+            )
+
+    def update(self, stats, season_num):
+        panels, runs_title = self._panels(stats)
+        self.title.set_text(f's{season_num}赛季硬币连续情况  {runs_title}')
+        for i, (ax, (_, _, title), panel) in enumerate(zip(self.axes, PANELS, panels)):
+            lengths, observed, mean, low, high, summary = panel
+            update_bars(self.bars[i], lengths, observed)
+            self.means[i].set_data(lengths, mean)
+            # 区间多边形的顶点数随长度范围变化，直接替换
+            if self.bands[i] is not None:
+                self.bands[i].remove()
+            self.bands[i] = ax.fill_between(lengths, low, high, step='mid',
+                                            color='gray', alpha=0.25)
+            self.titles[i].set_text(f"{title}  {summary}")
+            ax.set_xticks(lengths)
+            rescale(ax)
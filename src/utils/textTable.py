@@ -0,0 +1,105 @@
+"""轻量的文本表格，输出与 tabulate(tablefmt='grid') 相同，只依赖标准库
+
+用于只打印文字的快速命令，避免导入 tabulate（其版本检测会加载 importlib.metadata）。
+与 tabulate 一致的规则：整列为数字（含数字字符串）时按 floatfmt 格式化并按小数点对齐、
+右对齐，其余列左对齐；有表头时每列至少比表头宽 2；宽字符（中文）按两列计算宽度。
+"""
+import numbers
+import unicodedata
+
+
+def display_width(text):
+    """终端显示宽度：全角/宽字符（中文）占两列"""
+    return sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in text)
+
+
+# 列类型由窄到宽；整列取所有非空值中最宽的类型（与 tabulate 相同）
+_TYPE_ORDER = (bool, int, float, str)
+
+
+def _value_type(value):
+    """单个值的类型：None/空字符串为 None，数字字符串按其数值类型"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, numbers.Integral):
+        return int
+    if isinstance(value, numbers.Real):
+        return float
+    if isinstance(value, str):
+        for kind in (int, float):
+            try:
+                kind(value)
+            except ValueError:
+                continue
+            return kind
+    return str
+
+
+def _column_type(values):
+    types = [_value_type(value) for value in values]
+    return max((t for t in types if t is not None), key=_TYPE_ORDER.index, default=bool)
+
+
+def _format(value, kind, floatfmt):
+    if value is None:
+        return ''
+    if kind is float and value != '':
+        return format(float(value), floatfmt)
+    return str(value)
+
+
+def _after_point(text):
+    """小数点（或指数符号）后的字符数，整数与非数字为 -1，用于按小数点对齐"""
+    kind = _value_type(text)
+    if kind is not float:
+        return -1
+    pos = text.rfind('.')
+    if pos < 0:
+        pos = text.lower().rfind('e')
+    return len(text) - pos - 1 if pos >= 0 else -1
+
+
+def grid_table(rows, headers, floatfmt='g'):
+    """rows 为行列表（或字典列表，此时 headers='keys' 取字典键）"""
+    rows = list(rows)
+    if headers == 'keys':
+        headers = list(rows[0]) if rows else []
+        rows = [[row.get(key) for key in headers] for row in rows]
+
+    kinds = [_column_type([row[i] for row in rows]) for i in range(len(headers))]
+    numeric = [kind in (int, float) for kind in kinds]
+    columns = [[_format(row[i], kind, floatfmt) for row in rows] for i, kind in enumerate(kinds)]
+    for i, column in enumerate(columns):
+        if numeric[i]:
+            points = [_after_point(text) for text in column]
+            width = max(points, default=-1)
+            columns[i] = [text + ' ' * (width - point) for text, point in zip(column, points)]
+    cells = [list(row) for row in zip(*columns)] if columns else [[] for _ in rows]
+    headers = [str(header) for header in headers]
+    widths = [
+        max([display_width(header) + 2] + [display_width(row[i]) for row in cells])
+        for i, header in enumerate(headers)
+    ]
+
+    def pad(text, width, right):
+        fill = ' ' * (width - display_width(text))
+        return fill + text if right else text + fill
+
+    def line(char):
+        return '+' + '+'.join(char * (width + 2) for width in widths) + '+'
+
+    def row_line(values):
+        return '| ' + ' | '.join(
+            pad(value, width, right)
+            for value, width, right in zip(values, widths, numeric)
+        ) + ' |'
+
+    lines = [line('-'), row_line(headers), line('=')]
+    for row in cells:
+        lines.append(row_line(row))
+        lines.append(line('-'))
+    if not cells:
+        lines.append(line('-'))
+    return '\n'.join(lines)
@@ -0,0 +1,179 @@
+"""胜率趋势引擎：滚动窗口 / 指数加权（EWMA）/ 累计
+
+每个赛季只缓存一个前缀和数组 prefix[(n+1) × 计数字段]（stats/sN_series.npz），
+任意窗口大小 N 的滚动统计都由 prefix[N:] - prefix[:-N] 直接得到，不需要重新扫描对局；
+EWMA 由前缀和差分还原的逐场计数做一阶递推滤波，同样是 O(n)。
+概率定义与 calcStats.rate_stats 相同，分母为 0 的位置为 nan（折线在此断开）。
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# 前缀和数组的列（与 calcStats.COUNTER_KEYS 去掉 total_matches 一致）
+FLAG_KEYS = (
+    'wins',
+    'coin_wins',
+    'first_moves',
+    'first_move_wins',
+    'second_move_wins',
+    'win_coin_wins',
+    'lose_coin_wins',
+)
+
+# 概率 -> (分子, 分母)；分母 None 为总场数，'-字段' 为总场数减该字段
+RATE_DEFINITIONS = {
+    'win_rate': ('wins', None),
+    'coin_win_rate': ('coin_wins', None),
+    'first_move_rate': ('first_moves', None),
+    'first_move_win_rate': ('first_move_wins', 'first_moves'),
+    'second_move_win_rate': ('second_move_wins', '-first_moves'),
+    'win_coin_win_rate': ('win_coin_wins', 'coin_wins'),
+    'lose_coin_win_rate': ('lose_coin_wins', '-coin_wins'),
+}
+
+SERIES_VERSION = 1
+
+
+def flag_matrix(coin, win, first):
+    """逐场计数字段矩阵 (n × len(FLAG_KEYS))"""
+    coin = np.asarray(coin, dtype=bool)
+    win = np.asarray(win, dtype=bool)
+    first = np.asarray(first, dtype=bool)
+    return np.column_stack([
+        win, coin, first, first & win, ~first & win, coin & win, ~coin & win,
+    ]).astype(np.int64)
+
+
+def rates_from_counts(counts, totals):
+    """counts 为 {字段: 数组}，totals 为场数数组；返回 {概率: 百分比数组}"""
+    totals = np.asarray(totals, dtype=float)
+    rates = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for key, (numerator, denominator) in RATE_DEFINITIONS.items():
+            if denominator is None:
+                base = totals
+            elif denominator.startswith('-'):
+                base = totals - counts[denominator[1:]]
+            else:
+                base = counts[denominator]
+            rates[key] = np.where(base > 0, counts[numerator] / base * 100, np.nan)
+    return rates
+
+
+def _trend(label, x, counts, totals):
+    """{'label', 'x', 各概率}，序列为 numpy 数组"""
+    trend = {'label': label, 'x': np.asarray(x)}
+    trend.update(rates_from_counts(counts, totals))
+    return trend
+
+
+class TrendSeries:
+    """一个赛季的前缀和：prefix[i] 为前 i 场的各计数字段之和"""
+
+    def __init__(self, prefix):
+        self.prefix = np.asarray(prefix, dtype=np.int64)
+
+    @classmethod
+    def from_flags(cls, coin, win, first):
+        flags = flag_matrix(coin, win, first)
+        prefix = np.zeros((len(flags) + 1, len(FLAG_KEYS)), dtype=np.int64)
+        np.cumsum(flags, axis=0, out=prefix[1:])
+        return cls(prefix)
+
+    @classmethod
+    def from_matches(cls, matches):
+        return cls.from_flags(
+            [match['coin_res'] == 'win' for match in matches],
+            [match['match_res'] == 'win' for match in matches],
+            [match['first_move'] == 'first' for match in matches],
+        )
+
+    @property
+    def total_matches(self):
+        return len(self.prefix) - 1
+
+    def _columns(self, array):
+        return {key: array[:, i] for i, key in enumerate(FLAG_KEYS)}
+
+    def cumulative(self):
+        """每场的累计概率（interval_stats 为其每20场的取样）"""
+        n = self.total_matches
+        return _trend('累计', np.arange(1, n + 1),
+                      self._columns(self.prefix[1:]), np.arange(1, n + 1))
+
+    def rolling(self, window):
+        """最近 window 场的概率；x 为窗口最后一场的序号"""
+        window = int(window)
+        if window <= 0:
+            raise ValueError(f"窗口大小需为正整数: {window}")
+        n = self.total_matches
+        if window > n:
+            return _trend(f'滚动{window}场', [], self._columns(self.prefix[:0]), [])
+        counts = self.prefix[window:] - self.prefix[:-window]
+        return _trend(f'滚动{window}场', np.arange(window, n + 1),
+                      self._columns(counts), np.full(len(counts), window))
+
+    def ewma(self, alpha):
+        """指数加权概率：分子分母各自做 EWMA 后相除（初始偏差在比值中抵消）"""
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha 需在 (0, 1] 内: {alpha}")
+        from scipy.signal import lfilter
+
+        n = self.total_matches
+        increments = np.diff(self.prefix, axis=0).astype(float)
+        increments = np.column_stack([increments, np.ones(n)])
+        weighted = lfilter([alpha], [1, alpha - 1], increments, axis=0)
+        return _trend(f'EWMA α={alpha:g}', np.arange(1, n + 1),
+                      self._columns(weighted[:, :-1]), weighted[:, -1])
+
+    def trend(self, spec):
+        """按描述取趋势：'cumulative' / 'rolling:50' / 'ewma:0.05'"""
+        kind, _, value = spec.partition(':')
+        if kind == 'cumulative':
+            return self.cumulative()
+        if kind == 'rolling':
+            return self.rolling(int(value))
+        if kind == 'ewma':
+            return self.ewma(float(value))
+        raise ValueError(f"未知趋势: {spec}（可用 cumulative / rolling:N / ewma:α）")
+
+    def save(self, path, source=None):
+        """保存前缀和；source 为对局文件时记录其大小与修改时间用于判断缓存是否过期"""
+        np.savez_compressed(path, prefix=self.prefix,
+                            meta=np.array(json.dumps(_source_meta(source))))
+
+    @classmethod
+    def load(cls, path, source=None):
+        """读取缓存；与 source 对局文件不一致或版本不符时返回 None"""
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                prefix = data['prefix']
+        except (OSError, KeyError, ValueError):
+            return None
+        if meta != _source_meta(source):
+            return None
+        return cls(prefix)
+
+
+def _source_meta(source):
+    meta = {'version': SERIES_VERSION}
+    if source is not None:
+        stat = os.stat(source)
+        meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    return meta
+
+
+def season_series(layout, season_num):
+    """赛季前缀和：优先读缓存，对局文件变化后才重新扫描并写回缓存"""
+    source = layout.json(season_num)
+    cache = layout.series(season_num)
+    series = TrendSeries.load(cache, source) if cache.exists() else None
+    if series is None:
+        with open(source, 'r', encoding='utf-8') as f:
+            series = TrendSeries.from_matches(json.load(f))
+        Path(cache).parent.mkdir(parents=True, exist_ok=True)
+        series.save(cache, source)
+    return series
@@ -0,0 +1,207 @@
+"""监视模式：常驻进程监视 xlsx 目录，赛季表格保存后只重新处理该赛季
+
+保存 sN.xlsx 后依次：读取表格 → 写回 json → 增量更新统计（累加器常驻内存）
+→ 只重绘依赖字段变化的图表（复用进程内图表模板）→ 写 Markdown 报告，
+并同步构建缓存清单，之后运行 pipeline / 各脚本不会重复处理。
+pandas / scipy / matplotlib 与图表模板在启动时加载并预热，之后每次更新不再付出导入开销。
+
+用法（在 src 目录下）：
+    python watchStats.py                       # 监视 ~/yugioh-data/data/xlsx
+    python watchStats.py --polling --debounce 1
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import stageProfiler
+from utils.buildCache import BuildCache
+from utils.dataLayout import DEFAULT_DATA_DIR, DataLayout
+from utils.fileWatcher import Debouncer, PollingWatcher, open_watcher
+from utils.stageProfiler import span
+
+XLSX_PATTERN = r"s(\d+)\.xlsx"
+
+
+class SeasonUpdater:
+    """常驻内存的单赛季更新器：每个赛季保留一个统计累加器
+
+    workers 大于 1 时图表交给常驻的渲染进程池并行重绘（各进程保留自己的图表模板），
+    否则在本进程内依次重绘。
+    """
+
+    def __init__(self, root=DEFAULT_DATA_DIR, reader='pandas', workers=1):
+        from drawStats import CHART_FILES
+
+        self.layout = DataLayout(root)
+        self.cache = BuildCache(self.layout.root)
+        self.reader = reader
+        self.chart_files = CHART_FILES
+        self.accumulators = {}
+        self.pool = None
+        if workers > 1:
+            from utils.renderPool import init_render_worker
+
+            self.pool = ProcessPoolExecutor(max_workers=workers,
+                                            initializer=init_render_worker)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def warm(self, season_num=None):
+        """加载绘图后端与统计模块；给定赛季时完整处理一次，预热图表模板"""
+        from utils.renderPool import init_render_worker
+
+        init_render_worker()
+        if season_num is not None and self.layout.xlsx(season_num).exists():
+            return self.update(season_num, force_charts=True)
+        return None
+
+    def _accumulator(self, season_num):
+        from calcStats import state_path_for
+        from utils.statsAccumulator import StatsAccumulator
+
+        if season_num not in self.accumulators:
+            state_file = state_path_for(self.layout.stats(season_num))
+            self.accumulators[season_num] = StatsAccumulator.load(state_file)
+        return self.accumulators[season_num]
+
+    def update(self, season_num, force_charts=False):
+        """处理一个赛季，返回 (各步骤耗时 [(步骤, 秒)], 重绘的图表)"""
+        from calcStats import CustomEncoder, save_stats, state_path_for
+        from drawStats import stale_charts
+        from generateMD import write_season_markdown
+        from xlsxToJson import MatchDataReader
+
+        layout, cache = self.layout, self.cache
+        xlsx_file = layout.xlsx(season_num)
+        json_file = layout.json(season_num)
+        stats_file = layout.stats(season_num)
+        chart_dir = layout.charts(season_num)
+        timings = []
+
+        def step(name):
+            timings.append((name, time.perf_counter()))
+
+        step('start')
+        with span('convert', season=season_num):
+            reader = MatchDataReader(xlsx_file, reader=self.reader).process()
+            layout.json_dir.mkdir(parents=True, exist_ok=True)
+            reader.save_json(json_file)
+            cache.record('convert', season_num, [xlsx_file], [json_file])
+        step('convert')
+
+        with span('analyze', season=season_num):
+            accumulator = self._accumulator(season_num)
+            accumulator.extend(reader.records, json_file.read_bytes())
+            # 经 json 往返，与从 sN_stats.json 读取的结果一致（图表指纹依赖此结构）
+            stats = json.loads(json.dumps(accumulator.to_stats(), cls=CustomEncoder))
+            layout.stats_dir.mkdir(parents=True, exist_ok=True)
+            save_stats(stats_file, stats)
+            accumulator.save(state_path_for(stats_file), encoder=CustomEncoder)
+            cache.record('analyze', season_num, [json_file], [stats_file])
+        step('analyze')
+
+        with span('render', season=season_num):
+            chart_dir.mkdir(parents=True, exist_ok=True)
+            charts = stale_charts(stats, season_num, chart_dir, force=force_charts)
+            self._render(stats, season_num, stats_file, chart_dir, charts)
+            cache.record('render', season_num, [stats_file],
+                         [chart_dir / name for name in self.chart_files])
+        step('render')
+
+        with span('markdown', season=season_num):
+            layout.md_dir.mkdir(parents=True, exist_ok=True)
+            write_season_markdown(season_num, layout.md_dir)
+            cache.record('markdown', season_num, [], [layout.md(season_num)])
+        step('markdown')
+
+        durations = [(name, end - begin)
+                     for (_, begin), (name, end) in zip(timings, timings[1:])]
+        return durations, charts
+
+    def _render(self, stats, season_num, stats_file, chart_dir, charts):
+        from drawStats import render_chart
+        from utils.renderPool import render_job
+
+        if self.pool is None:
+            for chart in charts:
+                render_chart(stats, season_num, chart, str(chart_dir / chart), template=True)
+            return
+        futures = [
+            self.pool.submit(render_job, stats_file, season_num, chart, chart_dir / chart,
+                             template=True)
+            for chart in charts
+        ]
+        for future in futures:
+            future.result()
+
+
+def season_of(name):
+    return int(re.fullmatch(XLSX_PATTERN, name).group(1))
+
+
+def watch(updater, debounce=0.3, poll_interval=0.5, polling=False):
+    """阻塞监视 xlsx 目录，Ctrl+C 退出"""
+    watcher = open_watcher(updater.layout.xlsx_dir, XLSX_PATTERN, poll_interval, polling)
+    mode = "轮询" if isinstance(watcher, PollingWatcher) else "inotify"
+    print(f"监视 {updater.layout.xlsx_dir}（{mode}，静默 {debounce}s 后处理），Ctrl+C 退出")
+    debouncer = Debouncer(debounce)
+    try:
+        while True:
+            for name in watcher.wait(debouncer.timeout()):
+                debouncer.touch(season_of(name))
+            for season_num in debouncer.due():
+                report(season_num, updater)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def report(season_num, updater):
+    try:
+        durations, charts = updater.update(season_num)
+    except Exception as e:  # 表格保存到一半等情况：报告错误，继续监视
+        print(f"s{season_num} 处理失败: {e!r}")
+        return
+    total = sum(seconds for _, seconds in durations)
+    steps = ' '.join(f"{name}={seconds:.3f}s" for name, seconds in durations)
+    redrawn = ','.join(chart.split('.')[0] for chart in charts) or '无'
+    print(f"s{season_num} 已更新 {total:.3f}s（{steps}；重绘: {redrawn}）")
+
+
+if __name__ == "__main__":
+    from xlsxToJson import READERS
+
+    parser = argparse.ArgumentParser(description="监视 xlsx 变化并自动更新赛季统计、图表与报告")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--reader', choices=READERS, default='pandas',
+                        help="xlsx 读取后端（默认 pandas）")
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help="最后一次变化后静默多少秒才处理（默认0.3）")
+    parser.add_argument('--polling', action='store_true',
+                        help="不使用 inotify，按间隔轮询文件变化")
+    parser.add_argument('--poll-interval', type=float, default=0.5,
+                        help="轮询间隔秒数（默认0.5）")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="常驻渲染进程数（默认CPU核数，1 为在本进程内渲染）")
+    parser.add_argument('--warm', type=int, metavar='SEASON',
+                        help="启动时完整处理一次该赛季，预热图表模板（默认最新赛季）")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    updater = SeasonUpdater(args.data_dir, reader=args.reader, workers=args.workers)
+    seasons = updater.layout.seasons()
+    start = time.perf_counter()
+    updater.warm(args.warm if args.warm is not None else (seasons[-1] if seasons else None))
+    print(f"预热完成 {time.perf_counter() - start:.2f}s")
+    try:
+        watch(updater, args.debounce, args.poll_interval, args.polling)
+    finally:
+        updater.close()
+    stageProfiler.report()
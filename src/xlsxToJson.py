@@ -1,17 +1,46 @@
+import argparse
+import numpy as np
 import pandas as pd
 import json
 import os
 from pathlib import Path
+from utils.buildCache import BuildCache
+from utils.dataLayout import DataLayout
+from utils import stageProfiler
+from utils.stageProfiler import add_rows, span
 
-def clean_remark(value):
-    if pd.isna(value):
-        return ""
-    elif isinstance(value, (int, float)):
-        return str(value)
-    elif isinstance(value, str):
-        return value.strip()
+# 可选的读取后端
+READERS = ('pandas', 'openpyxl', 'calamine')
+
+def clean_remarks(series):
+    """备注列批量清洗：空值为空字符串，其余转为字符串并去掉首尾空白"""
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+def iter_sheet_rows(input_path, reader):
+    """以流式方式逐行读取第一个工作表（值而非公式）"""
+    if reader == 'openpyxl':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(input_path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif reader == 'calamine':
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError as e:
+            raise ImportError("calamine 读取后端需要安装 python-calamine") from e
+
+        # calamine 把数字单元格一律读成 float，整数还原为 int（与 openpyxl 一致）
+        workbook = CalamineWorkbook.from_path(str(input_path))
+        for row in workbook.get_sheet_by_index(0).iter_rows():
+            yield [
+                int(value) if isinstance(value, float) and value.is_integer() else value
+                for value in row
+            ]
     else:
-        return value
+        raise ValueError(f"未知读取后端: {reader}")
 
 class MatchDataReader:
     """对战数据读取器"""
@@ -23,32 +52,57 @@ class MatchDataReader:
         '胜负': 'match_res'
     }
 
-    def __init__(self, input_path):
+    # 需要从表格读取的列
+    SOURCE_COLUMNS = list(COLUMN_MAPPING) + ['备注']
+
+    def __init__(self, input_path, reader='pandas'):
+        if reader not in READERS:
+            raise ValueError(f"未知读取后端: {reader}")
         self.input_path = Path(input_path).expanduser()
+        self.reader = reader
         self.df = None
         self.records = []
 
+    def _read_sheet(self):
+        """读取表格中需要的列"""
+        if self.reader == 'pandas':
+            return pd.read_excel(self.input_path)
+
+        rows = iter_sheet_rows(self.input_path, self.reader)
+        header = list(next(rows))
+        index = [header.index(column) for column in self.SOURCE_COLUMNS]
+        columns = {column: [] for column in self.SOURCE_COLUMNS}
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in index]
+            # 空行（calamine 以 '' 表示空单元格）
+            if all(value is None or value == '' for value in values):
+                continue
+            for column, value in zip(self.SOURCE_COLUMNS, values):
+                columns[column].append(None if value == '' else value)
+        return pd.DataFrame(columns)
+
     def _clean_data(self):
         """数据清洗"""
-        self.df['备注'] = self.df['备注'].apply(clean_remark)
+        self.df['备注'] = clean_remarks(self.df['备注'])
         self.df['先后手'] = self.df['先后手'].map({'先': 'first', '后': 'second'})
         self.df['胜负'] = self.df['胜负'].map({'胜': 'win', '负': 'lose'})
 
-    def _infer_coin_result(self, row):
-        """硬币结果推断逻辑"""
-        notes = row['备注']
-        if "让先" == notes:
-            return "win"
-        elif "被让先" == notes:
-            return "lose"
-        else:
-            return "win" if row['先后手'] == "first" else "lose"
+    def _infer_coin_results(self):
+        """硬币结果推断逻辑：让先→赢，被让先→输，否则先手即赢硬币"""
+        notes = self.df['备注'].to_numpy()
+        first = (self.df['先后手'] == "first").to_numpy()
+        return np.select(
+            [notes == "让先", notes == "被让先"],
+            ["win", "lose"],
+            default=np.where(first, "win", "lose")
+        ).astype(object)
 
     def process(self):
         """主处理流程"""
-        self.df = pd.read_excel(self.input_path)
+        with span('read_sheet'):
+            self.df = self._read_sheet()
         self._clean_data()
-        self.df['coin_res'] = self.df.apply(self._infer_coin_result, axis=1)
+        self.df['coin_res'] = self._infer_coin_results()
 
         self.records =(
              self.df.rename(columns=self.COLUMN_MAPPING)
@@ -56,6 +110,7 @@ class MatchDataReader:
             [list(self.COLUMN_MAPPING.values()) + ['coin_res', 'notes']]
             .to_dict('records'))
 
+        add_rows(len(self.records))
         return self
 
     def save_json(self, output_path):
@@ -64,19 +119,43 @@ class MatchDataReader:
             json.dump(self.records, f, ensure_ascii=False, indent=2)
         return self
 
+    def save_store(self, output_path):
+        """保存为 .mds 列式存储"""
+        from utils.matchStore import MatchStore
+
+        MatchStore.from_records(self.records).save(output_path)
+        return self
+
 # 使用示例
 if __name__ == "__main__":
-    xlsx_dir = os.path.expanduser("~/yugioh-data/data/xlsx/")
-    json_dir = os.path.expanduser("~/yugioh-data/data/json")
+    parser = argparse.ArgumentParser(description="xlsx 对战记录转换为 json")
+    parser.add_argument('--force', action='store_true', help="忽略构建缓存，全部重新转换")
+    parser.add_argument('--reader', choices=READERS, default='pandas',
+                        help="读取后端：pandas / openpyxl（只读流式）/ calamine")
+    stageProfiler.add_arguments(parser)
+    args = parser.parse_args()
+    stageProfiler.configure(args)
+
+    layout = DataLayout()
+    cache = BuildCache(layout.root, force=args.force)
 
     # Make sure the json directory exists
-    os.makedirs(json_dir, exist_ok=True)
+    os.makedirs(layout.json_dir, exist_ok=True)
     for i in range(18, 42):
-        xlsx_file = os.path.join(xlsx_dir, f"s{i}.xlsx")
-        json_file = os.path.join(json_dir, f"s{i}.json")
+        xlsx_file = layout.xlsx(i)
+        json_file = layout.json(i)
         if not os.path.exists(xlsx_file):
             print(f"{xlsx_file}.xlsx 不存在，跳过该文件。")
             continue
-        processor = MatchDataReader(xlsx_file)
-        processor.process().save_json(json_file)
+        build = lambda: (
+            MatchDataReader(xlsx_file, reader=args.reader)
+            .process()
+            .save_json(json_file)
+        )
+        with span('convert', season=i):
+            built = cache.run('convert', i, [xlsx_file], [json_file], build)
+        if not built:
+            print(f"s{i}输入未变化，跳过")
+            continue
         print(f"s{i}处理完毕")
+    stageProfiler.report()
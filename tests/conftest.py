@@ -0,0 +1,55 @@
+"""测试公共设置：以 src 为导入根目录，样例赛季取自仓库的 data/json"""
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+DATA_DIR = ROOT / "data"
+SAMPLE_SEASONS = sorted(int(path.stem[1:]) for path in (DATA_DIR / "json").glob("s*.json"))
+XLSX_SEASONS = sorted(int(path.stem[1:]) for path in (DATA_DIR / "xlsx").glob("s*.xlsx"))
+
+
+@pytest.fixture(params=SAMPLE_SEASONS, ids=lambda num: f"s{num}")
+def season_file(request):
+    """每个样例赛季的 sN.json"""
+    return DATA_DIR / "json" / f"s{request.param}.json"
+
+
+@pytest.fixture(params=XLSX_SEASONS, ids=lambda num: f"s{num}")
+def xlsx_file(request):
+    """每个样例赛季的原始 sN.xlsx"""
+    return DATA_DIR / "xlsx" / f"s{request.param}.xlsx"
+
+
+@pytest.fixture
+def matches(season_file):
+    with open(season_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """样例赛季 json 的临时数据目录（索引、缓存等产物写在这里，不改动仓库的 data/）"""
+    shutil.copytree(DATA_DIR / "json", tmp_path / "json")
+    return tmp_path
+
+
+@pytest.fixture
+def xlsx_dir(tmp_path):
+    """样例赛季原始 xlsx 的临时数据目录（流水线从转换阶段开始处理）"""
+    shutil.copytree(DATA_DIR / "xlsx", tmp_path / "xlsx",
+                    ignore=shutil.ignore_patterns("*.py"))
+    return tmp_path
+
+
+@pytest.fixture
+def as_json():
+    """统计结果按 sN_stats.json 的写法序列化再读回（numpy 标量、NaN 键等与文件中一致）"""
+    from calcStats import CustomEncoder
+
+    return lambda stats: json.loads(json.dumps(stats, cls=CustomEncoder))
@@ -0,0 +1,38 @@
+import os
+
+from pipeline import run_pipeline
+from utils.buildCache import BuildCache, code_digest
+
+
+def statuses(results):
+    return [status for _, report in results for _, _, status in report]
+
+
+def test_unchanged_seasons_are_skipped(xlsx_dir):
+    seasons = [18, 19]
+    stages = ('convert', 'analyze')
+    assert statuses(run_pipeline([xlsx_dir], seasons, stages, workers=1)) == [True] * 4
+    assert statuses(run_pipeline([xlsx_dir], seasons, stages, workers=1)) == [False] * 4
+    assert statuses(run_pipeline([xlsx_dir], seasons, stages, workers=1, force=True)) == [True] * 4
+
+
+def test_content_not_mtime_decides_rebuild(tmp_path):
+    source = tmp_path / "s1.json"
+    target = tmp_path / "s1_stats.json"
+    source.write_text("[]", encoding='utf-8')
+    cache = BuildCache(tmp_path)
+    build = lambda: target.write_text(source.read_text(encoding='utf-8'), encoding='utf-8')
+    assert cache.run('analyze', 1, [source], [target], build)
+
+    # 只改修改时间不重建；内容变化、产物缺失时重建
+    os.utime(source, ns=(0, 0))
+    assert not cache.run('analyze', 1, [source], [target], build)
+    source.write_text("[{}]", encoding='utf-8')
+    assert cache.run('analyze', 1, [source], [target], build)
+    target.unlink()
+    assert cache.run('analyze', 1, [source], [target], build)
+    # 不同阶段、不同赛季各自记录
+    assert cache.run('render', 1, [source], [target], build)
+    assert cache.run('analyze', 2, [source], [target], build)
+    assert not cache.run('analyze', 1, [source], [target], build)
+    assert code_digest('analyze') != code_digest('render')
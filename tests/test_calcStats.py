@@ -0,0 +1,6 @@
+from calcStats import analyze_match_data, analyze_match_data_reference
+
+
+def test_columnar_matches_reference(season_file, as_json):
+    assert as_json(analyze_match_data(season_file)) == \
+        as_json(analyze_match_data_reference(season_file))
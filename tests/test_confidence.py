@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from scipy.stats import binom
+
+from utils.confidence import bootstrap_interval, wilson_interval
+
+PAIRS = [(0, 0), (3, 10), (7, 7), (0, 5), (25, 60), (118, 240), (3, 10), (1, 2)]
+RESAMPLES = 2000
+
+
+@pytest.mark.parametrize('method', ('binomial', 'poisson'))
+def test_interval_does_not_depend_on_batch(method):
+    k, n = np.array(PAIRS).T
+    low, high = bootstrap_interval(k, n, resamples=RESAMPLES, method=method)
+    for i, (k_i, n_i) in enumerate(PAIRS):
+        single = bootstrap_interval(k_i, n_i, resamples=RESAMPLES, method=method)
+        assert (float(single[0]), float(single[1])) == (low[i], high[i])
+    order = np.random.default_rng(1).permutation(len(PAIRS))
+    shuffled = bootstrap_interval(k[order], n[order], resamples=RESAMPLES, method=method)
+    np.testing.assert_array_equal(shuffled[0], low[order])
+    np.testing.assert_array_equal(shuffled[1], high[order])
+    grid = bootstrap_interval(k.reshape(2, 4), n.reshape(2, 4), resamples=RESAMPLES,
+                              method=method)
+    np.testing.assert_array_equal(grid[0].ravel(), low)
+
+
+def test_binomial_order_statistics_match_full_resample():
+    for k, n in PAIRS:
+        if k == 0 or k == n:
+            continue
+        uniform = np.random.default_rng([0, k, n]).random(RESAMPLES)
+        draws = binom.ppf(uniform, n, k / n) / n * 100
+        expected = np.quantile(draws, [0.025, 0.975])
+        np.testing.assert_allclose(bootstrap_interval(k, n, resamples=RESAMPLES), expected)
+
+
+@pytest.mark.parametrize('method', ('binomial', 'poisson'))
+def test_degenerate_counts_use_wilson(method):
+    k, n = np.array([0, 5, 0]), np.array([5, 5, 0])
+    np.testing.assert_allclose(bootstrap_interval(k, n, method=method), wilson_interval(k, n),
+                               atol=1e-9)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        bootstrap_interval(1, 2, method='jackknife')
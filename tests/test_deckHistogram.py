@@ -0,0 +1,74 @@
+import json
+from collections import Counter
+
+import pytest
+
+from calcStats import analyze_match_data
+from utils.dataLayout import DataLayout
+from utils.deckHistogram import (SpaceSaving, deck_name, histogram_counts, top_k,
+                                 tree_merge_sketches)
+
+
+def assert_bounds(sketch, true_counts):
+    """每个被跟踪的卡组 计数-误差 <= 真实场数 <= 计数，超过 总场数/容量 的卡组都被跟踪"""
+    assert sketch.total == sum(true_counts.values())
+    for deck, count, error in sketch.top():
+        assert count - error <= true_counts.get(deck, 0) <= count
+        assert error <= sketch.error_bound
+    for deck, count in true_counts.items():
+        if count > sketch.error_bound:
+            assert deck in sketch.items
+
+
+def test_histogram_matches_raw_records(season_file, matches):
+    stats = analyze_match_data(season_file)
+    assert histogram_counts(stats['op_decks']) == \
+        Counter(deck_name(match['op_deck']) for match in matches)
+    assert stats['top_10_decks'] == top_k(stats['op_decks'], 10)
+
+
+@pytest.mark.parametrize('capacity', (1, 3, 8))
+def test_sketch_bounds_hold(matches, capacity):
+    sketch = SpaceSaving(capacity)
+    for match in matches:
+        sketch.add(match['op_deck'])
+    true_counts = Counter(deck_name(match['op_deck']) for match in matches)
+    assert_bounds(sketch, true_counts)
+    assert sum(count for _, count, _ in sketch.top()) == sketch.total
+    restored = SpaceSaving.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.top() == sketch.top()
+
+
+def test_sketch_is_exact_with_enough_capacity(matches):
+    true_counts = Counter(deck_name(match['op_deck']) for match in matches)
+    sketch = SpaceSaving(len(true_counts))
+    for match in matches:
+        sketch.add(match['op_deck'])
+    assert {deck: count for deck, count, _ in sketch.top()} == true_counts
+    assert all(error == 0 for _, _, error in sketch.top())
+
+
+def test_heap_stays_compact_on_long_streams():
+    sketch = SpaceSaving(3)
+    true_counts = Counter()
+    for i in range(5000):
+        deck = f"deck{i % 7 if i % 3 else i % 50}"
+        sketch.add(deck)
+        true_counts[deck] += 1
+        assert len(sketch._heap) <= 2 * sketch.capacity + 16
+    assert_bounds(sketch, true_counts)
+
+
+def test_merged_sketches_keep_bounds(data_dir):
+    layout = DataLayout(data_dir)
+    sketches, season_counts = [], []
+    for season_num in layout.seasons():
+        with open(layout.json(season_num), 'r', encoding='utf-8') as f:
+            decks = [deck_name(match['op_deck']) for match in json.load(f)]
+        sketch = SpaceSaving(6)
+        for deck in decks:
+            sketch.add(deck)
+        sketches.append(sketch)
+        season_counts.append(Counter(decks))
+    assert_bounds(sketches[0].merge(sketches[1]), season_counts[0] + season_counts[1])
+    assert_bounds(tree_merge_sketches(sketches, 6), sum(season_counts, Counter()))
@@ -0,0 +1,64 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from calcStats import analyze_match_data
+from drawStats import CHART_FILES, fingerprint_path, save_season_charts, stale_charts
+from utils.dataLayout import DataLayout
+
+
+@pytest.fixture(scope='module')
+def rendered(tmp_path_factory):
+    """最后一个样例赛季的 (赛季编号, 按 sN_stats.json 往返后的统计结果, 已绘制的图表目录)"""
+    from calcStats import CustomEncoder
+
+    layout = DataLayout(Path(__file__).resolve().parent.parent / "data")
+    season_num = layout.seasons()[-1]
+    stats = json.loads(json.dumps(analyze_match_data(layout.json(season_num)), cls=CustomEncoder))
+    chart_dir = tmp_path_factory.mktemp("chart")
+    assert save_season_charts(stats, season_num, chart_dir) == list(CHART_FILES)
+    return season_num, stats, chart_dir
+
+
+@pytest.fixture
+def season(rendered, tmp_path):
+    """(赛季编号, 统计结果, 图表目录的副本)"""
+    season_num, stats, chart_dir = rendered
+    shutil.copytree(chart_dir, tmp_path / "chart")
+    return season_num, stats, tmp_path / "chart"
+
+
+def test_only_charts_with_changed_inputs_are_redrawn(season):
+    season_num, stats, chart_dir = season
+    assert all((chart_dir / chart).exists() for chart in CHART_FILES)
+    assert save_season_charts(stats, season_num, chart_dir) == []
+
+    # 图表不读取的字段变化时不重绘
+    unread = json.loads(json.dumps(stats))
+    unread['top_10_decks'] = {}
+    unread['wins_ci'] = [0, 100]
+    assert stale_charts(unread, season_num, chart_dir) == []
+    binom = json.loads(json.dumps(stats))
+    binom['binom_test'] = 1.0
+    assert stale_charts(binom, season_num, chart_dir) == ['season_stats.png']
+
+    # 对手卡组直方图只影响卡组分布图
+    changed = json.loads(json.dumps(stats))
+    changed['op_decks']['counts'][0] += 1
+    assert save_season_charts(changed, season_num, chart_dir) == ['top10_decks.png']
+    assert stale_charts(changed, season_num, chart_dir) == []
+    assert stale_charts(stats, season_num, chart_dir) == ['top10_decks.png']
+
+
+def test_missing_chart_or_fingerprint_is_redrawn(season):
+    season_num, stats, chart_dir = season
+    fingerprint_path(chart_dir / "matchups.png").unlink()
+    (chart_dir / "streak.png").unlink()
+    assert stale_charts(stats, season_num, chart_dir) == ['streak.png', 'matchups.png']
+    assert save_season_charts(stats, season_num, chart_dir) == ['streak.png', 'matchups.png']
+    assert stale_charts(stats, season_num, chart_dir) == []
+    # 其他赛季编号（标题不同）需要重绘
+    assert stale_charts(stats, season_num + 1, chart_dir) == list(CHART_FILES)
+    assert stale_charts(stats, season_num, chart_dir, force=True) == list(CHART_FILES)
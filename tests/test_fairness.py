@@ -0,0 +1,34 @@
+import numpy as np
+from scipy.stats import binomtest, chisquare
+
+from utils.fairness import fairness_batch
+
+PAIRS = [(k, n) for n in range(1, 61) for k in range(n + 1)] + [(612, 1200), (95, 160)]
+
+
+def test_matches_scipy_bit_for_bit():
+    k, n = np.array(PAIRS).T
+    tests = fairness_batch(k, n)
+    for i, (successes, trials) in enumerate(PAIRS):
+        chi2 = chisquare([successes, trials - successes])
+        assert tests['chi2_statistic'][i] == chi2.statistic
+        assert tests['chi2_p'][i] == chi2.pvalue
+        assert tests['binom_p'][i] == binomtest(successes, trials, 0.5).pvalue
+
+
+def test_cached_results_are_identical_in_any_batch():
+    k, n = np.array(PAIRS).T
+    runs = np.minimum(k, n - k) + 1
+    first = fairness_batch(k, n, runs)
+    reordered = fairness_batch(k[::-1], n[::-1], runs[::-1])
+    for key, values in first.items():
+        np.testing.assert_array_equal(reordered[key][::-1], values)
+    single = fairness_batch([k[7]], [n[7]], [runs[7]])
+    for key, values in first.items():
+        np.testing.assert_array_equal(single[key], values[7:8])
+
+
+def test_runs_p_undefined_for_one_sided_sequences():
+    tests = fairness_batch([0, 5, 3], [5, 5, 6], [1, 1, 4])
+    assert np.isnan(tests['runs_p'][0]) and np.isnan(tests['runs_p'][1])
+    assert 0 <= tests['runs_p'][2] <= 1
@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+from utils.fileWatcher import Debouncer, InotifyWatcher, PollingWatcher, open_watcher
+
+PATTERN = r"s\d+\.xlsx"
+
+
+def test_repeated_touches_coalesce():
+    debouncer = Debouncer(delay=1.0)
+    assert debouncer.timeout(now=0) is None
+    debouncer.touch('s41.xlsx', now=0.0)
+    debouncer.touch('s40.xlsx', now=0.2)
+    debouncer.touch('s41.xlsx', now=0.5)  # 连续保存：从最后一次变化重新计时
+    assert debouncer.due(now=1.1) == []
+    assert debouncer.timeout(now=1.1) == pytest.approx(0.1)
+    assert debouncer.due(now=1.2) == ['s40.xlsx']
+    assert debouncer.timeout(now=1.2) == pytest.approx(0.3)
+    assert debouncer.timeout(now=9) == 0
+    assert debouncer.due(now=1.5) == ['s41.xlsx']
+    assert debouncer.due(now=10) == [] and debouncer.timeout(now=10) is None
+
+
+def watchers():
+    yield 'polling', lambda directory: PollingWatcher(directory, PATTERN, interval=0.01)
+    yield 'inotify', lambda directory: InotifyWatcher(directory, PATTERN)
+
+
+@pytest.fixture(params=[factory for _, factory in watchers()],
+                ids=[name for name, _ in watchers()])
+def watcher(request, tmp_path):
+    (tmp_path / "s40.xlsx").write_bytes(b'old')
+    try:
+        watcher = request.param(tmp_path)
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"监视器不可用: {e}")
+    yield watcher
+    watcher.close()
+
+
+def test_watcher_reports_matching_changes(watcher, tmp_path):
+    start = time.monotonic()
+    assert watcher.wait(0.05) == set()
+    assert time.monotonic() - start < 2
+
+    (tmp_path / "notes.txt").write_text('ignored')
+    (tmp_path / "s41.xlsx").write_bytes(b'new')
+    assert watcher.wait(2) == {'s41.xlsx'}
+
+    (tmp_path / "s40.xlsx").write_bytes(b'changed')
+    assert watcher.wait(2) == {'s40.xlsx'}
+    assert watcher.wait(0.05) == set()
+
+
+def test_polling_detects_same_size_rewrite(tmp_path):
+    path = tmp_path / "s40.xlsx"
+    path.write_bytes(b'old')
+    watcher = PollingWatcher(tmp_path, PATTERN, interval=0.01)
+    os.utime(path, ns=(0, 0))
+    assert watcher.wait(1) == {'s40.xlsx'}
+    path.unlink()
+    assert watcher.wait(0.05) == set()
+
+
+def test_open_watcher_falls_back_to_polling(tmp_path):
+    watcher = open_watcher(tmp_path, PATTERN, polling=True)
+    assert isinstance(watcher, PollingWatcher)
+    watcher.close()
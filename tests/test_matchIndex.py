@@ -0,0 +1,41 @@
+import json
+import math
+from collections import Counter
+
+import numpy as np
+
+from calcStats import COUNTER_KEYS, analyze_match_data, rate_stats
+from utils.dataLayout import DataLayout
+from utils.matchIndex import MatchIndex, build_index
+
+
+def test_index_season_counters_match_stats(data_dir):
+    layout = DataLayout(data_dir)
+    index = build_index(layout)
+    assert index.seasons == sorted(int(path.stem[1:]) for path in layout.json_dir.glob('s*.json'))
+    for season_num in index.seasons:
+        stats = analyze_match_data(layout.json(season_num))
+        counters = index.aggregate(index.season_rows(season_num))
+        for key in COUNTER_KEYS + tuple(rate_stats(counters)):
+            assert counters[key] == stats[key], (season_num, key)
+
+
+def test_secondary_index_matches_deck_counts(data_dir):
+    layout = DataLayout(data_dir)
+    index = build_index(layout)
+    for season_num in index.seasons:
+        with open(layout.json(season_num), 'r', encoding='utf-8') as f:
+            matches = json.load(f)
+        counts = Counter(match['op_deck'] for match in matches
+                         if not (isinstance(match['op_deck'], float) and math.isnan(match['op_deck'])))
+        for deck, count in counts.items():
+            assert len(index.rows(seasons=[season_num], op_deck=deck)) == count
+
+
+def test_reopened_index_reads_same_records(data_dir):
+    layout = DataLayout(data_dir)
+    built = build_index(layout)
+    reopened = MatchIndex(layout.index_dir)
+    assert np.array_equal(np.asarray(reopened.records), np.asarray(built.records))
+    assert reopened.deck_code(built.meta['decks'][-1]) == len(built.meta['decks']) - 1
+    assert reopened.deck_code('不存在的卡组') is None
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+
+from calcStats import analyze_match_data
+from query import open_index
+from utils.dataLayout import DataLayout
+from utils.matchIndex import build_index
+from utils.matchQuery import Query
+
+
+def test_group_by_season_matches_stats(data_dir):
+    layout = DataLayout(data_dir)
+    results = Query(open_index(data_dir)).group_by('season').agg(
+        'count', 'wins', 'coin_wins', 'first_moves', 'win_rate', 'coin_win_rate').run()
+    for row in results:
+        stats = analyze_match_data(layout.json(row['season']))
+        assert row['count'] == stats['total_matches']
+        for key in ('wins', 'coin_wins', 'first_moves', 'win_rate', 'coin_win_rate'):
+            assert row[key] == stats[key], (row['season'], key)
+
+
+def test_group_by_deck_matches_my_decks(data_dir):
+    layout = DataLayout(data_dir)
+    index = open_index(data_dir)
+    season_num = index.seasons[-1]
+    stats = analyze_match_data(layout.json(season_num))
+    results = Query(index).where(seasons=[season_num]).group_by('deck').agg(
+        'count', 'wins', 'coin_wins').run()
+    assert {row['deck']: [row['count'], row['wins'], row['coin_wins']] for row in results} == {
+        deck: [entry['total'], entry['wins'], entry['coin_wins']]
+        for deck, entry in stats['my_decks'].items()
+    }
+
+
+def _assert_same_index(index, layout, tmp_path):
+    rebuilt = build_index(layout, tmp_path / "rebuilt")
+    assert np.array_equal(np.asarray(index.records), np.asarray(rebuilt.records))
+    assert index.meta['seasons'] == rebuilt.meta['seasons']
+
+
+def test_open_index_syncs_changed_and_new_seasons(data_dir, tmp_path):
+    layout = DataLayout(data_dir)
+    index = open_index(data_dir)
+    last = index.seasons[-1]
+    with open(layout.json(last), 'r', encoding='utf-8') as f:
+        matches = json.load(f)
+
+    # 进行中的赛季追加对局
+    layout.json(last).write_text(json.dumps(matches + matches[:5], ensure_ascii=False),
+                                 encoding='utf-8')
+    index = open_index(data_dir)
+    assert len(index.season_rows(last)) == len(matches) + 5
+    _assert_same_index(index, layout, tmp_path)
+
+    # 之后转换的新赛季
+    layout.json(last + 1).write_text(json.dumps(matches[:20], ensure_ascii=False),
+                                     encoding='utf-8')
+    index = open_index(data_dir)
+    assert index.seasons[-1] == last + 1
+    _assert_same_index(index, layout, tmp_path)
+
+    # 中间赛季变化时整体重建
+    first = index.seasons[0]
+    layout.json(first).write_text(json.dumps(matches[:10], ensure_ascii=False),
+                                  encoding='utf-8')
+    index = open_index(data_dir)
+    assert len(index.season_rows(first)) == 10
+    _assert_same_index(index, layout, tmp_path)
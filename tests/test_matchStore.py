@@ -0,0 +1,18 @@
+import json
+
+from calcStats import analyze_match_data, analyze_match_store
+from utils.matchStore import MatchStore
+
+
+def test_store_round_trip_matches_json(season_file, matches, tmp_path):
+    store_file = tmp_path / "s1.mds"
+    MatchStore.from_json(season_file).save(store_file)
+    records = MatchStore.open(store_file).to_records()
+    # NaN 不等于自身，按序列化结果比较
+    assert json.dumps(records, ensure_ascii=False) == json.dumps(matches, ensure_ascii=False)
+
+
+def test_store_analysis_matches_json(season_file, tmp_path, as_json):
+    store_file = tmp_path / "s1.mds"
+    MatchStore.from_json(season_file).save(store_file)
+    assert as_json(analyze_match_store(store_file)) == as_json(analyze_match_data(season_file))
@@ -0,0 +1,59 @@
+import json
+import math
+
+import pytest
+
+from calcStats import analyze_match_data, analyze_match_file_streaming
+from utils.matchStream import count_matches, iter_json_array, write_ndjson
+
+# 各类元素：块边界可能落在数字、字面量、转义字符、中文与嵌套结构的任意位置
+TRICKY_ARRAY = '''[
+  12345, -0.5e-3, true, false, null, NaN, -Infinity,
+  "逗号,与]括号[", "转义\\"引号\\\\", {"op_deck": "天杯龙", "notes": "让先", "n": [1, [2, {"k": -3}]]},
+  [], {},
+      987654321
+]'''
+
+
+def _same(items, expected):
+    # NaN 不等于自身，按序列化结果比较
+    return json.dumps(items, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 41))
+def test_chunk_boundaries(tmp_path, chunk_size):
+    path = tmp_path / "tricky.json"
+    path.write_text(TRICKY_ARRAY, encoding='utf-8')
+    items = list(iter_json_array(path, chunk_size=chunk_size))
+    assert _same(items, json.loads(TRICKY_ARRAY))
+    assert math.isnan(items[5]) and items[6] == -math.inf
+
+
+@pytest.mark.parametrize('chunk_size', (7, 64, 1 << 16))
+def test_sample_seasons_stream_like_json_load(season_file, matches, chunk_size):
+    assert _same(list(iter_json_array(season_file, chunk_size=chunk_size)), matches)
+
+
+@pytest.mark.parametrize('text', ('[]', '  [ ]\n'))
+def test_empty_array(tmp_path, text):
+    path = tmp_path / "empty.json"
+    path.write_text(text, encoding='utf-8')
+    assert list(iter_json_array(path)) == []
+
+
+@pytest.mark.parametrize('text', ('[{"a": 1},', '{"a": 1}', '[1 2]'))
+def test_malformed_array_raises(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, chunk_size=4))
+
+
+def test_streaming_analysis_matches_in_memory(season_file, matches, tmp_path, as_json):
+    expected = as_json(analyze_match_data(season_file))
+    assert as_json(analyze_match_file_streaming(season_file)) == expected
+
+    ndjson = tmp_path / "s1.ndjson"
+    write_ndjson(matches, ndjson)
+    assert count_matches(ndjson) == len(matches)
+    assert as_json(analyze_match_file_streaming(ndjson)) == expected
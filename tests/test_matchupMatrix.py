@@ -0,0 +1,26 @@
+from calcStats import matches_to_columns
+from utils.matchupMatrix import MatchupMatrix
+
+
+def test_vectorized_counts_match_per_match_add(matches, as_json):
+    columns = matches_to_columns(matches)
+    vectorized = MatchupMatrix.from_columns(
+        columns['my_deck'], columns['my_deck_names'],
+        columns['op_deck'], columns['op_deck_names'],
+        columns['first'], columns['coin'], columns['win'])
+
+    streamed = MatchupMatrix()
+    for match in matches:
+        streamed.add(match['my_deck'], match['op_deck'], match['first_move'] == 'first',
+                     match['coin_res'] == 'win', match['match_res'] == 'win')
+    assert as_json(vectorized.to_stats()) == as_json(streamed.to_stats())
+
+
+def test_stats_round_trip(matches, as_json):
+    columns = matches_to_columns(matches)
+    matrix = MatchupMatrix.from_columns(
+        columns['my_deck'], columns['my_deck_names'],
+        columns['op_deck'], columns['op_deck_names'],
+        columns['first'], columns['coin'], columns['win'])
+    stats = matrix.to_stats()
+    assert as_json(MatchupMatrix.from_stats(stats).to_stats()) == as_json(stats)
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from calcStats import analyze_match_data
+from pipeline import run_pipeline
+from utils.dataLayout import DataLayout
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_pipeline_stats_match_direct_analysis(xlsx_dir, workers, as_json):
+    layout = DataLayout(xlsx_dir)
+    seasons = layout.seasons()[:3]
+    results = run_pipeline([xlsx_dir], seasons, stages=('analyze', 'convert'), workers=workers)
+    assert [num for (_, num), _ in results] == seasons
+    for (_, season_num), report in results:
+        assert [(stage, status) for stage, _, status in report] == \
+            [('convert', True), ('analyze', True)]
+        with open(layout.stats(season_num), 'r', encoding='utf-8') as f:
+            assert json.load(f) == as_json(analyze_match_data(layout.json(season_num)))
+
+
+def test_store_option_writes_same_stats(xlsx_dir):
+    layout = DataLayout(xlsx_dir)
+    seasons = layout.seasons()[:2]
+    run_pipeline([xlsx_dir], seasons, stages=('convert', 'analyze'), workers=1)
+    expected = {num: layout.stats(num).read_bytes() for num in seasons}
+    run_pipeline([xlsx_dir], seasons, stages=('convert', 'analyze'), workers=1,
+                 force=True, options={'store': True})
+    for season_num in seasons:
+        assert layout.store(season_num).exists()
+        assert layout.stats(season_num).read_bytes() == expected[season_num]
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from utils.responseCache import ResponseCache, etag_for
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    cache = ResponseCache(max_bytes=10)
+    cache.put('a', b'aaaa', 'json')
+    cache.put('b', b'bbbb', 'json')
+    assert cache.get('a') == (b'aaaa', 'json')  # a 变为最近使用
+    cache.put('c', b'cccc', 'json')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size == 8
+
+    cache.put('a', b'a', 'json')  # 替换已有键时按新大小计
+    assert cache.size == 5
+    cache.put('big', b'x' * 11, 'png')  # 超过容量的响应不缓存
+    assert cache.get('big') is None
+    assert cache.info()['entries'] == 2
+
+
+def test_concurrent_callers_build_once():
+    cache = ResponseCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def build():
+        calls.append(threading.get_ident())
+        started.set()
+        release.wait(5)
+        return b'body', 'png'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build('k', build)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert results == [(b'body', 'png')] * 8
+    assert cache._building == {}
+
+
+def test_failed_build_is_not_cached_and_can_retry():
+    cache = ResponseCache()
+
+    def fail():
+        raise RuntimeError("绘图失败")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_build('k', fail)
+    assert cache._building == {}
+    assert cache.get('k') is None
+    assert cache.get_or_build('k', lambda: (b'ok', 'json')) == (b'ok', 'json')
+    assert cache.get_or_build('k', fail) == (b'ok', 'json')
+
+
+def test_etag_follows_key():
+    assert etag_for(('chart', 41, 'a')) == etag_for(('chart', 41, 'a'))
+    assert etag_for(('chart', 41, 'a')) != etag_for(('chart', 41, 'b'))
@@ -0,0 +1,50 @@
+import json
+import random
+
+from calcStats import analyze_matches
+from utils.seasonSummary import SeasonSummary, tree_merge
+
+
+def dump(summary):
+    return json.loads(json.dumps(summary.to_dict(), ensure_ascii=False))
+
+
+def random_parts(matches, count, rng):
+    """随机切成 count 段（可含空段与单场段）"""
+    cuts = sorted(rng.randint(0, len(matches)) for _ in range(count - 1))
+    bounds = [0] + cuts + [len(matches)]
+    return [matches[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_merged_parts_match_whole_season(matches):
+    rng = random.Random(len(matches))
+    whole = dump(SeasonSummary.from_matches(matches))
+    for count in (2, 3, 7):
+        parts = [SeasonSummary.from_matches(part) for part in random_parts(matches, count, rng)]
+        merged = SeasonSummary.empty()
+        for part in parts:
+            merged = merged.merge(part)
+        assert dump(merged) == whole
+        assert dump(tree_merge(parts)) == whole
+
+
+def test_merge_is_associative(matches):
+    rng = random.Random(len(matches) + 1)
+    for _ in range(5):
+        a, b, c = (SeasonSummary.from_matches(part) for part in random_parts(matches, 3, rng))
+        assert dump(a.merge(b).merge(c)) == dump(a.merge(b.merge(c)))
+
+
+def test_empty_is_identity(matches):
+    summary = SeasonSummary.from_matches(matches[:25])
+    empty = SeasonSummary.empty()
+    assert dump(empty.merge(summary)) == dump(summary) == dump(summary.merge(empty))
+    assert dump(tree_merge([])) == dump(empty) == dump(SeasonSummary.from_matches([]))
+
+
+def test_streaks_and_counters_match_stats(matches, as_json):
+    summary = SeasonSummary.from_dict(dump(SeasonSummary.from_matches(matches)))
+    stats = as_json(analyze_matches(matches))
+    assert as_json(summary.streaks()) == stats['streaks']
+    for key, value in summary.counters.items():
+        assert value == stats[key]
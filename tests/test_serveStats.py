@@ -0,0 +1,59 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from calcStats import analyze_match_data, save_stats
+from serveStats import Dashboard, make_server
+from utils.dataLayout import DataLayout
+
+
+@pytest.fixture
+def server(data_dir):
+    layout = DataLayout(data_dir)
+    season_num = layout.seasons()[-1]
+    layout.stats_dir.mkdir()
+    save_stats(layout.stats(season_num), analyze_match_data(layout.json(season_num)))
+    dashboard = Dashboard(data_dir)
+    httpd = make_server(dashboard, port=0, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, dashboard, season_num
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(httpd, path, etag=None):
+    conn = http.client.HTTPConnection(*httpd.server_address, timeout=10)
+    conn.request('GET', path, headers={'If-None-Match': etag} if etag else {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response.status, response.getheader('ETag'), body
+
+
+@pytest.mark.parametrize('path', ('/api/stats/{season}', '/api/query?group_by=season&agg=count'))
+def test_matching_etag_gets_not_modified(server, path):
+    httpd, dashboard, season_num = server
+    path = path.format(season=season_num)
+    status, etag, body = request(httpd, path)
+    assert status == 200 and etag and json.loads(body)
+
+    built = dashboard.cache.info()['misses']
+    status, again, body = request(httpd, path, etag)
+    assert (status, again, body) == (304, etag, b'')
+    # 304 不读取缓存、不生成响应体
+    assert dashboard.cache.info()['misses'] == built
+
+    status, _, body = request(httpd, path, '"stale"')
+    assert status == 200 and json.loads(body)
+
+
+def test_changed_stats_change_etag(server):
+    httpd, dashboard, season_num = server
+    _, etag, _ = request(httpd, f'/api/stats/{season_num}')
+    stats_file = dashboard.layout.stats(season_num)
+    stats_file.write_text(stats_file.read_text(encoding='utf-8') + "\n", encoding='utf-8')
+    status, new_etag, _ = request(httpd, f'/api/stats/{season_num}', etag)
+    assert status == 200 and new_etag != etag
@@ -0,0 +1,75 @@
+import json
+import shutil
+
+import pytest
+
+from utils.dataLayout import ArchiveLayout, DataLayout
+from utils.seasonSummary import SeasonSummary
+from utils.shardAggregate import aggregate_archive, environment_share, load_summary
+
+PLAYERS = {'alice': (18, 19, 20), 'bob': (20, 21)}
+
+
+def dump(summary):
+    """按摘要文件的写法比较（NaN 卡组名等与 json 中一致）"""
+    return json.loads(json.dumps(summary.to_dict(), ensure_ascii=False))
+
+
+@pytest.fixture
+def read_matches(data_dir):
+    def read(seasons):
+        matches = []
+        for season_num in seasons:
+            with open(DataLayout(data_dir).json(season_num), 'r', encoding='utf-8') as f:
+                matches.extend(json.load(f))
+        return matches
+    return read
+
+
+@pytest.fixture
+def archive(data_dir):
+    """两个玩家共用样例赛季（第 20 赛季两人都有）的档案"""
+    archive = ArchiveLayout(data_dir / "archive")
+    for name, seasons in PLAYERS.items():
+        json_dir = archive.player(name).json_dir
+        json_dir.mkdir(parents=True)
+        for season_num in seasons:
+            shutil.copy(DataLayout(data_dir).json(season_num), json_dir)
+    return archive
+
+
+def test_archive_reduce_matches_concatenated_matches(archive, read_matches):
+    result = aggregate_archive(archive, workers=1)
+    assert result['shards'] == result['computed'] == 5
+
+    for name, seasons in PLAYERS.items():
+        assert dump(result['players'][name]) == \
+            dump(SeasonSummary.from_matches(read_matches(seasons)))
+    season = SeasonSummary.from_matches(read_matches([20])).closed()
+    assert dump(result['seasons'][20]) == dump(season.merge(season))
+    assert dump(result['total']) == dump(
+        SeasonSummary.from_matches(read_matches(PLAYERS['alice'])).closed().merge(
+            SeasonSummary.from_matches(read_matches(PLAYERS['bob'])).closed()))
+
+
+def test_cached_shards_are_reused_until_changed(archive, read_matches):
+    first = aggregate_archive(archive, workers=1)
+    again = aggregate_archive(archive, workers=1)
+    assert again['computed'] == 0
+    assert dump(again['total']) == dump(first['total'])
+
+    player = archive.player('bob')
+    matches = read_matches([21])[:40]
+    player.json(21).write_text(json.dumps(matches, ensure_ascii=False), encoding='utf-8')
+    changed = aggregate_archive(archive, workers=1)
+    assert changed['computed'] == 1
+    assert dump(load_summary(player.root, 21)) == dump(SeasonSummary.from_matches(matches))
+
+
+def test_sketch_with_enough_capacity_is_exact(archive):
+    exact = aggregate_archive(archive, workers=1)['total']
+    sketched = aggregate_archive(archive, workers=1, sketch=10_000)
+    assert sketched['total'].op_decks == {}
+    expected = {deck: count for deck, count, _ in environment_share(dump(exact)['op_decks'])}
+    assert {deck: count for deck, count, error in sketched['sketch'].top()} == expected
+    assert all(error == 0 for _, _, error in sketched['sketch'].top())
@@ -0,0 +1,62 @@
+import json
+
+from calcStats import analyze_matches, update_stats_incremental
+from utils.statsAccumulator import StatsAccumulator
+
+
+def test_accumulator_matches_full_recompute(matches, as_json):
+    accumulator = StatsAccumulator()
+    accumulator.extend(matches)
+    assert as_json(accumulator.to_stats()) == as_json(analyze_matches(matches))
+
+
+def test_appended_batches_match_full_recompute(matches, as_json):
+    accumulator = StatsAccumulator()
+    for end in (len(matches) // 3, len(matches) // 2 + 1, len(matches)):
+        accumulator.extend(matches[:end])
+        assert as_json(accumulator.to_stats()) == as_json(analyze_matches(matches[:end]))
+
+
+def test_incremental_update_through_saved_state(matches, tmp_path, as_json):
+    json_file = tmp_path / "s1.json"
+    stats_file = tmp_path / "s1_stats.json"
+    for end, expected_added in ((len(matches) // 2, len(matches) // 2),
+                                (len(matches), len(matches) - len(matches) // 2)):
+        json_file.write_text(json.dumps(matches[:end], ensure_ascii=False), encoding='utf-8')
+        assert update_stats_incremental(json_file, stats_file) == expected_added
+    saved = json.loads(stats_file.read_text(encoding='utf-8'))
+    assert saved == as_json(analyze_matches(matches))
+
+
+def test_modified_prefix_is_recomputed(matches, as_json):
+    accumulator = StatsAccumulator()
+    accumulator.extend(matches)
+    edited = [dict(match) for match in matches]
+    edited[0]['match_res'] = 'lose' if edited[0]['match_res'] == 'win' else 'win'
+    accumulator.extend(edited)
+    assert as_json(accumulator.to_stats()) == as_json(analyze_matches(edited))
+
+
+def test_edited_file_prefix_is_recomputed(matches, tmp_path, as_json):
+    json_file = tmp_path / "s1.json"
+    stats_file = tmp_path / "s1_stats.json"
+    half = len(matches) // 2
+    json_file.write_text(json.dumps(matches[:half], ensure_ascii=False, indent=2),
+                         encoding='utf-8')
+    update_stats_incremental(json_file, stats_file)
+
+    edited = [dict(match) for match in matches]
+    edited[half - 1]['coin_res'] = 'lose' if edited[half - 1]['coin_res'] == 'win' else 'win'
+    json_file.write_text(json.dumps(edited, ensure_ascii=False, indent=2), encoding='utf-8')
+    assert update_stats_incremental(json_file, stats_file) == len(matches)
+    saved = json.loads(stats_file.read_text(encoding='utf-8'))
+    assert saved == as_json(analyze_matches(edited))
+
+
+def test_to_stats_leaves_state_unchanged(matches, as_json):
+    accumulator = StatsAccumulator()
+    accumulator.extend(matches)
+    before = as_json(accumulator.state())
+    accumulator.to_stats()
+    assert as_json(accumulator.state()) == before
+    assert not any(key.endswith('_ci') for entry in before['middle_stats'] for key in entry)
@@ -0,0 +1,72 @@
+from itertools import groupby
+
+import numpy as np
+import pytest
+
+from utils.streakEngine import (STREAK_SERIES, RunLengthCounter, StreakSimulation,
+                                fair_coin_simulation, streak_distribution)
+
+
+def naive_distribution(values, labels):
+    distribution = {label: [] for label in labels}
+    for value, group in groupby(values):
+        counts = distribution[value]
+        length = len(list(group))
+        counts.extend([0] * (length - len(counts)))
+        counts[length - 1] += 1
+    return distribution
+
+
+@pytest.mark.parametrize('series', STREAK_SERIES)
+def test_distribution_matches_groupby(matches, series):
+    field, *labels = STREAK_SERIES[series]
+    values = [labels[0] if match[field] == labels[0] else labels[1] for match in matches]
+    expected = naive_distribution(values, labels)
+    assert streak_distribution([value == labels[0] for value in values], labels) == expected
+
+    counter = RunLengthCounter(labels)
+    for match in matches:
+        counter.add(match[field])
+    assert counter.distribution() == expected
+
+
+def test_simulation_batch_matches_per_row_counts():
+    rows, n, max_length = 300, 30, 5
+    flips = np.random.default_rng(7).random((rows, n)) < 0.5
+    simulation = StreakSimulation(n, max_length=max_length)
+    simulation._add_batch(flips[:100])
+    simulation._add_batch(flips[100:])
+
+    runs = np.zeros(n + 1, dtype=np.int64)
+    max_streak = {label: np.zeros(n + 1, dtype=np.int64) for label in simulation.labels}
+    length_counts = {label: np.zeros((max_length, n + 1), dtype=np.int64)
+                     for label in simulation.labels}
+    for row in flips:
+        distribution = naive_distribution(['win' if flip else 'lose' for flip in row],
+                                          simulation.labels)
+        runs[sum(sum(counts) for counts in distribution.values())] += 1
+        for label, counts in distribution.items():
+            max_streak[label][len(counts)] += 1
+            counts = (counts + [0] * max_length)[:max_length]
+            length_counts[label][np.arange(max_length), counts] += 1
+
+    assert simulation.simulations == rows
+    np.testing.assert_array_equal(simulation.runs, runs)
+    for label in simulation.labels:
+        np.testing.assert_array_equal(simulation.max_streak[label], max_streak[label])
+        np.testing.assert_array_equal(simulation.length_counts[label], length_counts[label])
+
+
+def test_simulation_is_reproducible_for_seed():
+    first = StreakSimulation(50).simulate(2000, seed=3)
+    second = StreakSimulation(50).simulate(2000, seed=3)
+    np.testing.assert_array_equal(first.runs, second.runs)
+    assert first.runs.sum() == 2000
+
+
+def test_chart_simulation_stays_within_budget():
+    from utils.streakVisualizer import CHART_BUDGET, CHART_SIMULATIONS
+
+    for matches in (100, 1000, 10_000):
+        simulation = fair_coin_simulation(matches, CHART_SIMULATIONS, budget=CHART_BUDGET)
+        assert simulation.simulations * matches <= max(CHART_BUDGET, 1000 * matches)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from utils.textTable import display_width, grid_table
+
+SEASON_TABLE = """\
++--------+----------+---------+--------+
+|   赛季 |   总对局 |   胜率% | 卡组   |
++========+==========+=========+========+
+|     40 |       96 |   55    | 天杯龙 |
++--------+----------+---------+--------+
+|     41 |     1203 |   48.25 | 珠泪   |
++--------+----------+---------+--------+"""
+
+CASES = [
+    ([[40, 96, '55.0', '天杯龙'], [41, 1203, '48.25', '珠泪']], ['赛季', '总对局', '胜率%', '卡组'], 'g'),
+    ([[18, 120, 55.0, '天杯龙', None], [19, 7, 48.253, '珠泪', 3]],
+     ['赛季', '场数', '胜率', '卡组', 'x'], '.2f'),
+    ([[1.5, 'a'], [10, 'bb']], ['a long header', 'b'], 'g'),
+    ([[None, True, '', 1e-7, 'nan', np.int64(3), np.float64(2.5)],
+      [None, False, 'x', 12345678.9, 1.0, 4, 3]], list('abcdefg'), 'g'),
+    ([], ['a', 'b'], 'g'),
+    ([{'卡组': '斩机', '场数': 3, '胜率': 33.333}], 'keys', '.2f'),
+]
+
+
+def test_season_table_output_is_pinned():
+    table = grid_table([[40, 96, '55.0', '天杯龙'], [41, 1203, '48.25', '珠泪']],
+                       headers=['赛季', '总对局', '胜率%', '卡组'])
+    assert table == SEASON_TABLE
+    assert len({display_width(line) for line in table.splitlines()}) == 1
+
+
+@pytest.mark.parametrize('rows, headers, floatfmt', CASES)
+def test_output_matches_tabulate_grid(rows, headers, floatfmt):
+    tabulate = pytest.importorskip('tabulate')
+    if not tabulate.WIDE_CHARS_MODE:
+        pytest.skip("tabulate 未启用宽字符宽度（缺少 wcwidth）")
+    assert grid_table(rows, headers=headers, floatfmt=floatfmt) == \
+        tabulate.tabulate(rows, headers=headers, tablefmt='grid', floatfmt=floatfmt)
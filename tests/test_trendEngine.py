@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pytest
+
+from calcStats import analyze_match_data
+from utils.dataLayout import DataLayout
+from utils.trendEngine import FLAG_KEYS, RATE_DEFINITIONS, TrendSeries, season_series
+
+
+def test_cumulative_samples_match_interval_stats(season_file, matches):
+    stats = analyze_match_data(season_file)
+    cumulative = TrendSeries.from_matches(matches).cumulative()
+    for entry in stats['interval_stats']:
+        i = entry['total_matches'] - 1
+        for key in RATE_DEFINITIONS:
+            value = cumulative[key][i]
+            assert (0 if np.isnan(value) else round(float(value), 2)) == entry[key]
+
+
+@pytest.mark.parametrize('window', (1, 20, 50))
+def test_rolling_matches_window_recount(matches, window):
+    rolling = TrendSeries.from_matches(matches).rolling(window)
+    assert len(rolling['x']) == max(len(matches) - window + 1, 0)
+    for i, end in enumerate(rolling['x'][::7].tolist()):
+        series = TrendSeries.from_matches(matches[end - window:end]).cumulative()
+        np.testing.assert_allclose(
+            [rolling[key][i * 7] for key in RATE_DEFINITIONS],
+            [series[key][-1] for key in RATE_DEFINITIONS], equal_nan=True)
+
+
+def test_ewma_matches_recursive_filter(matches):
+    alpha = 0.1
+    ewma = TrendSeries.from_matches(matches).ewma(alpha)
+    flags = np.diff(TrendSeries.from_matches(matches).prefix, axis=0)
+    wins, total = 0.0, 0.0
+    expected = []
+    for row in flags:
+        wins = (1 - alpha) * wins + alpha * row[FLAG_KEYS.index('wins')]
+        total = (1 - alpha) * total + alpha
+        expected.append(wins / total * 100)
+    np.testing.assert_allclose(ewma['win_rate'], expected)
+
+
+def test_series_cache_follows_match_file(data_dir):
+    layout = DataLayout(data_dir)
+    season_num = layout.seasons()[-1]
+    with open(layout.json(season_num), 'r', encoding='utf-8') as f:
+        matches = json.load(f)
+    fresh = TrendSeries.from_matches(matches).prefix
+    np.testing.assert_array_equal(season_series(layout, season_num).prefix, fresh)
+    np.testing.assert_array_equal(season_series(layout, season_num).prefix, fresh)
+
+    layout.json(season_num).write_text(json.dumps(matches[:30], ensure_ascii=False),
+                                       encoding='utf-8')
+    assert season_series(layout, season_num).total_matches == 30
@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from xlsxToJson import READERS, MatchDataReader
+
+
+@pytest.mark.parametrize('reader', READERS)
+def test_reader_backends_write_identical_json(xlsx_file, reader, tmp_path):
+    if reader == 'calamine':
+        pytest.importorskip('python_calamine')
+    expected = tmp_path / "pandas.json"
+    actual = tmp_path / f"{reader}.json"
+    MatchDataReader(xlsx_file, 'pandas').process().save_json(expected)
+    MatchDataReader(xlsx_file, reader).process().save_json(actual)
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_conversion_reproduces_sample_json(xlsx_file):
+    json_file = xlsx_file.parent.parent / "json" / f"{xlsx_file.stem}.json"
+    if not json_file.exists():
+        pytest.skip(f"{json_file.name} 不存在")
+    records = MatchDataReader(xlsx_file).process().records
+    with open(json_file, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    # NaN 不等于自身，按序列化结果比较
+    assert json.dumps(records, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)